@@ -1,83 +1,135 @@
-import uvicorn
 from fastapi import FastAPI, Request
-from src.graphs.graph_builder import GraphBuilder
-from src.llms.groqllm import GroqLLM
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from src.graphs.graph_registry import GraphRegistry, build_graph_input, build_retranslation_input
+from src.graphs.batch_runner import run_batch, DEFAULT_BATCH_CONCURRENCY, MAX_BATCH_ITEMS
+from src.graphs.single_flight import SingleFlight, request_key
+from src.graphs.admission import AdmissionController, CLIENT_ID_HEADER
+from src.jobs.job_store import JobStore
+from src.jobs.job_worker import JobWorkerPool, JOBS_DB_PATH, CHECKPOINT_DB_PATH
+from src.llms.llm_router import get_llm_router
+from src.llms.llm_cache import get_llm_cache
+from src.llms.rate_limiter import get_rate_controller
 from src.utils.logger import get_logger
+from src.utils.blog_storage import get_blog_store
+from src.utils.llm_output_parser import StructuredMessageStream
+from src.utils.shared_state import get_shared_state
+from src.utils.metrics import render_prometheus, track_run
 from src.utils.exception_handler import api_exception_handler, generic_exception_handler
-from src.utils.exceptions import APIException, InvalidRequestError
+from src.utils.exceptions import APIException, InvalidRequestError, NotFoundError
 
 
+import asyncio
+import json
 import os
-import re
-from datetime import datetime
+from contextlib import asynccontextmanager, nullcontext
+from functools import partial
 from dotenv import load_dotenv
 
 load_dotenv()
 log = get_logger(__name__)
-app = FastAPI()
+
+# Most saved blogs returned by one GET /blogs page
+MAX_LIST_LIMIT = 500
+# Nodes whose LLM calls answer with JSON; their 'token' events carry the decoded field text instead
+STRUCTURED_OUTPUT_NODES = {"translation"}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Builds the shared LLM router and compiles every graph once at startup.
+    Starts the blog writer, which saves and indexes generated blogs off the request path,
+    the request coalescer, which runs identical concurrent requests once (across worker processes
+    with a shared state backend), and admission control, which bounds this worker's graph runs,
+    batch items and jobs included.
+    Also starts the job workers, whose graphs checkpoint to SQLite so queued
+    and interrupted jobs resume after a restart, down to the last translated paragraph.
+    """
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    from langgraph.store.sqlite.aio import AsyncSqliteStore
+
+    llm = get_llm_router()
+    app.state.graph_registry = GraphRegistry(llm)
+    log.info(f"Compiled graphs for use cases: {app.state.graph_registry.usecases}")
+    app.state.single_flight = SingleFlight(state=get_shared_state())
+    app.state.admission = AdmissionController()
+    get_blog_store().start()
+
+    os.makedirs(os.path.dirname(CHECKPOINT_DB_PATH) or ".", exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(CHECKPOINT_DB_PATH) as checkpointer, \
+            AsyncSqliteStore.from_conn_string(CHECKPOINT_DB_PATH) as store:
+        await store.setup()
+        job_store = JobStore(JOBS_DB_PATH)
+        app.state.job_workers = JobWorkerPool(
+            job_store, GraphRegistry(llm, checkpointer=checkpointer, store=store, lazy=True),
+            admission=app.state.admission)
+        await app.state.job_workers.start()
+        try:
+            yield
+        finally:
+            await app.state.job_workers.stop()
+            job_store.close()
+            await asyncio.to_thread(get_blog_store().flush)
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Register exception handlers
 app.add_exception_handler(APIException, api_exception_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
 
-print(os.getenv("LANGCHAIN_API_KEY"))
-os.environ["LANGSMITH_API_KEY"] = os.getenv("LANGCHAIN_API_KEY")
+# LangSmith reads LANGSMITH_API_KEY; reuse LANGCHAIN_API_KEY when only that one is set
+if os.getenv("LANGCHAIN_API_KEY") and not os.getenv("LANGSMITH_API_KEY"):
+    os.environ["LANGSMITH_API_KEY"] = os.getenv("LANGCHAIN_API_KEY")
+
+async def parse_blog_request(request: Request):
+    """
+    Reads and validates a blog request body.
+    Returns the graph use case to run and the graph input.
+    """
+    data = await request.json()
+    return build_graph_input(data)
+
+
+def client_id(request: Request) -> str:
+    """Identifies the client for its admission quota: the X-Client-Id header, else its address."""
+    return request.headers.get(CLIENT_ID_HEADER) or (request.client.host if request.client else "unknown")
+
+
+async def generate_blog(graph, graph_input: dict, usecase: str, publish, admission=None) -> dict:
+    """
+    Runs the graph once and returns its final state and timing breakdown, after waiting for a
+    run slot if admission control is given. Requests coalesced onto this run only wait for the
+    result, so there is no progress to publish.
+    """
+    async with admission.run_slot() if admission else nullcontext():
+        with track_run(usecase) as run:
+            state = await graph.ainvoke(graph_input)
+    log.info(f"Successfully generated blog for topic: {graph_input['topic']}")
+
+    # Save blog (and any additional translations) to file and index them, in the background
+    get_blog_store().save(state)
+    return {"data": state, "timings": run.breakdown()}
+
 
 @app.post("/blogs")
 async def create_blogs(request: Request):
     """
     Endpoint to generate a blog post based on a topic.
+    Identical requests in flight (or answered within the coalescing window) share one graph run.
+    Under overload answers 429 (client quota) or 503 (queue full or no slot in time) with Retry-After.
     """
     try:
-        data = await request.json()
-        topic = data.get("topic", "")
-        current_language = data.get("current_language", "").lower()
-
-        if not topic:
-            raise InvalidRequestError("Topic is required to generate a blog.")
-        
-        log.info(f"Received request to generate blog for topic: {topic} and language: {current_language}")
-
-        groqllm = GroqLLM()
-        llm = groqllm.get_llm()
-        graph_builder = GraphBuilder(llm)
-
-
-        if topic and current_language:
-            graph = graph_builder.setup_graph(usecase="language")
-            state = graph.invoke({"topic": topic, "current_language": current_language})
-        elif topic:
-            graph = graph_builder.setup_graph(usecase="topic")
-            state = graph.invoke({"topic": topic, "current_language": current_language.lower()})
-            log.info(f"Successfully generated blog for topic: {topic}")
-
-        # Save blog to file if generated
-        blog = state.get("blog", {})
-        title = blog.get("title", "untitled-blog")
-        content = blog.get("content", "")
-        
-       # 1. Create a clean, URL-friendly "slug" from the title
-        safe_title = title.lower().strip()
-        safe_title = re.sub(r'\s+', '-', safe_title)
-        safe_title = re.sub(r'[^a-z0-9-]', '', safe_title)
-        safe_title = re.sub(r'-+', '-', safe_title)
-        safe_title = safe_title[:60].strip('-')
-
-        # 2. Define the directory path including the language
-        language_folder = os.path.join("blogs", current_language)
-        
-        # 3. Create the language-specific directory if it doesn't exist
-        os.makedirs(language_folder, exist_ok=True)
-
-        # 4. Construct the final filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = os.path.join(language_folder, f"{safe_title}_{timestamp}.md")
-        
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(f"# {title}\n\n{content}")
-        log.info(f"Blog saved to {filename}")
-        # ---------------------------------------------------------
-        return {"data": state}
+        usecase, graph_input = await parse_blog_request(request)
+        topic = graph_input["topic"]
+        log.info(f"Received request to generate blog for topic: {topic} and languages: {graph_input.get('target_languages', [])}")
+
+        admission = request.app.state.admission
+        graph = request.app.state.graph_registry.get(usecase)
+        async with admission.client(client_id(request)):
+            return await request.app.state.single_flight.result(
+                request_key(usecase, graph_input), partial(generate_blog, graph, graph_input, usecase, admission=admission))
 
     except APIException as e:
         # This will be handled by your custom handler, but you can log here if you want
@@ -88,5 +140,236 @@ async def create_blogs(request: Request):
         log.error(f"Unhandled Exception: {e}")
         raise
 
+
+@app.get("/blogs")
+async def list_blogs(topic: str = "", language: str = "", limit: int = 50, offset: int = 0):
+    """
+    Endpoint to list saved blogs, newest first, from the blog index.
+    Filters by exact topic (case-insensitive) and language.
+    """
+    if not 1 <= limit <= MAX_LIST_LIMIT or offset < 0:
+        raise InvalidRequestError(f"'limit' must be between 1 and {MAX_LIST_LIMIT}, and 'offset' non-negative.")
+    blogs = await asyncio.to_thread(get_blog_store().index.find, topic.strip(), language.lower(), limit, offset)
+    return {"data": blogs}
+
+
+@app.patch("/blogs")
+async def retranslate_blog(request: Request):
+    """
+    Endpoint to re-translate an edited blog. Send the edited source 'blog' and the 'previous'
+    source blog with its 'translations'; only new or changed paragraphs are translated again.
+    """
+    usecase, graph_input = build_retranslation_input(await request.json())
+    log.info(f"Received re-translation request for: {graph_input['blog']['title']} and languages: {graph_input['target_languages']}")
+
+    admission = request.app.state.admission
+    graph = request.app.state.graph_registry.get(usecase)
+    async with admission.client(client_id(request)), admission.run_slot():
+        with track_run(usecase) as run:
+            state = await graph.ainvoke(graph_input)
+    log.info(f"Successfully re-translated blog: {graph_input['blog']['title']}")
+
+    get_blog_store().save(state)
+    return {"data": state, "timings": run.breakdown()}
+
+
+def sse_event(event: str, data) -> str:
+    """Formats a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def stream_blog(graph, graph_input: dict, usecase: str, publish, admission=None) -> dict:
+    """
+    Runs the graph with astream, publishing progress events to every request attached to the run:
+    - 'node': a node finished, with its state update (title ready, content ready, translation ready)
+    - 'token': a chunk of LLM output, tagged with the node producing it; for the translation
+      node, the text of the translated 'content' or 'title' field as it is decoded from the JSON answer
+    - 'paragraph': a translated paragraph, as soon as it lands
+    Returns the final state and the run's timing breakdown, like generate_blog, whose run slot it shares.
+    """
+    state = {}
+    structured = StructuredMessageStream()
+    async with admission.run_slot() if admission else nullcontext():
+        with track_run(usecase) as run:
+            async for mode, chunk in graph.astream(
+                graph_input,
+                stream_mode=["updates", "messages", "custom", "values"],
+            ):
+                if mode == "updates":
+                    for node, update in chunk.items():
+                        publish("node", {"node": node, "update": update})
+                elif mode == "messages":
+                    message, metadata = chunk
+                    node = metadata.get("langgraph_node")
+                    if node in STRUCTURED_OUTPUT_NODES:
+                        for field, text in structured.feed(message):
+                            publish("token", {"node": node, "field": field, "content": text})
+                    elif message.content:
+                        publish("token", {"node": node, "content": message.content})
+                elif mode == "custom":
+                    publish(chunk.get("event", "custom"), chunk)
+                elif mode == "values":
+                    state = chunk
+
+    get_blog_store().save(state)
+    log.info(f"Successfully streamed blog for topic: {graph_input['topic']}")
+    return {"data": state, "timings": run.breakdown()}
+
+
+async def stream_blog_events(single_flight: SingleFlight, graph, graph_input: dict, usecase: str,
+                             admission=None, lease=None):
+    """
+    Yields the SSE events of the graph run for this request, shared with identical requests in flight:
+    the progress events of stream_blog, then
+    - 'done': the final state and the run's timing breakdown; the blog is saved in the background
+    - 'error': the run failed after the stream had started, or found no run slot in time
+      (with 'status_code' 503 and 'retry_after')
+    A request attached to a run already under way first replays the events it missed. A run started
+    by POST /blogs, or a result from the coalescing window, has no progress events, only 'done'.
+    The client's admission lease is released when the stream ends.
+    """
+    try:
+        async for event, data in single_flight.events(
+                request_key(usecase, graph_input),
+                partial(stream_blog, graph, graph_input, usecase, admission=admission)):
+            if event == "error":
+                # The response has already started, so the error is reported in-band
+                if isinstance(data, APIException):
+                    log.warning(f"Streaming generation turned away: {data.detail}")
+                    data = {"detail": data.detail, "status_code": data.status_code,
+                            **({"retry_after": data.retry_after} if hasattr(data, "retry_after") else {})}
+                else:
+                    log.error(f"Streaming generation failed: {data}", exc_info=data)
+                    data = {"detail": "An internal server error occurred."}
+            yield sse_event(event, data)
+    finally:
+        if lease is not None:
+            lease.release()
+
+
+@app.post("/blogs/stream")
+async def stream_blogs(request: Request):
+    """
+    Endpoint to generate a blog post and stream its progress as Server-Sent Events.
+    Over the client's quota, or with the run queue full, answers 429/503 with Retry-After before streaming.
+    """
+    usecase, graph_input = await parse_blog_request(request)
+    log.info(f"Received streaming request for topic: {graph_input['topic']} and languages: {graph_input.get('target_languages', [])}")
+
+    admission, single_flight = request.app.state.admission, request.app.state.single_flight
+    lease = admission.admit_client(client_id(request))
+    try:
+        # The status goes out before the run starts, so turn the request away now if its run could not even queue
+        if not single_flight.joinable(request_key(usecase, graph_input)):
+            admission.check_capacity()
+    except APIException:
+        lease.release()
+        raise
+
+    graph = request.app.state.graph_registry.get(usecase)
+    return StreamingResponse(
+        stream_blog_events(single_flight, graph, graph_input, usecase, admission=admission, lease=lease),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Releases the lease even if the stream never started
+        background=BackgroundTask(lease.release),
+    )
+
+async def batch_ndjson(graph_registry, items: list, concurrency: int, admission=None):
+    """Serializes batch results as newline-delimited JSON."""
+    async for result in run_batch(graph_registry, items, concurrency, admission):
+        yield json.dumps(result, ensure_ascii=False) + "\n"
+
+
+@app.post("/blogs/batch")
+async def create_blogs_batch(request: Request):
+    """
+    Endpoint to generate many blogs at once.
+    Accepts {"items": [{"topic": ..., "current_language": ..., "target_languages": [...]}, ...], "concurrency": n}
+    and streams one NDJSON line per item as it completes, followed by a summary line.
+    """
+    data = await request.json()
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        raise InvalidRequestError("'items' must be a non-empty list of {topic, current_language} objects.")
+    if len(items) > MAX_BATCH_ITEMS:
+        raise InvalidRequestError(f"A batch can contain at most {MAX_BATCH_ITEMS} items.")
+
+    try:
+        concurrency = int(data.get("concurrency", DEFAULT_BATCH_CONCURRENCY))
+    except (TypeError, ValueError):
+        raise InvalidRequestError("'concurrency' must be an integer.")
+
+    log.info(f"Received batch request with {len(items)} items and concurrency {concurrency}")
+    return StreamingResponse(
+        batch_ndjson(request.app.state.graph_registry, items, concurrency, request.app.state.admission),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(request: Request):
+    """
+    Endpoint to queue a blog generation job. Accepts the same body as /blogs
+    and returns a job id right away; poll GET /jobs/{job_id} for progress.
+    """
+    usecase, graph_input = await parse_blog_request(request)
+    job_id = await request.app.state.job_workers.submit(usecase, graph_input)
+    log.info(f"Queued job {job_id} for topic: {graph_input['topic']}")
+    return {"data": {"job_id": job_id, "status": "queued"}}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, request: Request):
+    """
+    Endpoint to poll a job: its status, the partial graph state while it runs,
+    and the final blog once it has succeeded.
+    """
+    job = await request.app.state.job_workers.status(job_id)
+    if job is None:
+        raise NotFoundError(f"Job '{job_id}' not found.")
+    return {"data": job}
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """
+    Endpoint to expose run, node and LLM latency histograms, token, cost, retry and
+    fallback counters in the Prometheus text format.
+    """
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """
+    Endpoint to report LLM response cache hit/miss counters.
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return {"data": {"enabled": False}}
+    return {"data": {"enabled": True, **cache.stats()}}
+
+
+@app.get("/admission/stats")
+async def admission_stats(request: Request):
+    """
+    Endpoint to report admission control: graph runs in progress and queued, the limits,
+    the average run time behind Retry-After, and requests turned away by reason.
+    """
+    return {"data": request.app.state.admission.stats()}
+
+
+@app.get("/llm/stats")
+async def llm_stats():
+    """
+    Endpoint to report LLM client rate limiting metrics (retries, throttling, queued time vs LLM time)
+    and, under 'router', the recent p95 latency and health of every provider and model tier.
+    """
+    return {"data": {**get_rate_controller("groq").stats(), "router": get_llm_router().stats()}}
+
+
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Command-line entry point for bulk blog generation.
+
+Reads a list of {topic, current_language} items and writes one NDJSON result per item
+as it completes, followed by a summary line with latency and throughput.
+
+Input formats:
+  - a JSON array of items or plain topic strings
+  - JSON Lines, one item per line
+  - plain text, one topic per line
+
+Example:
+  python batch_generate.py topics.txt --language french --concurrency 8 --output results.ndjson
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from dotenv import load_dotenv
+
+from src.graphs.batch_runner import run_batch, DEFAULT_BATCH_CONCURRENCY
+from src.graphs.graph_registry import GraphRegistry
+from src.llms.llm_router import get_llm_router
+
+load_dotenv()
+
+
+def load_items(path: str, default_language: str) -> list:
+    """Parses the input file into a list of {topic, current_language} items."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read().strip()
+
+    if text.startswith("["):
+        raw_items = json.loads(text)
+    else:
+        raw_items = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            raw_items.append(json.loads(line) if line.startswith("{") else line)
+
+    items = []
+    for raw in raw_items:
+        item = {"topic": raw} if isinstance(raw, str) else dict(raw)
+        item.setdefault("current_language", default_language)
+        items.append(item)
+    return items
+
+
+async def main(args) -> int:
+    items = load_items(args.input, args.language)
+    graph_registry = GraphRegistry(get_llm_router())
+
+    failed = 0
+    with open(args.output, "w", encoding="utf-8") as out:
+        async for result in run_batch(graph_registry, items, args.concurrency):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            if "summary" in result:
+                failed = result["summary"]["failed"]
+                print(json.dumps(result["summary"]), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate blogs in bulk from a list of topics.")
+    parser.add_argument("input", help="JSON, JSON Lines or plain-text file of topics")
+    parser.add_argument("--language", default="", help="Language for items that do not set one (default: English)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_BATCH_CONCURRENCY, help="Maximum graph runs in flight")
+    parser.add_argument("--output", default="batch_results.ndjson", help="NDJSON file for per-item results")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,166 @@
+# benchmarks/admission_benchmark.py
+# Load generator for admission control: open-loop POST /blogs traffic (requests keep arriving at a
+# fixed rate whether or not earlier ones are answered) against a fake provider that serves a limited
+# number of calls at once. Compares no admission control with a bounded run queue and per-client
+# quotas, within capacity and at several times capacity, with one greedy client sending a share of it.
+# Exits non-zero if, with admission control, the p99 latency of answered requests is not bounded by
+# the queue deadline, a 429/503 lacks Retry-After, or requests within capacity are turned away.
+#
+# Usage:
+#   python -m benchmarks.admission_benchmark
+
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+from pydantic import PrivateAttr
+
+# app.py reads these at import time; the fake LLM never uses them
+os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder-key")
+os.environ.setdefault("LANGCHAIN_API_KEY", "benchmark-placeholder-key")
+# Keep benchmark logs out of the working tree
+os.environ.setdefault("LOG_DIR", os.path.join(tempfile.gettempdir(), "blog-benchmark-logs"))
+
+from app import app
+from src.graphs.admission import AdmissionController
+from src.graphs.graph_registry import GraphRegistry
+from src.graphs.single_flight import SingleFlight
+from src.llms.fakellm import FakeChatModel
+from benchmarks.suite import percentile
+
+LATENCY = 0.1  # seconds per fake LLM call
+PROVIDER_CAPACITY = 8  # calls the fake provider serves at once; a topic run makes 2 calls at once
+DURATION = 4.0  # seconds of arrivals per scenario
+CLIENTS = 20
+GREEDY_SHARE = 0.25  # share of the traffic sent by one greedy client
+SEED = 11
+
+MAX_RUNS = PROVIDER_CAPACITY // 2
+QUEUE_SIZE = 16
+QUEUE_TIMEOUT = 1.0
+CLIENT_LIMIT = 4
+
+
+class ProviderLimitedModel(FakeChatModel):
+    """A fake provider that serves at most PROVIDER_CAPACITY calls at once; the others wait their turn."""
+
+    _slots: asyncio.Semaphore = PrivateAttr(default=None)
+
+    async def _agenerate(self, *args, **kwargs):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(PROVIDER_CAPACITY)
+        async with self._slots:
+            return await super()._agenerate(*args, **kwargs)
+
+
+def setup(admission: AdmissionController):
+    app.state.graph_registry = GraphRegistry(ProviderLimitedModel(latency=LATENCY))
+    app.state.single_flight = SingleFlight(enabled=False)
+    app.state.admission = admission
+
+
+async def send(client: httpx.AsyncClient, i: int, client_id: str, delay: float) -> tuple:
+    await asyncio.sleep(delay)
+    started = time.perf_counter()
+    response = await client.post("/blogs", json={"topic": f"admission {i}"}, headers={"X-Client-Id": client_id})
+    return response.status_code, time.perf_counter() - started, response.headers.get("retry-after")
+
+
+async def scenario(client: httpx.AsyncClient, rate: float, admission: AdmissionController) -> dict:
+    """Poisson arrivals at 'rate' requests per second for DURATION seconds."""
+    setup(admission)
+    rng = random.Random(SEED)
+    arrivals, now = [], 0.0
+    while True:
+        now += rng.expovariate(rate)
+        if now >= DURATION:
+            break
+        client_id = "greedy" if rng.random() < GREEDY_SHARE else f"client-{rng.randrange(CLIENTS)}"
+        arrivals.append((now, client_id))
+
+    depths = []
+
+    async def sample_queue():
+        while True:
+            depths.append(admission.stats()["queued"])
+            await asyncio.sleep(0.05)
+
+    sampler = asyncio.create_task(sample_queue())
+    started = time.perf_counter()
+    results = await asyncio.gather(*(send(client, i, client_id, at) for i, (at, client_id) in enumerate(arrivals)))
+    elapsed = time.perf_counter() - started
+    sampler.cancel()
+
+    ok = [latency for status, latency, _ in results if status == 200]
+    rejected = [(status, retry_after) for status, _, retry_after in results if status in (429, 503)]
+    return {
+        "sent": len(results),
+        "ok": len(ok),
+        "429": sum(status == 429 for status, _ in rejected),
+        "503": sum(status == 503 for status, _ in rejected),
+        "other": sum(status not in (200, 429, 503) for status, _, _ in results),
+        "missing_retry_after": sum(retry_after is None for _, retry_after in rejected),
+        "goodput": len(ok) / elapsed,
+        "p50": percentile(ok, 50) if ok else 0.0,
+        "p99": percentile(ok, 99) if ok else 0.0,
+        "p99_all": percentile([latency for _, latency, _ in results], 99),
+        "max_queue": max(depths, default=0),
+        "average_wait": admission.stats()["average_wait_seconds"],
+    }
+
+
+def report(name: str, result: dict):
+    print(f"{name:<28} | {result['sent']:>4} | {result['ok']:>4} | {result['429']:>4} | {result['503']:>4} | "
+          f"{result['goodput']:6.1f}/s | {result['p50'] * 1000:6.0f} ms | {result['p99'] * 1000:6.0f} ms | "
+          f"{result['p99_all'] * 1000:6.0f} ms | {result['max_queue']:>5} | {result['average_wait'] * 1000:6.0f} ms")
+
+
+async def run():
+    # Rejections log a warning each; keep the output readable
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("src") or name == "app":
+            logging.getLogger(name).setLevel(logging.ERROR)
+    # Keep generated blog files out of the working tree
+    os.chdir(tempfile.mkdtemp(prefix="blog-admission-"))
+
+    capacity = MAX_RUNS / (LATENCY * 1.05)  # topic runs per second the provider sustains, roughly
+    print(f"fake provider: {PROVIDER_CAPACITY} calls at once, {LATENCY * 1000:.0f} ms per call "
+          f"(~{capacity:.0f} topic runs/s); {DURATION:.0f} s of Poisson arrivals from {CLIENTS} clients "
+          f"plus one greedy client sending {GREEDY_SHARE:.0%}")
+    print(f"admission control: {MAX_RUNS} runs, queue of {QUEUE_SIZE}, {QUEUE_TIMEOUT:g} s queue deadline, "
+          f"{CLIENT_LIMIT} requests per client\n")
+    print("scenario                     | sent |   ok |  429 |  503 |  goodput |  ok p50  |  ok p99  | all p99  | max q |  wait")
+
+    failures = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for load in (0.5, 2.0, 4.0):
+            rate = capacity * load
+            unbounded = await scenario(client, rate, AdmissionController(enabled=False))
+            report(f"{load:g}x capacity, no admission", unbounded)
+            admitted = await scenario(client, rate, AdmissionController(
+                enabled=True, max_runs=MAX_RUNS, queue_size=QUEUE_SIZE, queue_timeout=QUEUE_TIMEOUT,
+                client_limit=CLIENT_LIMIT))
+            report(f"{load:g}x capacity, admission", admitted)
+
+            # Answered requests waited at most the queue deadline, then ran one run's worth of calls
+            bound = QUEUE_TIMEOUT + 10 * LATENCY
+            if admitted["p99"] > bound:
+                failures.append(f"{load:g}x: p99 {admitted['p99']:.2f} s above the {bound:.2f} s bound")
+            if admitted["missing_retry_after"]:
+                failures.append(f"{load:g}x: {admitted['missing_retry_after']} rejections without Retry-After")
+            if admitted["other"]:
+                failures.append(f"{load:g}x: {admitted['other']} requests failed with another status")
+            if load < 1 and admitted["429"] + admitted["503"]:
+                failures.append(f"{load:g}x: {admitted['429'] + admitted['503']} requests turned away within capacity")
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
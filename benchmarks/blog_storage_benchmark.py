@@ -0,0 +1,138 @@
+# benchmarks/blog_storage_benchmark.py
+# Compares saving generated blogs the old way (one to_thread write per request, awaited on the
+# request path) with the batched BlogStore, and finding saved blogs by walking blogs/ with
+# index lookups. Blogs are written to a temporary directory.
+#
+# Usage:
+#   python -m benchmarks.blog_storage_benchmark
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from src.utils import blog_storage
+from src.utils.blog_storage import BlogIndex, BlogStore, content_hash, generated_blogs, save_blog_to_file, slugify
+from benchmarks.suite import percentile
+
+REQUESTS = 300
+CONCURRENCY = 16
+LANGUAGES = ["english", "french", "german"]
+TOPICS = 50
+LOOKUPS = 200
+
+
+def make_state(i: int) -> dict:
+    topic = f"Topic {i % TOPICS}"
+    blog = {"title": f"{topic}: part {i}", "content": f"Paragraph about {topic}.\n\n" * 20}
+    return {"topic": topic, "current_language": "english", "blog": blog,
+            "translations": {language: {"title": f"{blog['title']} ({language})", "content": blog["content"]}
+                             for language in LANGUAGES[1:]}}
+
+
+def save_inline(state: dict) -> list:
+    """The previous save path: write every blog of the run, nothing indexed."""
+    return [save_blog_to_file(blog.get("title") or "untitled-blog", blog.get("content", ""), language)
+            for language, blog in generated_blogs(state)]
+
+
+async def drive(save) -> tuple:
+    """Runs REQUESTS saves, CONCURRENCY at a time; returns the time spent saving on the request path."""
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def request(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            await save(make_state(i))
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(i) for i in range(REQUESTS)))
+    return latencies, time.perf_counter() - started
+
+
+def scan_topic(topic: str) -> list:
+    """Finds a topic's blogs without the index: walk blogs/ and match file names on the slug."""
+    prefix = slugify(topic) + "-"
+    return [os.path.join(root, name) for root, _, names in os.walk(blog_storage.BLOGS_DIR)
+            for name in names if name.startswith(prefix)]
+
+
+def scan_duplicate(language: str, blog_hash: str):
+    """Finds an identical blog without the index: read and hash every file of the language."""
+    folder = os.path.join(blog_storage.BLOGS_DIR, language)
+    for name in os.listdir(folder):
+        with open(os.path.join(folder, name), encoding="utf-8") as f:
+            heading, _, content = f.read().partition("\n\n")
+        if content_hash(heading.removeprefix("# ").strip(), content) == blog_hash:
+            return name
+    return None
+
+
+def time_lookups(lookup, args: list) -> list:
+    latencies = []
+    for arg in args:
+        started = time.perf_counter()
+        lookup(*arg)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def report(name: str, latencies: list, total: float = None):
+    extra = f" | {total:6.2f} s total" if total is not None else ""
+    print(f"{name:<34} | p50 {percentile(latencies, 50) * 1000:8.3f} ms | "
+          f"p95 {percentile(latencies, 95) * 1000:8.3f} ms{extra}")
+
+
+async def run():
+    print(f"{REQUESTS} requests, {CONCURRENCY} in flight, {len(LANGUAGES)} blogs per request\n")
+
+    with tempfile.TemporaryDirectory() as inline_dir:
+        blog_storage.BLOGS_DIR = os.path.join(inline_dir, "blogs")
+        latencies, total = await drive(lambda state: asyncio.to_thread(save_inline, state))
+        report("save: to_thread per request", latencies, total)
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        blog_storage.BLOGS_DIR = os.path.join(store_dir, "blogs")
+        store = BlogStore(BlogIndex(os.path.join(store_dir, "blog_index.db")))
+        store.start()
+        futures = []
+
+        async def save_in_background(state: dict):
+            futures.append(store.save(state))
+
+        started = time.perf_counter()
+        latencies, total = await drive(save_in_background)
+        paths = [path for future in futures for path in await asyncio.wrap_future(future)]
+        report("save: batched, off the request", latencies, total)
+        print(f"{'':<34} | all {len(paths)} blogs written and indexed {time.perf_counter() - started - total:.2f} s "
+              f"after the last request")
+
+        # Saving the same runs again writes nothing new
+        again = [path for i in range(REQUESTS) for path in await store.asave(make_state(i))]
+        files = sum(len(names) for _, _, names in os.walk(blog_storage.BLOGS_DIR))
+        deduplicated = again == paths and files == len(paths)
+        print(f"{'':<34} | re-saving every run: {'no duplicates written' if deduplicated else 'DUPLICATES WRITTEN'}\n")
+
+        topics = [(f"Topic {i % TOPICS}",) for i in range(LOOKUPS)]
+        report("topic lookup: walk blogs/", time_lookups(scan_topic, topics))
+        report("topic lookup: index", time_lookups(lambda topic: store.index.find(topic, limit=500), topics))
+        duplicates = [(language, content_hash(blog["title"], blog["content"]))
+                      for language, blog in generated_blogs(make_state(REQUESTS - 1))]
+        report("duplicate lookup: hash every file", time_lookups(scan_duplicate, duplicates))
+        report("duplicate lookup: index", time_lookups(store.index.find_duplicate, duplicates))
+
+        mismatched = [topic for topic, in topics[:TOPICS]
+                      if sorted(scan_topic(topic)) != sorted(entry["path"] for entry in store.index.find(topic, limit=500))]
+        store.flush()
+        store.index.close()
+    if not deduplicated:
+        sys.exit("Re-saving identical blogs wrote new files")
+    if mismatched:
+        sys.exit(f"Index results differ from the directory scan for {len(mismatched)} topic(s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,131 @@
+# benchmarks/checkpoint_resume_benchmark.py
+# Injects a failure at each node of the language graph, retries the run with the same thread id
+# on a SQLite checkpointer and store, and counts the LLM calls saved compared with a full re-run.
+# Every retried run is checked against a clean run, for both invoke and ainvoke.
+#
+# Usage:
+#   python -m benchmarks.checkpoint_resume_benchmark
+
+import asyncio
+import os
+import sys
+import tempfile
+from typing import Optional
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.store.sqlite import SqliteStore
+from langgraph.store.sqlite.aio import AsyncSqliteStore
+
+from src.graphs.graph_builder import GraphBuilder
+from src.llms.fakellm import FakeChatModel
+
+PARAGRAPHS = 12
+LATENCY = 0.01
+CONTENT = "\n\n".join(f"Paragraph {i} of the generated post." for i in range(PARAGRAPHS))
+GRAPH_INPUT = {"topic": "checkpoints", "current_language": "french",
+               "target_languages": ["french", "german"], "translation_mode": "paragraph"}
+
+# (scenario, text that makes a call fail while the failure is armed)
+SCENARIOS = [
+    ("title_creation", "blog title writer"),
+    ("content_generation", "blog post of around"),
+    ("translation: title", "blog title to German"),
+    ("translation: paragraph 7", "Paragraph 7 of"),
+    ("translation: whole language", "to German"),
+]
+
+
+class FailingChatModel(FakeChatModel):
+    """A fake model whose calls fail while their prompt contains 'fail_marker'."""
+
+    fail_marker: Optional[str] = None
+
+    def _content(self, messages, structured_fields) -> str:
+        # Give the title its own text, so markers aimed at paragraphs do not match the title prompt
+        if not structured_fields and "blog title writer" in str(messages[-1].content):
+            return "Checkpointed Blog Title"
+        return super()._content(messages, structured_fields)
+
+    def _check(self, messages):
+        if self.fail_marker and any(self.fail_marker in str(m.content) for m in messages):
+            raise RuntimeError(f"Injected failure for '{self.fail_marker}'")
+
+    def _generate(self, messages, stop=None, run_manager=None, structured_fields=None, **kwargs):
+        self._check(messages)
+        return super()._generate(messages, stop, run_manager, structured_fields, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, structured_fields=None, **kwargs):
+        self._check(messages)
+        return await super()._agenerate(messages, stop, run_manager, structured_fields, **kwargs)
+
+
+def make_llm(fail_marker: Optional[str] = None) -> FailingChatModel:
+    return FailingChatModel(latency=LATENCY, response=CONTENT, fail_marker=fail_marker)
+
+
+def outcome(state: dict) -> dict:
+    return {"blog": state["blog"], "translations": state["translations"]}
+
+
+def run_sync(db_path: str, llm: FailingChatModel, thread_id: str):
+    with SqliteSaver.from_conn_string(db_path) as checkpointer, SqliteStore.from_conn_string(db_path) as store:
+        store.setup()
+        graph = GraphBuilder(llm).setup_graph("language", checkpointer=checkpointer, store=store)
+        config = {"configurable": {"thread_id": thread_id}}
+        try:
+            graph.invoke(GRAPH_INPUT, config)
+            raise AssertionError("the injected failure did not fail the run")
+        except RuntimeError:
+            pass
+        failed_calls = llm.calls
+        llm.fail_marker = None
+        state = graph.invoke(None, config)
+        return failed_calls, llm.calls - failed_calls, state
+
+
+async def run_async(db_path: str, llm: FailingChatModel, thread_id: str):
+    async with AsyncSqliteSaver.from_conn_string(db_path) as checkpointer, \
+            AsyncSqliteStore.from_conn_string(db_path) as store:
+        await store.setup()
+        graph = GraphBuilder(llm).setup_graph("language", checkpointer=checkpointer, store=store)
+        config = {"configurable": {"thread_id": thread_id}}
+        try:
+            await graph.ainvoke(GRAPH_INPUT, config)
+            raise AssertionError("the injected failure did not fail the run")
+        except RuntimeError:
+            pass
+        failed_calls = llm.calls
+        llm.fail_marker = None
+        state = await graph.ainvoke(None, config)
+        return failed_calls, llm.calls - failed_calls, state
+
+
+def main():
+    clean_llm = make_llm()
+    expected = outcome(GraphBuilder(clean_llm).setup_graph("language").invoke(GRAPH_INPUT))
+    clean_calls = clean_llm.calls
+    print(f"Language graph, {PARAGRAPHS} paragraphs into french and german: {clean_calls} LLM calls per clean run")
+    print("mode    | failure at                  | failed run | full re-run | resumed retry | calls saved")
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("invoke", "ainvoke"):
+            for n, (name, marker) in enumerate(SCENARIOS):
+                llm = make_llm(marker)
+                db_path = os.path.join(tmp, f"{mode}_{n}.db")
+                if mode == "invoke":
+                    failed_calls, retry_calls, state = run_sync(db_path, llm, f"{mode}-{n}")
+                else:
+                    failed_calls, retry_calls, state = asyncio.run(run_async(db_path, llm, f"{mode}-{n}"))
+                matches = outcome(state) == expected
+                failures += not matches
+                print(f"{mode:<7} | {name:<27} | {failed_calls:>10} | {clean_calls:>11} | {retry_calls:>13} | "
+                      f"{clean_calls - retry_calls:>11}{'' if matches else '  RESULT MISMATCH'}")
+
+    if failures:
+        sys.exit(f"{failures} resumed run(s) did not match the clean run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# benchmarks/coalescing_benchmark.py
+# Sends bursts of identical requests to POST /blogs and POST /blogs/stream, with request coalescing
+# on and off, and counts the graph runs behind them. Also checks that a stream attaching to a run
+# under way replays the events it missed, and that different topics are not coalesced.
+# Exits non-zero if N identical concurrent requests take more than one graph run.
+#
+# Usage:
+#   python -m benchmarks.coalescing_benchmark
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+# app.py reads these at import time; the fake LLM never uses them
+os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder-key")
+os.environ.setdefault("LANGCHAIN_API_KEY", "benchmark-placeholder-key")
+# Keep benchmark logs out of the working tree
+os.environ.setdefault("LOG_DIR", os.path.join(tempfile.gettempdir(), "blog-benchmark-logs"))
+
+from app import app
+from src.graphs.graph_registry import GraphRegistry
+from src.graphs.admission import AdmissionController
+from src.graphs.single_flight import SingleFlight
+from src.llms.fakellm import FakeChatModel
+from benchmarks.suite import percentile
+
+REQUESTS = 50
+LATENCY = 0.05
+PAYLOAD = {"topic": "trending topic", "current_language": "french"}
+
+
+class CountingRegistry:
+    """Hands out the registry's graphs and counts the graph runs started on them."""
+
+    def __init__(self, registry: GraphRegistry):
+        self.registry = registry
+        self.runs = 0
+
+    def get(self, usecase: str):
+        return CountingGraph(self, self.registry.get(usecase))
+
+
+class CountingGraph:
+    def __init__(self, counter: CountingRegistry, graph):
+        self.counter = counter
+        self.graph = graph
+
+    async def ainvoke(self, *args, **kwargs):
+        self.counter.runs += 1
+        return await self.graph.ainvoke(*args, **kwargs)
+
+    def astream(self, *args, **kwargs):
+        self.counter.runs += 1
+        return self.graph.astream(*args, **kwargs)
+
+
+def setup(enabled: bool, window_seconds: float = 10.0):
+    """Gives the app fresh graphs on a fake LLM and a fresh coalescer; returns the run counter and the LLM."""
+    llm = FakeChatModel(latency=LATENCY)
+    app.state.graph_registry = registry = CountingRegistry(GraphRegistry(llm))
+    app.state.single_flight = SingleFlight(enabled=enabled, window_seconds=window_seconds)
+    # Every uncoalesced request is a run of its own; let them all in
+    app.state.admission = AdmissionController(enabled=False)
+    return registry, llm
+
+
+def parse_sse(text: str) -> list:
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], lines["data"]))
+    return events
+
+
+async def post(client: httpx.AsyncClient, stream: bool, payload: dict = PAYLOAD, delay: float = 0.0):
+    """Sends one request after 'delay' seconds; returns its latency and its final data."""
+    await asyncio.sleep(delay)
+    started = time.perf_counter()
+    if stream:
+        response = await client.post("/blogs/stream", json=payload)
+        event, data = parse_sse(response.text)[-1]
+        result = data if event == "done" else None
+    else:
+        response = await client.post("/blogs", json=payload)
+        result = response.json()["data"]["blog"] if response.status_code == 200 else None
+    return time.perf_counter() - started, result
+
+
+async def burst(client, enabled: bool, spread_seconds: float, stream_share: float = 0.0) -> dict:
+    """REQUESTS identical requests arriving evenly over 'spread_seconds'."""
+    registry, llm = setup(enabled)
+    streams = int(REQUESTS * stream_share)
+    results = await asyncio.gather(*(post(client, i < streams, delay=spread_seconds * i / REQUESTS)
+                                     for i in range(REQUESTS)))
+    latencies = [latency for latency, _ in results]
+    return {"runs": registry.runs, "llm_calls": llm.calls, "failed": sum(result is None for _, result in results),
+            "p50": percentile(latencies, 50), "p95": percentile(latencies, 95)}
+
+
+def report(name: str, result: dict):
+    print(f"{name:<44} | {result['runs']:>4} | {result['llm_calls']:>9} | {result['p50'] * 1000:7.0f} ms | "
+          f"{result['p95'] * 1000:7.0f} ms | {result['failed']:>6}")
+
+
+async def late_stream_replay(client) -> bool:
+    """A stream attaching to a run under way gets the same events as the one that started it."""
+    setup(enabled=True)
+    first = asyncio.create_task(client.post("/blogs/stream", json=PAYLOAD))
+    await asyncio.sleep(LATENCY * 1.5)  # The title is done, the content is being written
+    second = await client.post("/blogs/stream", json=PAYLOAD)
+    first_events, second_events = parse_sse((await first).text), parse_sse(second.text)
+    return first_events == second_events and len(first_events) > 1
+
+
+async def run():
+    # Keep generated blog files out of the working tree
+    os.chdir(tempfile.mkdtemp(prefix="blog-coalescing-"))
+    failures = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        print(f"{REQUESTS} identical requests for a topic in french, fake LLM {LATENCY * 1000:.0f} ms per call\n")
+        print("scenario                                     | runs | LLM calls |     p50    |     p95    | failed")
+        for name, spread, stream_share in (("all at once, POST /blogs", 0.0, 0.0),
+                                           ("all at once, half streaming", 0.0, 0.5),
+                                           ("arriving over 1 s, POST /blogs", 1.0, 0.0)):
+            report(f"{name}, not coalesced", await burst(client, False, spread, stream_share))
+            coalesced = await burst(client, True, spread, stream_share)
+            report(f"{name}, coalesced", coalesced)
+            if coalesced["runs"] != 1 or coalesced["failed"]:
+                failures.append(f"{name}: {coalesced['runs']} graph runs, {coalesced['failed']} failed requests")
+
+        registry, _ = setup(enabled=True)
+        await asyncio.gather(*(post(client, False, {**PAYLOAD, "topic": f"topic {i}"}) for i in range(10)))
+        print(f"\n10 different topics at once: {registry.runs} graph runs")
+        if registry.runs != 10:
+            failures.append(f"different topics were coalesced: {registry.runs} runs for 10 topics")
+
+        replayed = await late_stream_replay(client)
+        print(f"late stream attached to a run under way: {'same events as the first stream' if replayed else 'EVENTS DIFFER'}")
+        if not replayed:
+            failures.append("a late stream did not replay the events it missed")
+
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
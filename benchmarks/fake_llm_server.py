@@ -0,0 +1,131 @@
+# benchmarks/fake_llm_server.py
+# A local Groq/OpenAI-compatible chat completions server with injected latency and failures.
+# Point ChatGroq at it with base_url (or GROQ_BASE_URL) to exercise the real HTTP client path.
+#
+# Usage (standalone):
+#   python -m benchmarks.fake_llm_server --port 8100 --throttle-rate 0.3
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def create_app(latency: float = 0.05, throttle_rate: float = 0.0, error_rate: float = 0.0,
+               retry_after: float = 0.0, response: str = "Fake LLM response.") -> FastAPI:
+    """
+    Builds the fake server. 'throttle_rate' and 'error_rate' are the probabilities of answering
+    a request with 429 (with an optional Retry-After header) or 503.
+    """
+    app = FastAPI()
+    app.state.stats = {"requests": 0, "throttled": 0, "errors": 0}
+
+    def completion_message(body: dict) -> dict:
+        tools = body.get("tools") or []
+        if not tools:
+            return {"role": "assistant", "content": response}
+        # Structured output: call the first tool with every schema property filled in.
+        # Array properties get one entry per <p id="N"> block in the prompt, as used by chunked translation.
+        function = tools[0]["function"]
+        prompt = "\n".join(str(m.get("content") or "") for m in body.get("messages", []))
+        blocks = re.findall(r'<p id="\d+">\n?(.*?)\n?</p>', prompt, re.DOTALL)
+        arguments = {
+            name: [f"[translated] {block}" for block in blocks] if prop.get("type") == "array" else f"[translated {name}]"
+            for name, prop in function.get("parameters", {}).get("properties", {}).items()
+        }
+        return {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": f"call_{uuid.uuid4().hex[:8]}",
+                "type": "function",
+                "function": {"name": function["name"], "arguments": json.dumps(arguments)},
+            }],
+        }
+
+    def usage(body: dict, completion: str) -> dict:
+        prompt_tokens = len(json.dumps(body.get("messages", []))) // 4
+        completion_tokens = max(1, len(completion) // 4)
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens}
+
+    async def stream_chunks(body: dict, completion_id: str):
+        words = response.split(" ")
+        for i, word in enumerate(words):
+            chunk = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "delta": {"content": word + (" " if i < len(words) - 1 else "")},
+                             "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(latency / max(1, len(words)))
+        final = {
+            "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "x_groq": {"usage": usage(body, response)},
+        }
+        yield f"data: {json.dumps(final)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats = app.state.stats
+        stats["requests"] += 1
+
+        roll = random.random()
+        if roll < throttle_rate:
+            stats["throttled"] += 1
+            headers = {"retry-after": str(retry_after)} if retry_after else {}
+            return JSONResponse(status_code=429, headers=headers,
+                                content={"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}})
+        if roll < throttle_rate + error_rate:
+            stats["errors"] += 1
+            return JSONResponse(status_code=503, content={"error": {"message": "Service unavailable"}})
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        if body.get("stream") and not body.get("tools"):
+            return StreamingResponse(stream_chunks(body, completion_id), media_type="text/event-stream")
+
+        await asyncio.sleep(latency)
+        message = completion_message(body)
+        return {
+            "id": completion_id, "object": "chat.completion", "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "message": message,
+                         "finish_reason": "tool_calls" if message.get("tool_calls") else "stop"}],
+            "usage": usage(body, json.dumps(message)),
+        }
+
+    return app
+
+
+def serve_in_thread(app: FastAPI, port: int) -> uvicorn.Server:
+    """Starts the app on 127.0.0.1:<port> in a daemon thread and waits until it accepts requests."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake Groq-compatible chat completions server.")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency, args.throttle_rate, args.error_rate, args.retry_after),
+                host="127.0.0.1", port=args.port)
@@ -0,0 +1,43 @@
+# benchmarks/graph_setup_benchmark.py
+# Compares the per-request setup overhead of building the LLM client and compiling
+# a graph on every request against looking up a graph compiled once at startup.
+#
+# Usage:
+#   python -m benchmarks.graph_setup_benchmark
+
+import os
+import time
+
+# ChatGroq only needs a key to be constructed; no network calls are made here
+os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder-key")
+
+from src.graphs.graph_builder import GraphBuilder
+from src.graphs.graph_registry import GraphRegistry
+from src.llms.groqllm import GroqLLM, get_shared_llm
+
+ITERATIONS = 50
+
+
+def per_request_setup(usecase: str):
+    llm = GroqLLM().get_llm()
+    return GraphBuilder(llm).setup_graph(usecase=usecase)
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn(*args)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def run():
+    registry = GraphRegistry(get_shared_llm())
+    print(f"Average setup overhead per request over {ITERATIONS} iterations")
+    for usecase in registry.usecases:
+        before = timed(per_request_setup, usecase)
+        after = timed(registry.get, usecase)
+        print(f"{usecase:>8}: per-request build {before * 1000:8.3f} ms | registry lookup {after * 1000:8.4f} ms")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,85 @@
+# benchmarks/incremental_translation_benchmark.py
+# Re-translates edited versions of a translated blog through the 'retranslate' graph (PATCH /blogs)
+# and compares LLM calls and latency with translating the edited blog from scratch.
+# Every incremental result is checked against the from-scratch translation.
+#
+# Usage:
+#   python -m benchmarks.incremental_translation_benchmark
+
+import asyncio
+import sys
+import time
+
+from src.graphs.graph_builder import GraphBuilder
+from src.graphs.graph_registry import build_retranslation_input
+from src.llms.fakellm import FakeChatModel
+
+PARAGRAPHS = 40
+LATENCY = 0.05
+LANGUAGES = ["french", "german"]
+TITLE = "Incremental Translation"
+
+
+def make_paragraphs() -> list:
+    return [f"## Section {i // 4 + 1}" if i % 4 == 0 else f"Paragraph {i} explains one aspect of the topic. " * 3
+            for i in range(PARAGRAPHS)]
+
+
+def edited(paragraphs: list, scenario: str):
+    """Returns the title and paragraphs of an edited version of the blog."""
+    paragraphs = list(paragraphs)
+    title = TITLE
+    if scenario == "one paragraph changed":
+        paragraphs[5] += " An editor added a sentence."
+    elif scenario == "three paragraphs changed":
+        for i in (2, 17, 33):
+            paragraphs[i] = paragraphs[i].replace("aspect", "detail")
+    elif scenario == "paragraph inserted":
+        paragraphs.insert(10, "A brand new paragraph written by an editor.")
+    elif scenario == "paragraph removed":
+        del paragraphs[7]
+    elif scenario == "title changed":
+        title = "Incremental Translation, Revised"
+    return title, paragraphs
+
+
+async def retranslate(body: dict):
+    llm = FakeChatModel(latency=LATENCY)
+    _, graph_input = build_retranslation_input(body)
+    graph = GraphBuilder(llm).setup_graph("retranslate")
+    start = time.perf_counter()
+    state = await graph.ainvoke(graph_input)
+    return state["translations"], llm.calls, time.perf_counter() - start
+
+
+async def run():
+    paragraphs = make_paragraphs()
+    source = {"title": TITLE, "content": "\n\n".join(paragraphs)}
+    previous_translations, full_calls, full_seconds = await retranslate(
+        {"blog": source, "target_languages": LANGUAGES})
+    print(f"{PARAGRAPHS} paragraphs into {', '.join(LANGUAGES)}, {LATENCY * 1000:.0f} ms per call")
+    print(f"full translation: {full_calls} calls, {full_seconds:.2f} s\n")
+    print("edit                      | from scratch        | incremental         | calls saved")
+
+    mismatches = 0
+    scenarios = ["no change", "one paragraph changed", "three paragraphs changed", "paragraph inserted",
+                 "paragraph removed", "title changed"]
+    for scenario in scenarios:
+        title, edited_paragraphs = edited(paragraphs, scenario)
+        blog = {"title": title, "content": "\n\n".join(edited_paragraphs)}
+        expected, scratch_calls, scratch_seconds = await retranslate({"blog": blog, "target_languages": LANGUAGES})
+        result, calls, seconds = await retranslate({
+            "blog": blog,
+            "previous": {"blog": source, "translations": previous_translations},
+        })
+        matches = result == expected
+        mismatches += not matches
+        print(f"{scenario:<25} | {scratch_calls:>4} calls {scratch_seconds:5.2f} s | {calls:>4} calls {seconds:5.2f} s | "
+              f"{scratch_calls - calls:>11}{'' if matches else '  RESULT MISMATCH'}")
+
+    if mismatches:
+        sys.exit(f"{mismatches} incremental translation(s) did not match the from-scratch translation")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,188 @@
+# benchmarks/llm_output_parser_benchmark.py
+# Compares the incremental JSON field extractor with the previous raw string parsing of
+# extract_content_from_llm_output (a greedy '{.*}' regex over the whole answer, then json.loads):
+# - fuzz: answers with code fences, chatter (braces included), nested values and escapes, fed
+#   in random chunks; the extractor must recover every field exactly
+# - throughput: one pass over a whole answer, following a stream chunk by chunk (re-parsing the
+#   answer so far with the regex), and chatter full of unclosed braces
+# - end to end: translation on a fake LLM that wraps its JSON in chatter, through the streaming
+#   path; paragraphs must be recovered rather than fall back, and 'token' events decoded
+# Exits non-zero if a fuzz case or the end-to-end check fails.
+#
+# Usage:
+#   python -m benchmarks.llm_output_parser_benchmark
+
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+# app.py reads these at import time; the fake LLM never uses them
+os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder-key")
+os.environ.setdefault("LANGCHAIN_API_KEY", "benchmark-placeholder-key")
+# Keep benchmark logs out of the working tree
+os.environ.setdefault("LOG_DIR", os.path.join(tempfile.gettempdir(), "blog-benchmark-logs"))
+
+from app import stream_blog
+from src.graphs.graph_builder import GraphBuilder
+from src.graphs.graph_registry import build_graph_input
+from src.llms.fakellm import FakeChatModel
+from src.nodes.markdown_segmenter import segment_markdown
+from src.utils.blog_storage import get_blog_store
+from src.utils.llm_output_parser import JsonFieldExtractor, extract_json_field
+
+FUZZ_CASES = 20000
+SEED = 23
+ALPHABET = 'ab \n"\\{}[],:/éü😀\t<>`'
+PREFIXES = ["", "```json\n", "Sure! Here is the JSON:\n```json\n", "Output {as requested}:\n", "{} ",
+            'Note: { "draft" is below\n']
+SUFFIXES = ["", "\n```", "\n```\nHope {this} helps!", " }}"]
+STREAM_CHUNK = 16
+POST = ("Streaming parsers read output as it arrives.\n\nThey keep a little state between chunks.\n\n"
+        "```json\n{\"content\": \"kept as it is\"}\n```\n\nAnd they never look back.")
+
+
+def regex_extract(output: str, field: str = "content"):
+    """The previous raw string parsing of extract_content_from_llm_output."""
+    try:
+        match = re.search(r'\{.*\}', output, re.DOTALL)
+        return json.loads(match.group(0)).get(field) if match else None
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+
+def random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 60)))
+
+
+def fuzz_case(rng: random.Random):
+    """An answer holding 'content' and 'title' among other values, and the fields it holds."""
+    answer = {"content": random_text(rng), "title": random_text(rng),
+              "notes": rng.choice([None, 3.5, True, [random_text(rng), {"content": "nested"}], {"a": "}]"}]),
+              "draft": random_text(rng)}
+    keys = list(answer)
+    rng.shuffle(keys)
+    body = json.dumps({key: answer[key] for key in keys}, ensure_ascii=rng.random() < 0.5,
+                      indent=rng.choice([None, 2]))
+    return rng.choice(PREFIXES) + body + rng.choice(SUFFIXES), answer
+
+
+def streamed(text: str, rng: random.Random, fields=("content", "title")) -> tuple:
+    """Feeds the text in random chunks; returns the extractor and the concatenated deltas per field."""
+    extractor = JsonFieldExtractor(fields)
+    joined = {field: "" for field in fields}
+    i = 0
+    while i < len(text):
+        size = rng.randint(1, 12)
+        for field, delta in extractor.feed(text[i:i + size]):
+            joined[field] += delta
+        i += size
+    return extractor, joined
+
+
+def fuzz():
+    rng = random.Random(SEED)
+    regex_ok = whole_ok = streamed_ok = 0
+    failures = []
+    for _ in range(FUZZ_CASES):
+        text, answer = fuzz_case(rng)
+        regex_ok += regex_extract(text) == answer["content"]
+        whole_ok += extract_json_field(text) == answer["content"]
+        extractor, joined = streamed(text, rng)
+        if all(extractor.value(f) == answer[f] and joined[f] == answer[f] for f in ("content", "title")):
+            streamed_ok += 1
+        elif len(failures) < 3:
+            failures.append(text)
+    print(f"fuzz: {FUZZ_CASES} answers with fences, chatter, nested values and escapes")
+    print(f"  regex + json.loads, whole answer:  {regex_ok / FUZZ_CASES:7.1%} content recovered")
+    print(f"  extractor, whole answer:           {whole_ok / FUZZ_CASES:7.1%} content recovered")
+    print(f"  extractor, random chunks:          {streamed_ok / FUZZ_CASES:7.1%} content and title recovered")
+    return [f"fuzz case not recovered: {text!r}" for text in failures]
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def follow_with_regex(text: str):
+    """What following a stream took before: re-parsing everything received after each chunk."""
+    for end in range(STREAM_CHUNK, len(text) + STREAM_CHUNK, STREAM_CHUNK):
+        regex_extract(text[:end])
+
+
+def follow_with_extractor(text: str):
+    extractor = JsonFieldExtractor()
+    for start in range(0, len(text), STREAM_CHUNK):
+        extractor.feed(text[start:start + STREAM_CHUNK])
+
+
+def throughput():
+    print("\nthroughput                        |     regex + json |        extractor")
+    rows = []
+    for size in (2_000, 50_000):
+        text = "```json\n" + json.dumps({"content": "Ein übersetzter Absatz mit \"Zitaten\".\n" * (size // 40)}) + "\n```"
+        rows.append((f"whole answer, {len(text) // 1000} KB", text, 50,
+                     lambda t=text: regex_extract(t), lambda t=text: extract_json_field(t)))
+    text = json.dumps({"content": "Ein übersetzter Absatz.\n" * 800})
+    rows.append((f"stream, {len(text) // 1000} KB in {STREAM_CHUNK}-char chunks", text, 2,
+                 lambda t=text: follow_with_regex(t), lambda t=text: follow_with_extractor(t)))
+    text = "Here {is {the {answer " * 2000
+    rows.append((f"{len(text) // 1000} KB of chatter, unclosed braces", text, 2,
+                 lambda t=text: regex_extract(t), lambda t=text: extract_json_field(t)))
+    for name, text, repeat, old, new in rows:
+        old_seconds, new_seconds = timed(old, repeat), timed(new, repeat)
+        print(f"{name:<33} | {old_seconds * 1000:10.2f} ms | {new_seconds * 1000:10.2f} ms")
+
+
+async def end_to_end():
+    """Translates a post on a fake LLM that wraps its JSON answers in chatter, through stream_blog."""
+    llm = FakeChatModel(latency=0.01, chatty_json=True, response=POST)
+    usecase, graph_input = build_graph_input({"topic": "parser benchmark", "current_language": "french"})
+    graph = GraphBuilder(llm, instrument=False).setup_graph(usecase)
+    events = []
+    result = await stream_blog(graph, graph_input, usecase, lambda event, data: events.append((event, data)))
+    blog = result["data"]["blog"]
+    paragraphs = [data["content"] for event, data in events if event == "paragraph"]
+    recovered = sum(p.startswith("[translated]") for p in paragraphs)
+    # The code block is kept as it is, without a call
+    expected = sum(segment.translatable for segment in segment_markdown(POST).segments)
+    tokens = [data for event, data in events if event == "token" and data.get("node") == "translation"]
+    raw_tokens = [data for data in tokens if "{" in data["content"] or "field" not in data]
+    print(f"\nend to end (chatty JSON answers): {len(paragraphs)} paragraphs, "
+          f"{recovered} of {expected} recovered, "
+          f"title {blog['title']!r}, {len(tokens)} translation token events, {len(raw_tokens)} with raw JSON")
+    failures = []
+    if recovered != expected:
+        failures.append("translated paragraphs were not recovered from chatty answers")
+    if blog["title"] != "[translated title]":
+        failures.append("the translated title was not recovered from a chatty answer")
+    if not tokens or raw_tokens:
+        failures.append("translation token events did not carry decoded field text")
+    return failures
+
+
+def run():
+    failures = fuzz()
+    throughput()
+    # stream_blog saves the post; keep the blog files and index out of the working tree
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="blog-parser-") as workdir:
+        os.chdir(workdir)
+        try:
+            failures += asyncio.run(end_to_end())
+        finally:
+            get_blog_store().flush()
+            os.chdir(cwd)
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    run()
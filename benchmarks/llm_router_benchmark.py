@@ -0,0 +1,82 @@
+# benchmarks/llm_router_benchmark.py
+# Compares the latency-based LLM router with always using the first configured provider,
+# on two fake backends: one slow, and one that goes down for a while. Also shows which
+# model tier each node of the language graph used.
+#
+# Usage:
+#   python -m benchmarks.llm_router_benchmark
+
+import asyncio
+import time
+
+from src.graphs.graph_builder import GraphBuilder
+from src.llms.fakellm import FakeChatModel
+from src.llms.llm_router import LLMRouter
+from benchmarks.suite import latency_stats
+
+CALLS = 200
+CONCURRENCY = 8
+
+
+def backend(latency: float, name: str) -> FakeChatModel:
+    return FakeChatModel(latency=latency, latency_distribution="lognormal", latency_spread=0.4, model_name=name)
+
+
+async def drive(router: LLMRouter, outage: FakeChatModel = None) -> dict:
+    """Sends CALLS title-sized calls through the router; 'outage' fails every call in the middle third."""
+    # Warm every backend up first, as in a running server; cold-start latency would otherwise count against it
+    for chat_model in router.chat_models():
+        await chat_model.ainvoke("warm up")
+    model = router.for_node("title_creation")
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies, errors = [], 0
+
+    async def call(i: int):
+        nonlocal errors
+        async with semaphore:
+            if outage is not None:
+                outage.failure_rate = 1.0 if CALLS // 3 <= i < 2 * CALLS // 3 else 0.0
+            started = time.perf_counter()
+            try:
+                await model.ainvoke(f"Write a title for topic {i}")
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(call(i) for i in range(CALLS)))
+    stats = latency_stats(latencies)
+    return {"errors": errors, "p50": stats["p50_seconds"], "p95": stats["p95_seconds"],
+            "calls": {entry["provider"]: entry["calls"] for entry in router.stats() if entry["tier"] == "fast"}}
+
+
+def report(name: str, result: dict):
+    calls = ", ".join(f"{provider} {count}" for provider, count in result["calls"].items())
+    print(f"{name:<22} | {result['p50'] * 1000:7.1f} ms | {result['p95'] * 1000:7.1f} ms | {result['errors']:>6} | {calls}")
+
+
+async def run():
+    print(f"{CALLS} calls, {CONCURRENCY} in flight")
+    print("scenario               |     p50    |     p95    | errors | calls per provider (incl. failed)")
+
+    # A slow provider listed first: the router moves traffic to the faster one
+    slow, fast = backend(0.2, "slow-model"), backend(0.05, "fast-model")
+    report("slow first, static", await drive(LLMRouter({"slow": {"fast": slow}})))
+    report("slow first, routed", await drive(LLMRouter({"slow": {"fast": slow}, "fast": {"fast": fast}})))
+
+    # The preferred provider goes down for the middle third of the calls
+    primary, secondary = backend(0.05, "primary-model"), backend(0.15, "secondary-model")
+    report("outage, static", await drive(LLMRouter({"primary": {"fast": primary}}), outage=primary))
+    primary, secondary = backend(0.05, "primary-model"), backend(0.15, "secondary-model")
+    report("outage, routed", await drive(LLMRouter(
+        {"primary": {"fast": primary}, "secondary": {"fast": secondary}}, cooldown_seconds=0.5), outage=primary))
+
+    # Per-node tiers: titles and translations on the small model, content on the large one
+    small, large = FakeChatModel(latency=0.01, model_name="small-model"), FakeChatModel(latency=0.01, model_name="large-model")
+    graph = GraphBuilder(LLMRouter({"local": {"fast": small, "large": large}})).setup_graph("language")
+    await graph.ainvoke({"topic": "routing", "current_language": "french", "target_languages": ["french"]})
+    print(f"\nlanguage graph: {small.calls} calls on small-model (title, translation), "
+          f"{large.calls} on large-model (content)")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,64 @@
+# benchmarks/load_test.py
+# Drives POST /blogs with concurrent clients against a stub LLM with injected latency
+# and reports throughput for each concurrency level.
+#
+# Usage:
+#   python -m benchmarks.load_test
+
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+
+# app.py reads these at import time; the stub LLM never uses them
+os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder-key")
+os.environ.setdefault("LANGCHAIN_API_KEY", "benchmark-placeholder-key")
+
+from app import app
+from src.graphs.graph_registry import GraphRegistry
+from src.graphs.admission import AdmissionController
+from src.graphs.single_flight import SingleFlight
+from src.llms.fakellm import FakeLLM
+
+LATENCY = 0.1  # seconds per fake LLM call
+REQUESTS_PER_CLIENT = 5
+CLIENT_COUNTS = [1, 5, 10, 20]
+
+
+async def client_loop(client: httpx.AsyncClient, payload: dict):
+    for _ in range(REQUESTS_PER_CLIENT):
+        response = await client.post("/blogs", json=payload)
+        response.raise_for_status()
+
+
+async def run_level(clients: int, payload: dict) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, payload) for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+    return clients * REQUESTS_PER_CLIENT / elapsed
+
+
+async def run():
+    # Bypass the lifespan so the graphs are compiled against the stub LLM instead of Groq
+    app.state.graph_registry = GraphRegistry(FakeLLM(latency=LATENCY).get_llm())
+    # Every request repeats the same payload; measure full graph runs, not coalesced ones
+    app.state.single_flight = SingleFlight(enabled=False)
+    # Measure throughput, not admission control turning the higher concurrency levels away
+    app.state.admission = AdmissionController(enabled=False)
+    # Keep generated blog files out of the working tree
+    os.chdir(tempfile.mkdtemp(prefix="blog-loadtest-"))
+
+    print(f"Fake LLM latency: {LATENCY * 1000:.0f} ms per call, {REQUESTS_PER_CLIENT} requests per client")
+    for payload in ({"topic": "load test"}, {"topic": "load test", "current_language": "french"}):
+        usecase = "language" if payload.get("current_language") else "topic"
+        for clients in CLIENT_COUNTS:
+            throughput = await run_level(clients, payload)
+            print(f"{usecase:>8} graph | {clients:>3} clients | {throughput:8.2f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
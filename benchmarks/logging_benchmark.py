@@ -0,0 +1,65 @@
+# benchmarks/logging_benchmark.py
+# Measures per-request logging overhead on the calling threads, comparing handlers that
+# format and write synchronously with the queue-based mode used by src.utils.logger.
+#
+# Usage:
+#   python -m benchmarks.logging_benchmark
+
+import logging
+import queue
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueListener
+
+from src.utils.logger import build_handlers, PreparedQueueHandler
+
+RECORDS_PER_REQUEST = 15  # roughly what one language-graph run logs
+REQUESTS = 400
+CONCURRENCY_LEVELS = [1, 8, 32]
+
+
+def make_logger(name: str, handlers) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = list(handlers)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def fake_request(logger: logging.Logger, i: int):
+    start = time.perf_counter()
+    for step in range(RECORDS_PER_REQUEST):
+        logger.info(f"Request {i}: step {step} for topic 'benchmark' and language 'french'")
+    return time.perf_counter() - start
+
+
+def measure(logger: logging.Logger, concurrency: int) -> float:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        durations = list(executor.map(lambda i: fake_request(logger, i), range(REQUESTS)))
+    return sum(durations) / len(durations)
+
+
+def run():
+    log_dir = tempfile.mkdtemp(prefix="blog-logbench-")
+    # Keep console output out of the measurement's terminal: file handlers only
+    sync_handlers = build_handlers(log_dir)[1:]
+    async_handlers = build_handlers(log_dir)[1:]
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *async_handlers, respect_handler_level=True)
+    listener.start()
+
+    sync_logger = make_logger("benchmark.sync", sync_handlers)
+    async_logger = make_logger("benchmark.async", [PreparedQueueHandler(log_queue)])
+
+    print(f"{RECORDS_PER_REQUEST} records per request, {REQUESTS} requests, logs in {log_dir}")
+    print("threads | sync handlers (ms/request) | queue handler (ms/request)")
+    for concurrency in CONCURRENCY_LEVELS:
+        sync_ms = measure(sync_logger, concurrency) * 1000
+        async_ms = measure(async_logger, concurrency) * 1000
+        print(f"{concurrency:>7} | {sync_ms:>26.3f} | {async_ms:>26.3f}")
+    listener.stop()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,59 @@
+# benchmarks/long_post_benchmark.py
+# Compares writing long posts in one content call ('single' content mode) with planning an outline
+# and writing the sections concurrently ('sectioned'), on a fake LLM whose latency grows with the
+# length of its answer. Checks that every section stays within the per-call token budget.
+#
+# Usage:
+#   python -m benchmarks.long_post_benchmark
+
+import asyncio
+import sys
+import time
+
+from src.graphs.graph_builder import GraphBuilder
+from src.graphs.graph_registry import build_graph_input
+from src.llms.fakellm import FakeChatModel
+from src.nodes.content_outline import DEFAULT_SECTION_TOKEN_BUDGET
+from src.utils.token_counter import count_tokens
+
+TARGET_WORDS = [1000, 3000, 6000]
+LATENCY = 0.3  # seconds to the first token
+SECONDS_PER_OUTPUT_TOKEN = 0.002
+
+
+async def generate(content_mode: str, target_words: int) -> dict:
+    llm = FakeChatModel(latency=LATENCY, seconds_per_output_token=SECONDS_PER_OUTPUT_TOKEN, follow_length=True)
+    usecase, graph_input = build_graph_input({"topic": "long posts", "content_mode": content_mode,
+                                              "target_words": target_words})
+    graph = GraphBuilder(llm, instrument=False).setup_graph(usecase)
+    started = time.perf_counter()
+    state = await graph.ainvoke(graph_input)
+    content = state["blog"]["content"]
+    # Sections start with their '## ' heading; a single-call post is one piece
+    pieces = content.split("\n\n## ") if content_mode == "sectioned" else [content]
+    return {"seconds": time.perf_counter() - started, "calls": llm.calls, "words": len(content.split()),
+            "max_call_tokens": max(count_tokens(piece) for piece in pieces)}
+
+
+def report(target_words: int, content_mode: str, result: dict):
+    print(f"{target_words:>6} | {content_mode:<9} | {result['seconds']:6.2f} s | {result['calls']:>5} | "
+          f"{result['words']:>5} | {result['max_call_tokens']:>15}")
+
+
+async def run():
+    print(f"fake LLM: {LATENCY * 1000:.0f} ms + {SECONDS_PER_OUTPUT_TOKEN * 1000:.0f} ms per output token; "
+          f"section budget {DEFAULT_SECTION_TOKEN_BUDGET} tokens\n")
+    print(" words | mode      |  latency | calls | words | max tokens/call")
+    over_budget = []
+    for target_words in TARGET_WORDS:
+        for content_mode in ("single", "sectioned"):
+            result = await generate(content_mode, target_words)
+            report(target_words, content_mode, result)
+            if content_mode == "sectioned" and result["max_call_tokens"] > DEFAULT_SECTION_TOKEN_BUDGET:
+                over_budget.append(f"{target_words} words: a section has {result['max_call_tokens']} tokens")
+    if over_budget:
+        sys.exit("\n".join(over_budget))
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
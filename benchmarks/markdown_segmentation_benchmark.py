@@ -0,0 +1,116 @@
+# benchmarks/markdown_segmentation_benchmark.py
+# Compares splitting generated posts on blank lines (the previous paragraph split) with the
+# Markdown segmenter: translation calls per post, and code fences cut apart by the split. Checks
+# that joining the segments gives each post back exactly, and that translating a post through
+# the 'retranslate' graph leaves its code blocks, rules and links unchanged.
+#
+# Usage:
+#   python -m benchmarks.markdown_segmentation_benchmark
+
+import asyncio
+import random
+import sys
+import time
+
+from src.graphs.graph_builder import GraphBuilder
+from src.graphs.graph_registry import build_retranslation_input
+from src.llms.fakellm import FakeChatModel
+from src.nodes.markdown_segmenter import segment_markdown
+
+POSTS = 200
+SEED = 7
+LATENCY = 0.02
+
+
+def make_post(rng: random.Random, index: int) -> str:
+    """A generated post mixing prose with code (with blank lines inside), tables, lists, rules and links."""
+    blocks = [f"# Post {index}"]
+    for section in range(rng.randint(3, 6)):
+        blocks.append(f"## Section {section + 1}")
+        blocks.append(f"Section {section + 1} explains one part of the topic in a few sentences. " * 2)
+        kind = rng.choice(["code", "table", "list", "rule", "link", "image"])
+        if kind == "code":
+            blocks.append("```python\ndef handler(event):\n    data = load(event)\n\n"
+                          "    # A blank line inside the fence\n\n    return process(data)\n```")
+        elif kind == "table":
+            blocks.append("| Option | Default |\n|--------|---------|\n| retries | 3 |\n| timeout | 30 s |")
+        elif kind == "list":
+            blocks.append("- The first point\n- The second point\n\n- A point after a blank line\n  continued here")
+        elif kind == "rule":
+            blocks.append("---")
+        elif kind == "link":
+            blocks.append(f"https://example.com/docs/section-{section}")
+        else:
+            blocks.append(f"![Diagram {section}](https://example.com/img/{index}-{section}.png)")
+    blocks.append("Thanks for reading.")
+    return "\n\n".join(blocks) + "\n"
+
+
+def naive_split(content: str) -> list:
+    return [p.strip() for p in content.split("\n\n") if p.strip()]
+
+
+def broken_fences(pieces: list) -> int:
+    """Pieces holding an odd number of fence lines: a code block cut in two."""
+    return sum(sum(line.lstrip().startswith("```") for line in piece.splitlines()) % 2 for piece in pieces)
+
+
+def untranslatable_texts(content: str) -> list:
+    return [segment.text for segment in segment_markdown(content).segments if not segment.translatable]
+
+
+async def translate(post: str):
+    llm = FakeChatModel(latency=LATENCY)
+    _, graph_input = build_retranslation_input(
+        {"blog": {"title": "Segmentation", "content": post}, "target_languages": ["french"]})
+    graph = GraphBuilder(llm, instrument=False).setup_graph("retranslate")
+    state = await graph.ainvoke(graph_input)
+    return state["translations"]["french"]["content"], llm.calls
+
+
+async def run():
+    rng = random.Random(SEED)
+    posts = [make_post(rng, i) for i in range(POSTS)]
+
+    naive_calls = segmented_calls = naive_broken = segmented_broken = mismatches = 0
+    started = time.perf_counter()
+    for post in posts:
+        document = segment_markdown(post)
+        naive = naive_split(post)
+        naive_calls += len(naive)
+        naive_broken += broken_fences(naive)
+        segmented_calls += sum(segment.translatable for segment in document.segments)
+        segmented_broken += broken_fences(document.texts)
+        mismatches += document.join() != post
+    seconds = time.perf_counter() - started
+
+    print(f"{POSTS} generated posts, segmented in {seconds * 1000:.1f} ms "
+          f"({seconds / POSTS * 1e6:.0f} µs per post)\n")
+    print("split              | translation calls | broken code fences")
+    print(f"blank lines        | {naive_calls:>17} | {naive_broken:>18}")
+    print(f"markdown segments  | {segmented_calls:>17} | {segmented_broken:>18}")
+    print(f"\nround trips that differ from the source: {mismatches}")
+
+    # End to end on the language graph: what is not translatable must come out unchanged
+    post = max(posts, key=lambda p: len(set(untranslatable_texts(p))))
+    translated, calls = await translate(post)
+    missing = [text for text in untranslatable_texts(post) if text not in translated]
+    expected_calls = sum(segment.translatable for segment in segment_markdown(post).segments) + 1
+    print(f"translated one post: {calls} LLM calls (expected {expected_calls}), "
+          f"{len(missing)} untranslatable blocks changed")
+
+    failures = []
+    if segmented_broken:
+        failures.append(f"{segmented_broken} code fences were cut apart")
+    if mismatches:
+        failures.append(f"{mismatches} posts did not round-trip exactly")
+    if missing:
+        failures.append(f"{len(missing)} code, rule or link blocks changed in translation")
+    if calls != expected_calls:
+        failures.append(f"translation made {calls} LLM calls instead of {expected_calls}")
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,57 @@
+# benchmarks/metrics_overhead_benchmark.py
+# Measures what the node and LLM instrumentation costs per graph run, using a zero-latency
+# fake LLM so the graph machinery and the instrumentation are all that is timed.
+#
+# Usage:
+#   python -m benchmarks.metrics_overhead_benchmark
+
+import asyncio
+import statistics
+import time
+
+from src.graphs.graph_builder import GraphBuilder
+from src.llms.fakellm import FakeChatModel
+from src.utils.metrics import track_run
+
+RUNS = 200
+PARAGRAPHS = 10
+GRAPH_INPUT = {"topic": "metrics", "current_language": "french", "target_languages": ["french", "german"]}
+
+
+def build_graph(instrument: bool):
+    content = "\n\n".join(f"Paragraph {i}." for i in range(PARAGRAPHS))
+    return GraphBuilder(FakeChatModel(latency=0.0, response=content), instrument=instrument).setup_graph("language")
+
+
+async def timed_run(graph, instrument: bool) -> float:
+    start = time.perf_counter()
+    if instrument:
+        with track_run("language"):
+            await graph.ainvoke(GRAPH_INPUT)
+    else:
+        await graph.ainvoke(GRAPH_INPUT)
+    return time.perf_counter() - start
+
+
+async def run():
+    graphs = {False: build_graph(False), True: build_graph(True)}
+    timings = {False: [], True: []}
+    # Interleave the two graphs so drift (GC, log volume, CPU frequency) hits both equally
+    for i in range(RUNS + 20):
+        for instrument in (False, True) if i % 2 else (True, False):
+            elapsed = await timed_run(graphs[instrument], instrument)
+            if i >= 20:  # the first runs are warm-up
+                timings[instrument].append(elapsed)
+
+    calls = 2 + 2 * (PARAGRAPHS + 1)
+    plain_ms = statistics.median(timings[False]) * 1000
+    instrumented_ms = statistics.median(timings[True]) * 1000
+    print(f"Language graph, 2 languages x {PARAGRAPHS} paragraphs ({calls} LLM calls), {RUNS} runs, zero LLM latency")
+    print(f"   uninstrumented | median {plain_ms:7.2f} ms per run")
+    print(f"     instrumented | median {instrumented_ms:7.2f} ms per run")
+    print(f"         overhead | {instrumented_ms - plain_ms:7.2f} ms per run, "
+          f"{(instrumented_ms - plain_ms) / calls * 1000:6.1f} us per LLM call")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
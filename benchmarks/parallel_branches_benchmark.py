@@ -0,0 +1,74 @@
+# benchmarks/parallel_branches_benchmark.py
+# Compares the graphs with title and content generation as parallel branches from START with
+# the previous layout, where content_generation waited for title_creation. Runs both layouts
+# on the same fake LLM and checks that they produce the same blog.
+#
+# Usage:
+#   python -m benchmarks.parallel_branches_benchmark
+
+import asyncio
+import sys
+import time
+
+from langgraph.graph import START
+
+from src.graphs.graph_builder import GraphBuilder
+from src.graphs.graph_registry import build_graph_input
+from src.llms.fakellm import FakeChatModel
+from benchmarks.suite import percentile
+
+RUNS = 10
+LATENCY = 0.3  # median seconds to the first token
+SPREAD = 0.3  # lognormal sigma
+SECONDS_PER_OUTPUT_TOKEN = 0.001
+
+
+class SequentialGraphBuilder(GraphBuilder):
+    """The previous layout: START -> title_creation -> content_generation -> next node."""
+
+    def _blog_nodes(self, next_node):
+        node = self.blog_node_obj
+        self.graph.add_node("title_creation", self._node("title_creation", node.title_creation, node.atitle_creation))
+        self.graph.add_node("content_generation", self._node("content_generation", node.content_generation, node.acontent_generation))
+        self.graph.add_edge(START, "title_creation")
+        self.graph.add_edge("title_creation", "content_generation")
+        self.graph.add_edge("content_generation", next_node)
+
+
+async def measure(builder_class, usecase: str, graph_input: dict):
+    """Runs the graph RUNS times, one after another; returns the latencies and the last state."""
+    llm = FakeChatModel(latency=LATENCY, latency_distribution="lognormal", latency_spread=SPREAD,
+                        seconds_per_output_token=SECONDS_PER_OUTPUT_TOKEN, follow_length=True)
+    graph = builder_class(llm, instrument=False).setup_graph(usecase)
+    latencies, state = [], None
+    for run in range(RUNS):
+        started = time.perf_counter()
+        state = await graph.ainvoke({**graph_input, "topic": f"{graph_input['topic']} {run}"})
+        latencies.append(time.perf_counter() - started)
+    return latencies, state
+
+
+def report(name: str, latencies: list):
+    print(f"{name:<32} | {percentile(latencies, 50) * 1000:7.0f} ms | {percentile(latencies, 95) * 1000:7.0f} ms")
+
+
+async def run():
+    print(f"{RUNS} runs per layout, fake LLM: lognormal latency, median {LATENCY * 1000:.0f} ms, "
+          f"+{SECONDS_PER_OUTPUT_TOKEN * 1000:.0f} ms per output token\n")
+    print("graph                            |     p50    |     p95")
+    mismatches = []
+    for name, body in (("topic", {"topic": "parallel branches"}),
+                       ("language (french)", {"topic": "parallel branches", "current_language": "french"})):
+        usecase, graph_input = build_graph_input(body)
+        sequential, sequential_state = await measure(SequentialGraphBuilder, usecase, graph_input)
+        parallel, parallel_state = await measure(GraphBuilder, usecase, graph_input)
+        report(f"{name}, sequential", sequential)
+        report(f"{name}, parallel", parallel)
+        if sequential_state["blog"] != parallel_state["blog"]:
+            mismatches.append(name)
+    if mismatches:
+        sys.exit(f"The layouts produced different blogs for: {', '.join(mismatches)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
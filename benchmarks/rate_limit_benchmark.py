@@ -0,0 +1,63 @@
+# benchmarks/rate_limit_benchmark.py
+# Translates a long post through ChatGroq pointed at the local fake server, which answers
+# a share of requests with 429s, and compares the rate-limited client with a no-retry client.
+#
+# Usage:
+#   python -m benchmarks.rate_limit_benchmark
+
+import asyncio
+import time
+
+import httpx
+from langchain_groq import ChatGroq
+
+from benchmarks.fake_llm_server import create_app, serve_in_thread
+from src.llms.rate_limiter import RateLimitController, RateLimitedTransport, AsyncRateLimitedTransport
+from src.nodes.blog_node import BlogNode
+
+PORT = 8123
+PARAGRAPHS = 20
+THROTTLE_RATE = 0.3
+
+
+def build_llm(controller: RateLimitController) -> ChatGroq:
+    return ChatGroq(
+        api_key="benchmark-placeholder-key",
+        model="llama-3.1-8b-instant",
+        base_url=f"http://127.0.0.1:{PORT}",
+        max_retries=0,
+        http_client=httpx.Client(transport=RateLimitedTransport(controller)),
+        http_async_client=httpx.AsyncClient(transport=AsyncRateLimitedTransport(controller)),
+    )
+
+
+def make_state() -> dict:
+    content = "\n\n".join(f"Paragraph {i} of the blog post." for i in range(PARAGRAPHS))
+    return {"topic": "rate limits", "current_language": "french",
+            "blog": {"title": "Benchmark Title", "content": content}}
+
+
+async def run_scenario(name: str, controller: RateLimitController):
+    node = BlogNode(build_llm(controller), max_concurrency=10)
+    start = time.perf_counter()
+    result = await node.atranslation(make_state())
+    elapsed = time.perf_counter() - start
+    fallbacks = sum(1 for p in result["blog"]["content"].split("\n\n") if p.startswith("Paragraph"))
+    stats = controller.stats()
+    print(f"{name:>14} | {elapsed:6.2f} s | fallbacks {fallbacks:>2}/{PARAGRAPHS} | "
+          f"requests {stats['requests']:>3} | throttled {stats['throttled']:>3} | retries {stats['retries']:>3} | "
+          f"queued {stats['queued_seconds']:6.2f} s | llm {stats['llm_seconds']:6.2f} s | "
+          f"final concurrency limit {stats['concurrency_limit']}")
+
+
+async def run():
+    serve_in_thread(create_app(latency=0.05, throttle_rate=THROTTLE_RATE), PORT)
+    print(f"Fake server answering {THROTTLE_RATE:.0%} of requests with 429")
+    await run_scenario("no retries", RateLimitController("no-retries", max_concurrency=10, max_retries=0))
+    await run_scenario("rate limited", RateLimitController(
+        "rate-limited", requests_per_minute=600, max_concurrency=10, max_retries=6, base_delay=0.05, max_delay=1.0,
+    ))
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,196 @@
+# benchmarks/scale_out_benchmark.py
+# Runs the API as several uvicorn worker processes on one host, sharing a working directory (and so
+# the SQLite files under data/), with this script as a round-robin load balancer. The workers use the
+# in-process fake LLM provider, so no API key or network access is needed.
+# - scaling: distinct topics from concurrent clients against 1, 2 and 4 workers; each worker runs
+#   at most ADMISSION_MAX_RUNS graphs at once, so throughput should grow with the worker count
+# - sharing: with SHARED_STATE_BACKEND=memory and =sqlite, bursts of identical requests spread over
+#   the workers (graph runs), topics repeated on another worker (LLM cache hits), and jobs submitted
+#   to one worker and polled on another (each claimed exactly once)
+# Exits non-zero if the sqlite backend does not share runs and cache entries across the workers,
+# a job is claimed twice or not finished, or 4 workers are not at least twice as fast as 1.
+#
+# Usage:
+#   python -m benchmarks.scale_out_benchmark
+
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_PORT = 8710
+LATENCY = 0.5  # seconds per fake LLM call
+MAX_RUNS = 8  # graph runs per worker
+CLIENTS = 32
+REQUESTS_PER_CLIENT = 4
+WORKER_COUNTS = (1, 2, 4)
+SHARING_WORKERS = 4
+BURST_TOPICS = 6
+BURST_SIZE = 8  # identical requests per topic, spread over the workers
+REPEAT_TOPICS = 8
+JOBS = 24
+
+
+class Workers:
+    """Starts 'count' API worker processes in one working directory and balances requests over them."""
+
+    def __init__(self, count: int, backend: str, workdir: str):
+        self.count = count
+        self.backend = backend
+        self.workdir = workdir
+        self.processes = []
+        self.clients = []
+        self.next = 0
+
+    async def __aenter__(self):
+        env = {**os.environ, "PYTHONPATH": ROOT, "LLM_PROVIDERS": "fake", "FAKE_LLM_LATENCY": str(LATENCY),
+               "SHARED_STATE_BACKEND": self.backend, "ADMISSION_MAX_RUNS": str(MAX_RUNS),
+               "ADMISSION_CLIENT_LIMIT": "0", "COALESCE_WINDOW_SECONDS": "1", "JOB_WORKERS": "2",
+               "GROQ_API_KEY": "benchmark-placeholder-key", "LANGCHAIN_API_KEY": "benchmark-placeholder-key",
+               "LANGCHAIN_TRACING_V2": "false",
+               "LOG_DIR": os.path.join(tempfile.gettempdir(), "blog-benchmark-logs")}
+        for n in range(self.count):
+            self.processes.append(subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app:app", "--port", str(BASE_PORT + n), "--log-level", "warning"],
+                cwd=self.workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+            self.clients.append(httpx.AsyncClient(base_url=f"http://127.0.0.1:{BASE_PORT + n}", timeout=120))
+        for client in self.clients:
+            await self._wait_ready(client)
+        return self
+
+    @staticmethod
+    async def _wait_ready(client: httpx.AsyncClient):
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/admission/stats")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+        raise SystemExit(f"worker at {client.base_url} did not start")
+
+    async def __aexit__(self, *exc):
+        for client in self.clients:
+            await client.aclose()
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.wait()
+
+    def pick(self) -> httpx.AsyncClient:
+        """The next worker, round robin."""
+        client = self.clients[self.next % self.count]
+        self.next += 1
+        return client
+
+    async def metric(self, name: str) -> float:
+        """Sums a metric over every worker's /metrics."""
+        total = 0.0
+        for client in self.clients:
+            text = (await client.get("/metrics")).text
+            total += sum(float(value) for value in re.findall(rf"^{name}(?:{{[^}}]*}})? (\S+)$", text, re.M))
+        return total
+
+    async def cache_hits(self) -> int:
+        """Sums the LLM cache hits of every worker."""
+        return sum([(await client.get("/cache/stats")).json()["data"].get("hits", 0) for client in self.clients])
+
+
+async def scaling(count: int) -> float:
+    """Requests per second of distinct topics against 'count' workers."""
+    async with Workers(count, "sqlite", tempfile.mkdtemp(prefix="blog-scale-out-")) as workers:
+        errors = 0
+
+        async def client_loop(c: int):
+            nonlocal errors
+            for r in range(REQUESTS_PER_CLIENT):
+                response = await workers.pick().post("/blogs", json={"topic": f"scaling {count} {c} {r}"})
+                errors += response.status_code != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(c) for c in range(CLIENTS)))
+        elapsed = time.perf_counter() - started
+    throughput = CLIENTS * REQUESTS_PER_CLIENT / elapsed
+    print(f"{count} worker(s) | {CLIENTS * REQUESTS_PER_CLIENT:>8} | {errors:>6} | {throughput:7.1f} req/s")
+    return throughput
+
+
+async def sharing(backend: str) -> dict:
+    async with Workers(SHARING_WORKERS, backend, tempfile.mkdtemp(prefix="blog-scale-out-")) as workers:
+        # Bursts of identical requests, one worker after another
+        responses = await asyncio.gather(*(
+            workers.pick().post("/blogs", json={"topic": f"burst {t}"})
+            for t in range(BURST_TOPICS) for _ in range(BURST_SIZE)))
+        burst_runs = await workers.metric("blog_run_duration_seconds_count")
+        burst_errors = sum(response.status_code != 200 for response in responses)
+
+        # Each topic once, then again on the next worker after the coalescing window
+        for t in range(REPEAT_TOPICS):
+            await workers.clients[t % workers.count].post("/blogs", json={"topic": f"repeat {t}"})
+        await asyncio.sleep(1.5)
+        started = time.perf_counter()
+        for t in range(REPEAT_TOPICS):
+            await workers.clients[(t + 1) % workers.count].post("/blogs", json={"topic": f"repeat {t}"})
+        repeat_seconds = (time.perf_counter() - started) / REPEAT_TOPICS
+        cache_hits = await workers.cache_hits()
+
+        # Jobs submitted to one worker and polled on another
+        job_ids = []
+        for j in range(JOBS):
+            response = await workers.pick().post("/jobs", json={"topic": f"job {j}"})
+            job_ids.append(response.json()["data"]["job_id"])
+        deadline, jobs = time.monotonic() + 120, {}
+        while time.monotonic() < deadline and len(jobs) < JOBS:
+            for job_id in job_ids:
+                if job_id not in jobs:
+                    job = (await workers.pick().get(f"/jobs/{job_id}")).json()["data"]
+                    if job["status"] in ("succeeded", "failed"):
+                        jobs[job_id] = job
+            await asyncio.sleep(0.2)
+
+    result = {
+        "burst_runs": int(burst_runs), "burst_errors": burst_errors, "cache_hits": cache_hits,
+        "repeat_seconds": repeat_seconds,
+        "jobs_succeeded": sum(job["status"] == "succeeded" for job in jobs.values()),
+        "jobs_claimed_twice": sum(job["attempts"] > 1 for job in jobs.values()),
+    }
+    print(f"{backend:<6} | {BURST_TOPICS * BURST_SIZE:>3} requests, {result['burst_runs']:>3} graph runs | "
+          f"{result['cache_hits']:>4} hits, {result['repeat_seconds'] * 1000:6.0f} ms per repeat | "
+          f"{result['jobs_succeeded']:>2}/{JOBS} succeeded, {result['jobs_claimed_twice']} claimed twice")
+    return result
+
+
+async def run():
+    print(f"fake provider: {LATENCY * 1000:.0f} ms per call; {MAX_RUNS} graph runs per worker; "
+          f"{os.cpu_count()} CPU(s)\n")
+    print(f"scaling: {CLIENTS} clients, distinct topics, shared state in SQLite")
+    print("workers     | requests | errors | throughput")
+    throughputs = {count: await scaling(count) for count in WORKER_COUNTS}
+
+    print(f"\nsharing across {SHARING_WORKERS} workers: {BURST_TOPICS} topics x {BURST_SIZE} identical requests | "
+          f"{REPEAT_TOPICS} topics repeated on another worker | {JOBS} jobs")
+    memory, sqlite = await sharing("memory"), await sharing("sqlite")
+
+    failures = []
+    if throughputs[4] < 2 * throughputs[1]:
+        failures.append(f"4 workers served {throughputs[4]:.1f} req/s, not twice 1 worker's {throughputs[1]:.1f}")
+    if sqlite["burst_runs"] != BURST_TOPICS:
+        failures.append(f"sqlite backend: {sqlite['burst_runs']} graph runs for {BURST_TOPICS} topics")
+    if sqlite["cache_hits"] < 2 * REPEAT_TOPICS:
+        failures.append(f"sqlite backend: {sqlite['cache_hits']} LLM cache hits across workers")
+    for backend, result in (("memory", memory), ("sqlite", sqlite)):
+        if result["burst_errors"] or result["jobs_succeeded"] != JOBS or result["jobs_claimed_twice"]:
+            failures.append(f"{backend} backend: {result}")
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,88 @@
+# benchmarks/startup_benchmark.py
+# Measures import time and worker cold start (import + FastAPI lifespan startup) in fresh
+# interpreters, and checks what importing leaves behind: files created and whether the
+# imports work without GROQ_API_KEY.
+#
+# Usage:
+#   python -m benchmarks.startup_benchmark
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 7
+
+# Each snippet prints a JSON object with its own timings; the interpreter start itself is measured separately
+SCENARIOS = {
+    "import src.utils.logger": "import src.utils.logger",
+    "import src.graphs.graph_builder": "import src.graphs.graph_builder",
+    "import app": "import app",
+    "studio graph (first access)": "import src.graphs.graph_builder as m; m.graph",
+    "worker cold start (import + lifespan)": (
+        "import asyncio, app\n"
+        "async def start():\n"
+        "    async with app.lifespan(app.app):\n"
+        "        pass\n"
+        "asyncio.run(start())"
+    ),
+}
+
+CHILD = """
+import json, os, time
+_started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - _started
+print("BENCHMARK_RESULT " + json.dumps({{"seconds": elapsed, "created": sorted(os.listdir("."))}}))
+"""
+
+
+def run_child(code: str, env: dict) -> dict:
+    with tempfile.TemporaryDirectory(prefix="blog-startup-") as cwd:
+        completed = subprocess.run([sys.executable, "-c", CHILD.format(code=code)], cwd=cwd, env=env,
+                                   capture_output=True, text=True)
+    for line in completed.stdout.splitlines():
+        if line.startswith("BENCHMARK_RESULT "):
+            return json.loads(line[len("BENCHMARK_RESULT "):])
+    error = (completed.stderr.strip().splitlines() or ["no output"])[-1]
+    return {"error": error}
+
+
+def child_env(with_key: bool) -> dict:
+    env = {key: value for key, value in os.environ.items()
+           if key not in ("GROQ_API_KEY", "LANGCHAIN_API_KEY", "LANGSMITH_API_KEY", "LOG_DIR")}
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    if with_key:
+        env["GROQ_API_KEY"] = "benchmark-placeholder-key"
+        env["LANGCHAIN_API_KEY"] = "benchmark-placeholder-key"
+    return env
+
+
+def main():
+    env = child_env(with_key=True)
+    results = {}
+    print(f"{'scenario':<40} | median ms | files created at import")
+    for name, code in SCENARIOS.items():
+        runs = [run_child(code, env) for _ in range(RUNS)]
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            results[name] = {"error": errors[0]}
+            print(f"{name:<40} | failed: {errors[0]}")
+            continue
+        median_ms = statistics.median(run["seconds"] for run in runs) * 1000
+        results[name] = {"median_ms": round(median_ms, 1), "created": runs[-1]["created"]}
+        print(f"{name:<40} | {median_ms:9.1f} | {', '.join(runs[-1]['created']) or '-'}")
+
+    print("\nWithout GROQ_API_KEY / LANGCHAIN_API_KEY:")
+    no_key_env = child_env(with_key=False)
+    for name in ("import src.graphs.graph_builder", "import app"):
+        outcome = run_child(SCENARIOS[name], no_key_env)
+        results[f"{name} (no API key)"] = "ok" if "error" not in outcome else outcome["error"]
+        print(f"{name:<40} | {'ok' if 'error' not in outcome else 'failed: ' + outcome['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# benchmarks/suite.py
+# Offline benchmark suite: runs the topic graph, the language graph, long posts and concurrent
+# API load against the deterministic fake LLM, and writes the results as JSON so runs can be
+# compared over time. No API key or network access is needed.
+#
+# Usage:
+#   python -m benchmarks.suite --output benchmark_results.json
+#   python -m benchmarks.suite --quick --scenarios topic_graph,api_load --output -
+#   python -m benchmarks.suite --distribution lognormal --latency 0.2 --spread 0.6 --failure-rate 0.05
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# app.py reads these at import time; the fake LLM never uses them
+os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder-key")
+os.environ.setdefault("LANGCHAIN_API_KEY", "benchmark-placeholder-key")
+# Keep benchmark logs out of the working tree
+os.environ.setdefault("LOG_DIR", os.path.join(tempfile.gettempdir(), "blog-benchmark-logs"))
+
+import httpx
+
+from src.graphs.graph_builder import GraphBuilder
+from src.graphs.graph_registry import GraphRegistry, build_graph_input
+from src.graphs.admission import AdmissionController
+from src.graphs.single_flight import SingleFlight
+from src.llms.fakellm import FakeChatModel, LATENCY_DISTRIBUTIONS
+from src.utils.metrics import track_run
+
+SCENARIOS = ("topic_graph", "language_graph", "long_post", "failure_injection", "api_load")
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def latency_stats(values) -> dict:
+    if not values:
+        return {}
+    return {
+        "count": len(values),
+        "mean_seconds": round(sum(values) / len(values), 4),
+        "p50_seconds": round(percentile(values, 50), 4),
+        "p95_seconds": round(percentile(values, 95), 4),
+        "p99_seconds": round(percentile(values, 99), 4),
+        "max_seconds": round(max(values), 4),
+    }
+
+
+def make_content(paragraphs: int) -> str:
+    """A generated post: a heading every few paragraphs, the rest a few sentences long."""
+    blocks = []
+    for i in range(paragraphs):
+        if i % 4 == 0:
+            blocks.append(f"## Section {i // 4 + 1}")
+        else:
+            blocks.append(f"Paragraph {i} explains one aspect of the topic in a few sentences. " * 3)
+    return "\n\n".join(blocks)
+
+
+class Suite:
+    def __init__(self, args):
+        self.args = args
+        self.runs = 5 if args.quick else 20
+
+    def llm(self, paragraphs: int = 8, failure_rate: float = None) -> FakeChatModel:
+        return FakeChatModel(
+            latency=self.args.latency,
+            latency_distribution=self.args.distribution,
+            latency_spread=self.args.spread,
+            seconds_per_output_token=self.args.seconds_per_output_token,
+            failure_rate=self.args.failure_rate if failure_rate is None else failure_rate,
+            seed=self.args.seed,
+            response=make_content(paragraphs),
+        )
+
+    @staticmethod
+    def llm_usage(llm: FakeChatModel, runs: int) -> dict:
+        return {
+            "calls_per_run": round(llm.calls / runs, 2),
+            "failed_calls": llm.failures,
+            "input_tokens_per_run": round(llm.input_tokens / runs, 1),
+            "output_tokens_per_run": round(llm.output_tokens / runs, 1),
+        }
+
+    async def graph_runs(self, llm, usecase: str, payload: dict, runs: int) -> dict:
+        """Runs a graph sequentially with ainvoke and reports run latency, node time and LLM usage."""
+        _, graph_input = build_graph_input(payload)
+        graph = GraphBuilder(llm).setup_graph(usecase)
+        latencies, node_seconds, fallbacks = [], {}, 0
+        for _ in range(runs):
+            with track_run(usecase) as run:
+                await graph.ainvoke(graph_input)
+            breakdown = run.breakdown()
+            latencies.append(breakdown["total_seconds"])
+            fallbacks += breakdown["fallbacks"]
+            for node, entry in breakdown["nodes"].items():
+                node_seconds.setdefault(node, []).append(entry["seconds"])
+        return {
+            "latency": latency_stats(latencies),
+            "node_mean_seconds": {node: round(sum(v) / len(v), 4) for node, v in node_seconds.items()},
+            "fallbacks_per_run": round(fallbacks / runs, 2),
+            "llm": self.llm_usage(llm, runs),
+        }
+
+    async def topic_graph(self) -> dict:
+        payload = {"topic": "benchmarking", "current_language": ""}
+        result = {"async_sequential": await self.graph_runs(self.llm(), "topic", payload, self.runs)}
+
+        # The sync path: graph.batch runs the inputs on a thread pool through invoke
+        llm = self.llm()
+        graph = GraphBuilder(llm).setup_graph("topic")
+        _, graph_input = build_graph_input(payload)
+        start = time.perf_counter()
+        await asyncio.to_thread(graph.batch, [graph_input] * self.runs, {"max_concurrency": 8})
+        elapsed = time.perf_counter() - start
+        result["sync_batch"] = {"runs": self.runs, "max_concurrency": 8, "elapsed_seconds": round(elapsed, 4),
+                                "throughput_per_second": round(self.runs / elapsed, 2), "llm": self.llm_usage(llm, self.runs)}
+        return result
+
+    async def language_graph(self) -> dict:
+        payload = {"topic": "benchmarking", "current_language": "french", "target_languages": ["german", "spanish"]}
+        return {"three_languages": await self.graph_runs(self.llm(paragraphs=8), "language", payload, self.runs)}
+
+    async def long_post(self) -> dict:
+        paragraphs = 40 if self.args.quick else 120
+        runs = max(2, self.runs // 4)
+        result = {"paragraphs": paragraphs}
+        for mode in ("paragraph", "chunked"):
+            payload = {"topic": "long posts", "current_language": "french", "translation_mode": mode}
+            result[mode] = await self.graph_runs(self.llm(paragraphs=paragraphs), "language", payload, runs)
+        return result
+
+    async def failure_injection(self) -> dict:
+        failure_rate = self.args.failure_rate or 0.1
+        payload = {"topic": "failures", "current_language": "french"}
+        llm = self.llm(paragraphs=16, failure_rate=failure_rate)
+        _, graph_input = build_graph_input(payload)
+        graph = GraphBuilder(llm).setup_graph("language")
+        latencies, fallbacks, failed_runs = [], 0, 0
+        for _ in range(self.runs):
+            with track_run("language") as run:
+                try:
+                    await graph.ainvoke(graph_input)
+                except Exception:
+                    failed_runs += 1  # title or content generation failed; there is no fallback for those
+            breakdown = run.breakdown()
+            latencies.append(breakdown["total_seconds"])
+            fallbacks += breakdown["fallbacks"]
+        return {"failure_rate": failure_rate, "failed_runs": failed_runs, "fallbacks_per_run": round(fallbacks / self.runs, 2),
+                "latency": latency_stats(latencies), "llm": self.llm_usage(llm, self.runs)}
+
+    async def api_load(self) -> dict:
+        from app import app
+
+        # Bypass the lifespan so the graphs are compiled against the fake LLM instead of Groq
+        app.state.graph_registry = GraphRegistry(self.llm(paragraphs=8))
+        # Every request repeats the same payload; measure full graph runs, not coalesced ones
+        app.state.single_flight = SingleFlight(enabled=False)
+        app.state.admission = AdmissionController(enabled=False)
+        requests_per_client = 2 if self.args.quick else 5
+        levels = []
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            for clients in (1, 8, 32):
+                latencies, errors = [], 0
+
+                async def client_loop():
+                    nonlocal errors
+                    for _ in range(requests_per_client):
+                        start = time.perf_counter()
+                        response = await client.post("/blogs", json={"topic": "api load", "current_language": "french"})
+                        latencies.append(time.perf_counter() - start)
+                        errors += response.status_code != 200
+
+                start = time.perf_counter()
+                await asyncio.gather(*(client_loop() for _ in range(clients)))
+                elapsed = time.perf_counter() - start
+                levels.append({"clients": clients, "requests": clients * requests_per_client, "errors": errors,
+                               "throughput_per_second": round(clients * requests_per_client / elapsed, 2),
+                               "latency": latency_stats(latencies)})
+        return {"endpoint": "POST /blogs", "levels": levels}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except OSError:
+        return ""
+
+
+async def run(args) -> dict:
+    suite = Suite(args)
+    selected = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = set(selected) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(sorted(unknown))}. Available: {', '.join(SCENARIOS)}")
+
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "config": {"latency": args.latency, "distribution": args.distribution, "spread": args.spread,
+                   "seconds_per_output_token": args.seconds_per_output_token, "failure_rate": args.failure_rate,
+                   "seed": args.seed, "quick": args.quick},
+        "scenarios": {},
+    }
+    for name in selected:
+        print(f"Running {name}...", file=sys.stderr)
+        start = time.perf_counter()
+        results["scenarios"][name] = await getattr(suite, name)()
+        results["scenarios"][name]["scenario_seconds"] = round(time.perf_counter() - start, 3)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite against the fake LLM.")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON output file, or '-' for stdout")
+    parser.add_argument("--scenarios", default="", help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--quick", action="store_true", help="Fewer runs and smaller posts, for a smoke test")
+    parser.add_argument("--latency", type=float, default=0.05, help="Median seconds per LLM call")
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--spread", type=float, default=0.5, help="Spread of the latency distribution")
+    parser.add_argument("--seconds-per-output-token", type=float, default=0.0005)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of LLM calls that fail")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="Keep the application's INFO logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Per-call INFO logs would dominate the timings and drown the output
+        for name in list(logging.root.manager.loggerDict):
+            if name.startswith("src"):
+                logging.getLogger(name).setLevel(logging.WARNING)
+
+    # Generated blog files go to a scratch directory
+    output = args.output if args.output == "-" else os.path.abspath(args.output)
+    os.chdir(tempfile.mkdtemp(prefix="blog-benchmark-"))
+    results = asyncio.run(run(args))
+
+    text = json.dumps(results, indent=2)
+    if output == "-":
+        print(text)
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Wrote {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# benchmarks/translation_benchmark.py
+# Measures BlogNode.translation wall-clock time against a latency-injecting fake LLM.
+#
+# Usage:
+#   python -m benchmarks.translation_benchmark
+
+import time
+
+from src.llms.fakellm import FakeLLM
+from src.nodes.blog_node import BlogNode
+
+LATENCY = 0.1  # seconds per fake LLM call
+PARAGRAPH_COUNTS = [1, 5, 10, 15, 30]
+CONCURRENCY_LEVELS = [1, 5, 10]
+
+
+def make_state(paragraph_count: int) -> dict:
+    content = "\n\n".join(f"Paragraph {i} of the blog post." for i in range(paragraph_count))
+    return {
+        "topic": "benchmark",
+        "current_language": "french",
+        "blog": {"title": "Benchmark Title", "content": content},
+    }
+
+
+def run():
+    print(f"Fake LLM latency: {LATENCY * 1000:.0f} ms per call")
+    header = "paragraphs | " + " | ".join(f"concurrency={c:>2}" for c in CONCURRENCY_LEVELS)
+    print(header)
+    print("-" * len(header))
+    for count in PARAGRAPH_COUNTS:
+        state = make_state(count)
+        timings = []
+        for concurrency in CONCURRENCY_LEVELS:
+            node = BlogNode(FakeLLM(latency=LATENCY).get_llm(), max_concurrency=concurrency)
+            start = time.perf_counter()
+            result = node.translation(state)
+            timings.append(time.perf_counter() - start)
+            assert len(result["blog"]["content"].split("\n\n")) == count
+        print(f"{count:>10} | " + " | ".join(f"{t:>12.3f} s" for t in timings))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,59 @@
+# benchmarks/translation_mode_benchmark.py
+# Compares 'paragraph' and 'chunked' translation modes on call count, token usage and latency,
+# using a fake LLM whose latency grows with the number of output tokens.
+#
+# Usage:
+#   python -m benchmarks.translation_mode_benchmark
+
+import asyncio
+import time
+
+from src.llms.fakellm import FakeChatModel
+from src.nodes.blog_node import BlogNode
+
+LATENCY = 0.2  # fixed seconds per call (network + prompt processing)
+SECONDS_PER_OUTPUT_TOKEN = 0.002
+PARAGRAPH_COUNTS = [10, 20, 40]
+CHUNK_TOKEN_BUDGETS = [200, 800]
+
+
+def make_state(paragraph_count: int, mode: str) -> dict:
+    paragraphs = []
+    for i in range(paragraph_count):
+        # Mix one-line headings with full paragraphs, like a generated post
+        if i % 3 == 0:
+            paragraphs.append(f"## Section {i // 3 + 1}")
+        else:
+            paragraphs.append(f"Paragraph {i} explains one aspect of the topic in a few sentences. " * 3)
+    return {
+        "topic": "benchmark",
+        "current_language": "french",
+        "translation_mode": mode,
+        "blog": {"title": "Benchmark Title", "content": "\n\n".join(paragraphs)},
+    }
+
+
+async def measure(paragraph_count: int, mode: str, budget: int):
+    llm = FakeChatModel(latency=LATENCY, seconds_per_output_token=SECONDS_PER_OUTPUT_TOKEN)
+    node = BlogNode(llm, max_concurrency=5, chunk_token_budget=budget)
+    start = time.perf_counter()
+    result = await node.atranslation(make_state(paragraph_count, mode))
+    elapsed = time.perf_counter() - start
+    assert len(result["blog"]["content"].split("\n\n")) == paragraph_count
+    return llm.calls, llm.input_tokens, llm.output_tokens, elapsed
+
+
+async def run():
+    print(f"Fake LLM: {LATENCY * 1000:.0f} ms per call + {SECONDS_PER_OUTPUT_TOKEN * 1000:.0f} ms per output token, "
+          f"5 calls in flight")
+    print("paragraphs | mode              | calls | input tokens | output tokens | latency")
+    for count in PARAGRAPH_COUNTS:
+        scenarios = [("paragraph", 0)] + [("chunked", budget) for budget in CHUNK_TOKEN_BUDGETS]
+        for mode, budget in scenarios:
+            calls, input_tokens, output_tokens, elapsed = await measure(count, mode, budget or 1)
+            label = mode if mode == "paragraph" else f"chunked ({budget} tok)"
+            print(f"{count:>10} | {label:<17} | {calls:>5} | {input_tokens:>12} | {output_tokens:>13} | {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,273 @@
+# src/graphs/admission.py
+# Admission control for graph runs. At most ADMISSION_MAX_RUNS runs go at once; the next ones wait
+# in a bounded FIFO queue for at most ADMISSION_QUEUE_TIMEOUT_SECONDS, and each client may have at
+# most ADMISSION_CLIENT_LIMIT requests in flight. Past those limits requests fail fast with 429/503
+# and a Retry-After estimate, instead of piling up provider calls until every client times out.
+# Batch items and background jobs share the same slots as background runs: they wait as long as it
+# takes instead of being turned away, hold at most ADMISSION_BACKGROUND_MAX_RUNS of the slots, and a
+# freed slot goes to interactive requests first.
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+from src.utils.exceptions import ServiceUnavailableError, TooManyRequestsError
+from src.utils.logger import get_logger
+from src.utils import metrics
+
+log = get_logger(__name__)
+
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "true").lower() != "false"
+# Graph runs in progress at once
+ADMISSION_MAX_RUNS = int(os.getenv("ADMISSION_MAX_RUNS", "8"))
+# Graph runs waiting for a slot; past this new runs are turned away with 503
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "32"))
+# Longest a run waits for a slot before its request gets a 503
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"))
+# Requests in flight per client (0: no limit); past this the client gets a 429
+ADMISSION_CLIENT_LIMIT = int(os.getenv("ADMISSION_CLIENT_LIMIT", "4"))
+# Slots batch items and jobs may hold at once (default: half), so the rest stay free for interactive requests
+ADMISSION_BACKGROUND_MAX_RUNS = int(os.getenv("ADMISSION_BACKGROUND_MAX_RUNS", "0")) or None
+
+# Header naming the client for its quota; without it the client's address is used
+CLIENT_ID_HEADER = "x-client-id"
+# Weight of the latest run in the average run time behind Retry-After
+RUN_SECONDS_SMOOTHING = 0.2
+
+
+class ClientLease:
+    """A request counted against its client's quota until released (releasing twice is harmless)."""
+
+    def __init__(self, controller: "AdmissionController", client: str):
+        self.controller = controller
+        self.client = client
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.controller._release_client(self.client)
+
+
+class AdmissionController:
+    """
+    Gates graph runs behind a fixed number of slots with a bounded, deadline-limited FIFO queue, and
+    requests behind per-client quotas. Background runs (batch items, jobs) take slots too, from their
+    own unbounded FIFO queue and up to 'background_max_runs' at once. Slots are handed straight to the
+    oldest interactive waiter when a run ends, else to the oldest background one.
+    Everything runs on the event loop, so no locking is needed.
+    """
+
+    def __init__(self, enabled: bool = ADMISSION_CONTROL, max_runs: int = ADMISSION_MAX_RUNS,
+                 queue_size: int = ADMISSION_QUEUE_SIZE, queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS,
+                 client_limit: int = ADMISSION_CLIENT_LIMIT, background_max_runs: int = ADMISSION_BACKGROUND_MAX_RUNS):
+        self.enabled = enabled
+        self.max_runs = max(1, max_runs)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout
+        self.client_limit = client_limit
+        self.background_max_runs = min(self.max_runs, max(1, background_max_runs or self.max_runs // 2))
+        self._running = 0  # every run holding a slot, background ones included
+        self._background_running = 0
+        self._waiters = deque()  # futures of queued runs, oldest first
+        self._background_waiters = deque()
+        self._clients = {}  # client -> requests in flight
+        self._run_seconds = None  # Smoothed run time, for Retry-After
+        self._rejected = {"queue_full": 0, "queue_timeout": 0, "client_quota": 0}
+        self._admitted = 0
+        self._waited_seconds = 0.0
+
+    # --- Per-client quotas ---
+
+    def admit_client(self, client: str) -> ClientLease:
+        """Counts a request against its client's quota; raises TooManyRequestsError past the quota."""
+        if not self.enabled or self.client_limit <= 0:
+            return ClientLease(self, None)
+        in_flight = self._clients.get(client, 0)
+        if in_flight >= self.client_limit:
+            self._reject("client_quota")
+            raise TooManyRequestsError(
+                f"Client already has {in_flight} requests in flight (limit {self.client_limit}).",
+                retry_after=self._retry_after(0))
+        self._clients[client] = in_flight + 1
+        return ClientLease(self, client)
+
+    @asynccontextmanager
+    async def client(self, client: str):
+        """Holds a place in the client's quota for the duration of the block."""
+        lease = self.admit_client(client)
+        try:
+            yield
+        finally:
+            lease.release()
+
+    def _release_client(self, client: str):
+        if client is None:
+            return
+        remaining = self._clients.get(client, 0) - 1
+        if remaining > 0:
+            self._clients[client] = remaining
+        else:
+            self._clients.pop(client, None)
+
+    # --- Run slots ---
+
+    def check_capacity(self):
+        """Raises ServiceUnavailableError if a new run would be turned away right now (the queue is full)."""
+        if self.enabled and self._running >= self.max_runs and len(self._waiters) >= self.queue_size:
+            self._reject("queue_full")
+            raise self._overloaded("The server is at capacity and its queue is full.")
+
+    @asynccontextmanager
+    async def run_slot(self, background: bool = False):
+        """
+        Holds a run slot for the duration of the block, waiting in the queue for one if needed.
+        A background run waits without a deadline and is never turned away.
+        """
+        if not self.enabled:
+            yield
+            return
+        await (self._acquire_background() if background else self._acquire())
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started, background)
+
+    async def _acquire(self):
+        if self._running < self.max_runs and not self._waiters:
+            self._running += 1
+            self._update_gauges()
+            self._record_wait(0.0)
+            return
+        self.check_capacity()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                self._reject("queue_timeout")
+                raise self._overloaded(f"No capacity within {self.queue_timeout:g} seconds.")
+            # The slot was handed over just as the deadline passed; take it
+        except BaseException:
+            # Cancelled while queued (e.g. the client went away): give back a slot handed over meanwhile
+            if waiter.done() and not waiter.cancelled():
+                self._release(None, False)
+            waiter.cancel()
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+            self._update_gauges()
+        self._record_wait(time.monotonic() - queued_at)
+
+    async def _acquire_background(self):
+        if (self._running < self.max_runs and self._background_running < self.background_max_runs
+                and not self._waiters and not self._background_waiters):
+            self._running += 1
+            self._background_running += 1
+            self._update_gauges()
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._background_waiters.append(waiter)
+        self._update_gauges()
+        try:
+            await waiter
+        except BaseException:
+            # Cancelled while queued (e.g. the batch client went away): give back a slot handed over meanwhile
+            if waiter.done() and not waiter.cancelled():
+                self._release(None, True)
+            waiter.cancel()
+            raise
+        finally:
+            try:
+                self._background_waiters.remove(waiter)
+            except ValueError:
+                pass
+            self._update_gauges()
+
+    def _record_wait(self, seconds: float):
+        self._admitted += 1
+        self._waited_seconds += seconds
+        metrics.ADMISSION_WAIT_SECONDS.observe(seconds)
+
+    def _release(self, run_seconds, background: bool):
+        if run_seconds is not None:
+            self._run_seconds = run_seconds if self._run_seconds is None else (
+                RUN_SECONDS_SMOOTHING * run_seconds + (1 - RUN_SECONDS_SMOOTHING) * self._run_seconds)
+        self._running -= 1
+        if background:
+            self._background_running -= 1
+        # Hand free slots straight to the oldest waiters, interactive ones first, so none is taken out of turn
+        while self._running < self.max_runs:
+            waiter, background = self._next_waiter(self._waiters), False
+            if waiter is None and self._background_running < self.background_max_runs:
+                waiter, background = self._next_waiter(self._background_waiters), True
+            if waiter is None:
+                break
+            self._running += 1
+            self._background_running += background
+            waiter.set_result(None)
+        self._update_gauges()
+
+    @staticmethod
+    def _next_waiter(waiters: deque):
+        """Takes the oldest waiter still waiting off the queue, or None."""
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                return waiter
+        return None
+
+    # --- Reporting ---
+
+    def _retry_after(self, queued: int) -> int:
+        """Seconds until a slot is likely free for a request behind 'queued' others."""
+        run_seconds = self._run_seconds or 1.0
+        return max(1, math.ceil(run_seconds * (queued + 1) / self.max_runs))
+
+    def _overloaded(self, detail: str) -> ServiceUnavailableError:
+        return ServiceUnavailableError(detail, retry_after=self._retry_after(len(self._waiters)))
+
+    def _reject(self, reason: str):
+        self._rejected[reason] += 1
+        metrics.ADMISSION_REJECTED.inc(reason)
+        log.warning(f"Admission control turned a request away: {reason} "
+                    f"({self._running} running, {len(self._waiters)} queued)")
+
+    def _update_gauges(self):
+        metrics.ADMISSION_RUNNING.set(self._running - self._background_running, "interactive")
+        metrics.ADMISSION_RUNNING.set(self._background_running, "background")
+        metrics.ADMISSION_QUEUE_DEPTH.set(len(self._waiters), "interactive")
+        metrics.ADMISSION_QUEUE_DEPTH.set(len(self._background_waiters), "background")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "running": self._running,
+            "queued": len(self._waiters),
+            "max_runs": self.max_runs,
+            "queue_size": self.queue_size,
+            "queue_timeout_seconds": self.queue_timeout,
+            "client_limit": self.client_limit,
+            "background_running": self._background_running,
+            "background_queued": len(self._background_waiters),
+            "background_max_runs": self.background_max_runs,
+            "clients": len(self._clients),
+            "average_run_seconds": round(self._run_seconds, 4) if self._run_seconds is not None else None,
+            "admitted": self._admitted,
+            "average_wait_seconds": round(self._waited_seconds / self._admitted, 4) if self._admitted else 0.0,
+            "rejected": dict(self._rejected),
+        }
@@ -0,0 +1,93 @@
+# src/graphs/batch_runner.py
+# Runs many blog requests through the compiled graphs with bounded concurrency.
+
+import asyncio
+import os
+import statistics
+import time
+from contextlib import nullcontext
+
+from src.graphs.admission import AdmissionController
+from src.graphs.graph_registry import GraphRegistry, build_graph_input
+from src.utils.blog_storage import get_blog_store
+from src.utils.logger import get_logger
+from src.utils.metrics import track_run
+
+log = get_logger(__name__)
+
+# Defaults for batch runs; callers can override concurrency per batch
+DEFAULT_BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+MAX_BATCH_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "32"))
+MAX_BATCH_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+
+
+async def run_item(graph_registry: GraphRegistry, index: int, item: dict,
+                   admission: AdmissionController = None) -> dict:
+    """
+    Generates and saves a single blog, in a background run slot if admission control is given.
+    Failures are reported in the result instead of raised, so one bad item never aborts the rest of the batch.
+    """
+    start = time.perf_counter()
+    item = item if isinstance(item, dict) else {}
+    result = {"index": index, "topic": item.get("topic", ""), "current_language": item.get("current_language", "")}
+
+    try:
+        usecase, graph_input = build_graph_input(item)
+        async with admission.run_slot(background=True) if admission else nullcontext():
+            with track_run(usecase) as run:
+                state = await graph_registry.get(usecase).ainvoke(graph_input)
+
+        paths = await get_blog_store().asave(state)
+        result.update(status="ok", blog=state.get("blog", {}), translations=state.get("translations", {}), paths=paths,
+                      timings=run.breakdown())
+    except Exception as e:
+        log.error(f"Batch item {index} failed for topic '{result['topic']}': {e}")
+        result.update(status="error", detail=str(e))
+
+    result["latency_seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+async def run_batch(graph_registry: GraphRegistry, items: list, concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                    admission: AdmissionController = None):
+    """
+    Runs every item with at most 'concurrency' graph runs in flight and yields each
+    result as soon as it completes, followed by a final {"summary": {...}} record with
+    per-item latency statistics and aggregate throughput.
+    """
+    concurrency = max(1, min(concurrency, MAX_BATCH_CONCURRENCY))
+    semaphore = asyncio.Semaphore(concurrency)
+    log.info(f"Starting batch of {len(items)} items with concurrency {concurrency}")
+
+    async def bounded(index, item):
+        async with semaphore:
+            return await run_item(graph_registry, index, item, admission)
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(bounded(index, item)) for index, item in enumerate(items)]
+    latencies, failed = [], 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            latencies.append(result["latency_seconds"])
+            failed += result["status"] != "ok"
+            yield result
+    finally:
+        # If the consumer goes away (e.g. the client disconnects), stop the remaining work
+        for task in tasks:
+            task.cancel()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "items": len(items),
+        "succeeded": len(items) - failed,
+        "failed": failed,
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_minute": round(len(items) / elapsed * 60, 2) if elapsed else 0.0,
+        "latency_mean_seconds": round(statistics.mean(latencies), 3) if latencies else 0.0,
+        "latency_p50_seconds": round(statistics.median(latencies), 3) if latencies else 0.0,
+        "latency_max_seconds": round(max(latencies), 3) if latencies else 0.0,
+    }
+    log.info(f"Finished batch: {summary}")
+    yield {"summary": summary}
@@ -1,8 +1,11 @@
 # Import necessary modules
+from functools import lru_cache
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
-from src.llms.groqllm import GroqLLM
 from src.states.blogstate import BlogState
 from src.nodes.blog_node import BlogNode
+from src.graphs.instrumentation import instrument_llm, timed_node
+from src.utils.metrics import METRICS_ENABLED
 from src.states.blogstate import Blog
 
 
@@ -10,25 +13,65 @@ from src.states.blogstate import Blog
 # Define the GraphBuilder class
 class GraphBuilder:
     
-    def __init__(self,llm):
-        self.llm=llm
+    def __init__(self,llm,instrument=METRICS_ENABLED):
+        self.instrument=instrument
+        self.llm=instrument_llm(llm) if instrument else llm
         self.graph=StateGraph(BlogState)
-        
+
+    def _node(self, name, func, afunc=None):
+        """
+        Wraps a sync node and its async variant so the compiled graph
+        runs the sync one under invoke and the async one under ainvoke.
+        When instrumented, both record the node's wall time.
+        """
+        if self.instrument:
+            func, afunc = timed_node(name, func, afunc)
+        return RunnableLambda(func, afunc=afunc)
+
+    def _translation_node(self):
+        """
+        Builds the translation node used by every fan-out branch. Each branch receives its
+        language in 'current_language' and writes its result under that key in 'translations'.
+        """
+        def keyed(state, update):
+            return {"translations": {state["current_language"]: update["blog"]}} if update else {}
+
+        async def atranslate(state):
+            return keyed(state, await self.blog_node_obj.atranslation(state))
+
+        return self._node("translation", lambda state: keyed(state, self.blog_node_obj.translation(state)), atranslate)
+
+    def _blog_nodes(self, next_node):
+        """
+        Adds the nodes that write the blog, as two branches from START that run in parallel:
+        title_creation, and the content. content_generation writes the post in one call
+        ('single' content mode), or outline plans it and one section_writing branch per section
+        writes it concurrently before assemble_sections joins them ('sectioned' mode, for long posts).
+        Both branches update 'blog' through its merge reducer; 'next_node' runs once both are done.
+        """
+        node = self.blog_node_obj
+        self.graph.add_node("title_creation", self._node("title_creation", node.title_creation, node.atitle_creation))
+        self.graph.add_node("content_generation", self._node("content_generation", node.content_generation, node.acontent_generation))
+        self.graph.add_node("outline", self._node("outline", node.outline, node.aoutline))
+        self.graph.add_node("section_writing", self._node("section_writing", node.section_writing, node.asection_writing))
+        self.graph.add_node("assemble_sections", self._node("assemble_sections", node.assemble_sections))
+
+        self.graph.add_edge(START, "title_creation")
+        self.graph.add_conditional_edges(START, node.content_route, ["content_generation", "outline"])
+        self.graph.add_conditional_edges("outline", node.section_fanout, ["section_writing"])
+        self.graph.add_edge("section_writing", "assemble_sections")
+
+        # Wait for the title and whichever content path ran; the join of the other path never fires
+        for content_node in ("content_generation", "assemble_sections"):
+            self.graph.add_edge(["title_creation", content_node], next_node)
 
     def build_topic_graph(self):
         """
         Build a graph to generate blogss based on topic
         """
         self.blog_node_obj=BlogNode(self.llm)
-        print(self.llm)
-        ## Nodes
-        self.graph.add_node("title_creation", self.blog_node_obj.title_creation)
-        self.graph.add_node("content_generation",self.blog_node_obj.content_generation)
-
-        ## Edges
-        self.graph.add_edge(START,"title_creation")
-        self.graph.add_edge("title_creation","content_generation")
-        self.graph.add_edge("content_generation",END)
+        ## Nodes and edges: title and content in parallel, then done
+        self._blog_nodes(END)
 
         return self.graph 
     
@@ -39,31 +82,46 @@ class GraphBuilder:
         self.blog_node_obj = BlogNode(self.llm)
 
         ## Nodes
-        self.graph.add_node("title_creation", self.blog_node_obj.title_creation)
-        self.graph.add_node("content_generation", self.blog_node_obj.content_generation)
-        self.graph.add_node("route", self.blog_node_obj.route)
-        self.graph.add_node("hindi_translation", lambda state: self.blog_node_obj.translation({**state, "current_language": "hindi"}))
-        self.graph.add_node("french_translation", lambda state: self.blog_node_obj.translation({**state, "current_language": "french"}))
+        self.graph.add_node("route", self._node("route", self.blog_node_obj.route))
+        self.graph.add_node("translation", self._translation_node())
+        self.graph.add_node("collect_translations", self._node("collect_translations", self.blog_node_obj.collect_translations))
+
+        ## Edges: title and content in parallel, then the translations
+        self._blog_nodes("route")
+        # Fan out one translation branch per target language (Send), then join
+        self.graph.add_conditional_edges(
+            "route",
+            self.blog_node_obj.route_decision,
+            ["translation", END]
+        )
+
+        self.graph.add_edge("translation", "collect_translations")
+        self.graph.add_edge("collect_translations", END)
         
+        return self.graph
 
-        ## Edges
-        self.graph.add_edge(START, "title_creation")
-        self.graph.add_edge("title_creation", "content_generation")
-        self.graph.add_edge("content_generation", "route")
+    def build_retranslation_graph(self):
+        """
+        Build a graph to re-translate an edited blog. The source blog is given, so it starts at
+        the language fan-out; unchanged paragraphs reuse the previous translations.
+        """
+        self.blog_node_obj = BlogNode(self.llm)
+
+        ## Nodes
+        self.graph.add_node("route", self._node("route", self.blog_node_obj.route))
+        self.graph.add_node("translation", self._translation_node())
+        self.graph.add_node("collect_translations", self._node("collect_translations", self.blog_node_obj.collect_translations))
 
-        # add conditional edges
+        ## Edges
+        self.graph.add_edge(START, "route")
         self.graph.add_conditional_edges(
             "route",
             self.blog_node_obj.route_decision,
-            {
-                "hindi": "hindi_translation",
-                "french": "french_translation"
-            }
+            ["translation", END]
         )
+        self.graph.add_edge("translation", "collect_translations")
+        self.graph.add_edge("collect_translations", END)
 
-        self.graph.add_edge("hindi_translation", END)
-        self.graph.add_edge("french_translation", END)
-        
         return self.graph
     #
 
@@ -71,21 +129,36 @@ class GraphBuilder:
 
     # Method to set up the graph based on use case
     
-    def setup_graph(self,usecase):
+    def setup_graph(self,usecase,checkpointer=None,store=None):
+        """
+        Builds and compiles the graph for a use case.
+        With a checkpointer, state is saved after every node under the run's thread_id,
+        so an interrupted run can resume where it stopped. With a store as well, the
+        translation node records each translated paragraph, so a retry skips them too.
+        """
         if usecase=="topic":
             self.build_topic_graph()
         if usecase=="language":
             self.build_language_graph()
+        if usecase=="retranslate":
+            self.build_retranslation_graph()
 
-        return self.graph.compile()
+        return self.graph.compile(checkpointer=checkpointer, store=store)
     
 
 ## Below code is for the langsmith langgraph studio
-llm=GroqLLM().get_llm()
+## The graph is built on first access, so importing this module creates no LLM client
+## and works without GROQ_API_KEY
+
+@lru_cache(maxsize=None)
+def _studio_graph():
+    from src.llms.llm_router import get_llm_router
+
+    return GraphBuilder(get_llm_router()).build_language_graph().compile()
 
-## get the graph
-graph_builder=GraphBuilder(llm)
-#graph=graph_builder.build_topic_graph().compile()
 
-graph=graph_builder.build_language_graph().compile()
+def __getattr__(name):
+    if name == "graph":
+        return _studio_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -0,0 +1,151 @@
+# src/graphs/graph_registry.py
+# Compiles every use-case graph once and hands out the compiled graphs for reuse across requests.
+
+from src.graphs.graph_builder import GraphBuilder
+from src.utils.logger import get_logger
+from src.utils.exceptions import InvalidRequestError
+from src.nodes.language_registry import validate_languages
+from src.nodes.content_outline import CONTENT_MODES, validate_target_words
+
+log = get_logger(__name__)
+
+# Translation strategies accepted per request (see BlogNode.translation)
+TRANSLATION_MODES = ("paragraph", "chunked")
+
+# Use cases compiled at startup. Add new ones here once GraphBuilder.setup_graph supports them.
+DEFAULT_USECASES = ("topic", "language", "retranslate")
+
+
+class GraphRegistry:
+    """
+    Holds one compiled graph per use case, all sharing the same LLM client
+    and, optionally, the same checkpointer and store.
+    Graphs are compiled up front, or on first use with lazy=True (for registries
+    off the request path, where startup time matters more than the first call).
+    """
+
+    def __init__(self, llm, usecases=DEFAULT_USECASES, checkpointer=None, store=None, lazy=False):
+        self.llm = llm
+        self.checkpointer = checkpointer
+        self.store = store
+        self._usecases = tuple(usecases)
+        self._graphs = {}
+        if not lazy:
+            for usecase in usecases:
+                self.register(usecase)
+
+    def register(self, usecase: str):
+        """Compiles the graph for a use case and stores it in the registry."""
+        # GraphBuilder accumulates nodes on a single StateGraph, so each use case needs its own builder
+        log.info(f"Compiling graph for use case: {usecase}")
+        self._graphs[usecase] = GraphBuilder(self.llm).setup_graph(
+            usecase=usecase, checkpointer=self.checkpointer, store=self.store)
+        return self._graphs[usecase]
+
+    def get(self, usecase: str):
+        """Returns the compiled graph for a use case."""
+        graph = self._graphs.get(usecase)
+        if graph is not None:
+            return graph
+        if usecase not in self._usecases:
+            raise InvalidRequestError(f"Unsupported use case: {usecase}")
+        return self.register(usecase)
+
+    @property
+    def usecases(self):
+        return self._usecases
+
+
+def build_graph_input(data: dict):
+    """
+    Validates a blog request and returns the use case to run together with the graph input.
+    Accepts a 'topic', an optional 'current_language', an optional list of 'target_languages'
+    and an optional 'translation_mode' ('paragraph' or 'chunked'). Long posts take a 'content_mode'
+    of 'sectioned' (default 'single') and optionally a 'target_words' length.
+    """
+    topic = (data.get("topic") or "").strip()
+    current_language = (data.get("current_language") or "").lower()
+    target_languages = data.get("target_languages") or []
+    translation_mode = (data.get("translation_mode") or "paragraph").lower()
+    content_mode = (data.get("content_mode") or "single").lower()
+
+    if not topic:
+        raise InvalidRequestError("Topic is required to generate a blog.")
+    if not isinstance(target_languages, list):
+        raise InvalidRequestError("'target_languages' must be a list of languages.")
+
+    target_languages = [str(language).lower() for language in target_languages]
+    if current_language and current_language not in target_languages:
+        target_languages.insert(0, current_language)
+    validate_languages(target_languages)
+    if translation_mode not in TRANSLATION_MODES:
+        raise InvalidRequestError(f"'translation_mode' must be one of: {', '.join(TRANSLATION_MODES)}.")
+    if content_mode not in CONTENT_MODES:
+        raise InvalidRequestError(f"'content_mode' must be one of: {', '.join(CONTENT_MODES)}.")
+
+    graph_input = {"topic": topic, "current_language": current_language}
+    # Only set when requested, so default requests keep the same graph input
+    if content_mode != "single":
+        graph_input["content_mode"] = content_mode
+    if data.get("target_words") is not None:
+        graph_input["target_words"] = validate_target_words(data["target_words"])
+    if not target_languages:
+        return "topic", graph_input
+    return "language", {**graph_input, "target_languages": target_languages, "translation_mode": translation_mode}
+
+
+def _blog_payload(value, name: str) -> dict:
+    """Validates a {title, content} object from a request body."""
+    if not isinstance(value, dict) or not isinstance(value.get("content"), str) or not value["content"].strip():
+        raise InvalidRequestError(f"'{name}' must be an object with a non-empty 'content'.")
+    title = value.get("title") or ""
+    if not isinstance(title, str):
+        raise InvalidRequestError(f"'{name}.title' must be a string.")
+    return {"title": title.strip(), "content": value["content"]}
+
+
+def build_retranslation_input(data: dict):
+    """
+    Validates a re-translation request for an edited blog and returns the graph input.
+    Accepts the edited source 'blog', the 'previous' version as {"blog": ..., "translations": {language: ...}},
+    optional 'target_languages' (default: the previously translated languages), an optional
+    'current_language', 'translation_mode' and 'topic'.
+    """
+    blog = _blog_payload(data.get("blog"), "blog")
+    previous = data.get("previous") or {}
+    if not isinstance(previous, dict):
+        raise InvalidRequestError("'previous' must be an object with the previous 'blog' and its 'translations'.")
+    previous_blog = _blog_payload(previous["blog"], "previous.blog") if previous.get("blog") else None
+    translations = previous.get("translations") or {}
+    if not isinstance(translations, dict):
+        raise InvalidRequestError("'previous.translations' must map languages to {title, content} objects.")
+    previous_translations = {str(language).lower(): _blog_payload(translated, f"previous.translations.{language}")
+                             for language, translated in translations.items()}
+    validate_languages(list(previous_translations))
+
+    current_language = (data.get("current_language") or "").lower()
+    target_languages = data.get("target_languages") or list(previous_translations)
+    if not isinstance(target_languages, list):
+        raise InvalidRequestError("'target_languages' must be a list of languages.")
+    target_languages = [str(language).lower() for language in target_languages]
+    if current_language and current_language not in target_languages:
+        target_languages.insert(0, current_language)
+    if not target_languages:
+        raise InvalidRequestError("Specify 'target_languages' or the previous 'translations' to re-translate.")
+    validate_languages(target_languages)
+
+    translation_mode = (data.get("translation_mode") or "paragraph").lower()
+    if translation_mode not in TRANSLATION_MODES:
+        raise InvalidRequestError(f"'translation_mode' must be one of: {', '.join(TRANSLATION_MODES)}.")
+
+    graph_input = {
+        "topic": (data.get("topic") or "").strip() or blog["title"],
+        "blog": blog,
+        "current_language": current_language,
+        "target_languages": target_languages,
+        "translation_mode": translation_mode,
+    }
+    if previous_blog is not None:
+        graph_input["previous_blog"] = previous_blog
+        graph_input["previous_translations"] = previous_translations
+    return "retranslate", graph_input
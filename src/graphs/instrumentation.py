@@ -0,0 +1,120 @@
+# src/graphs/instrumentation.py
+# Cross-cutting instrumentation applied by GraphBuilder: node timing wrappers and an LLM callback
+# handler for latency, tokens and cost. Both report into the process-wide Prometheus metrics and
+# into the RunMetrics bound to the current request (see src/utils/metrics.py).
+
+import functools
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.llms.llm_router import LLMRouter
+from src.utils import metrics
+
+
+def timed_node(node: str, func, afunc=None):
+    """Wraps a node's sync and async functions so every call records its wall time."""
+    @functools.wraps(func)
+    def timed(state):
+        started = time.perf_counter()
+        try:
+            return func(state)
+        finally:
+            _record_node(node, time.perf_counter() - started)
+
+    if afunc is None:
+        return timed, None
+
+    @functools.wraps(afunc)
+    async def atimed(state):
+        started = time.perf_counter()
+        try:
+            return await afunc(state)
+        finally:
+            _record_node(node, time.perf_counter() - started)
+
+    return timed, atimed
+
+
+def _record_node(node: str, seconds: float):
+    metrics.NODE_SECONDS.observe(seconds, node)
+    run = metrics.current_run()
+    if run is not None:
+        run.add_node(node, seconds)
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """
+    Records latency, token usage and estimated cost of every chat model call, labelled
+    with the graph node that made it. Runs inline and only does bookkeeping, so it adds
+    a few microseconds per call.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self._started = {}  # run id -> (start time, node, model)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        metadata = metadata or {}
+        self._started[run_id] = (time.perf_counter(), metadata.get("langgraph_node") or "none",
+                                 metadata.get("ls_model_name") or "unknown")
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        started_at, node, model = started
+        seconds = time.perf_counter() - started_at
+        usage = {}
+        if response.generations and response.generations[0]:
+            message = getattr(response.generations[0][0], "message", None)
+            usage = getattr(message, "usage_metadata", None) or {}
+
+        # LangChain marks responses served from the cache with a zero total_cost
+        cached = usage.get("total_cost") == 0
+        input_tokens = 0 if cached else usage.get("input_tokens", 0)
+        output_tokens = 0 if cached else usage.get("output_tokens", 0)
+        cost = metrics.llm_cost(input_tokens, output_tokens)
+
+        metrics.LLM_SECONDS.observe(seconds, node, model)
+        if cached:
+            metrics.LLM_CACHE_HITS.inc(node)
+        else:
+            metrics.LLM_TOKENS.inc(node, "input", amount=input_tokens)
+            metrics.LLM_TOKENS.inc(node, "output", amount=output_tokens)
+            metrics.LLM_COST.inc(model, amount=cost)
+        run = metrics.current_run()
+        if run is not None:
+            run.add_llm_call(node, seconds, input_tokens, output_tokens, cost, cached=cached)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        started_at, node, _ = started
+        seconds = time.perf_counter() - started_at
+        metrics.LLM_ERRORS.inc(node)
+        run = metrics.current_run()
+        if run is not None:
+            run.add_llm_call(node, seconds, error=True)
+
+
+LLM_METRICS_HANDLER = LLMMetricsHandler()
+
+
+def instrument_llm(llm):
+    """
+    Attaches the shared metrics handler to a chat model once; models with a callback manager are left as is.
+    A router is instrumented through each of its backend models.
+    """
+    if isinstance(llm, LLMRouter):
+        for model in llm.chat_models():
+            instrument_llm(model)
+        return llm
+    callbacks = getattr(llm, "callbacks", None)
+    if callbacks is None:
+        llm.callbacks = [LLM_METRICS_HANDLER]
+    elif isinstance(callbacks, list) and LLM_METRICS_HANDLER not in callbacks:
+        llm.callbacks = [*callbacks, LLM_METRICS_HANDLER]
+    return llm
@@ -0,0 +1,241 @@
+# src/graphs/single_flight.py
+# Coalesces identical blog requests: concurrent requests for the same graph input attach to one
+# in-flight graph run and share its result and its stream, and a finished result is served again
+# for a short window. Bursts of requests for a trending topic then cost one run instead of N.
+# With a shared state backend this holds across worker processes too: one worker runs the graph
+# under a lease, and identical requests on the other workers wait for its result.
+
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import time
+import uuid
+from collections import OrderedDict
+
+from src.utils.logger import get_logger
+from src.utils import metrics
+
+log = get_logger(__name__)
+
+COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "true").lower() != "false"
+# Seconds a finished result is served to identical requests; 0 only coalesces requests in flight
+COALESCE_WINDOW_SECONDS = float(os.getenv("COALESCE_WINDOW_SECONDS", "10"))
+# Most finished results kept for the window
+COALESCE_MAX_RESULTS = int(os.getenv("COALESCE_MAX_RESULTS", "256"))
+# Seconds a worker holds a run for the other workers without renewing; a crashed worker's run is
+# taken over after this. Renewed every third of it while the run goes on
+COALESCE_LEASE_SECONDS = float(os.getenv("COALESCE_LEASE_SECONDS", "30"))
+# How often a worker waiting on another worker's run checks for its result
+COALESCE_POLL_SECONDS = float(os.getenv("COALESCE_POLL_SECONDS", "0.05"))
+
+# Shared state namespaces: runs under way on some worker, and their results
+FLIGHTS_NAMESPACE = "coalesce_flights"
+RESULTS_NAMESPACE = "coalesce_results"
+
+
+def request_key(usecase: str, graph_input: dict) -> str:
+    """Identifies a request by its use case and validated graph input."""
+    payload = json.dumps([usecase, graph_input], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Flight:
+    """
+    One graph run shared by every request attached to it. Progress events are kept, so a request
+    that attaches late replays what it missed before following the live events.
+    """
+
+    def __init__(self):
+        self.events = []  # (event, data) published so far
+        self.subscribers = set()
+        self.result = asyncio.get_running_loop().create_future()
+        # Streaming requests see a failure as an 'error' event; nobody may await the future itself
+        self.result.add_done_callback(lambda future: future.cancelled() or future.exception())
+        self.task = None
+
+    def publish(self, event: str, data):
+        self.events.append((event, data))
+        for subscriber in self.subscribers:
+            subscriber.put_nowait((event, data))
+
+    def finish(self, result: dict = None, error: Exception = None):
+        if error is None:
+            self.result.set_result(result)
+            self.publish("done", result)
+        else:
+            self.result.set_exception(error)
+            self.publish("error", error)
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(None)
+
+    async def subscribe(self):
+        """Yields every (event, data) of the run, from the start, ending with 'done' or 'error'."""
+        # Nothing is awaited between copying the backlog and subscribing, so no event is missed or repeated
+        backlog, live = list(self.events), asyncio.Queue()
+        finished = self.result.done()
+        if not finished:
+            self.subscribers.add(live)
+        try:
+            for item in backlog:
+                yield item
+            while not finished:
+                item = await live.get()
+                if item is None:
+                    break
+                yield item
+        finally:
+            self.subscribers.discard(live)
+
+
+class SingleFlight:
+    """
+    Runs at most one graph run per request key at a time. A run belongs to no single request:
+    it goes on when the request that started it disconnects, so the others still get the result.
+    Failed runs are not kept; the next identical request starts a new run.
+
+    Given a shared state (see src/utils/shared_state.py) whose keys other processes see, a run is
+    also claimed for the other workers, and its result published to them. A request whose run is
+    under way on another worker waits for that result, so a stream gets only the 'done' event.
+    """
+
+    def __init__(self, enabled: bool = COALESCE_REQUESTS, window_seconds: float = COALESCE_WINDOW_SECONDS,
+                 max_results: int = COALESCE_MAX_RESULTS, state=None, lease_seconds: float = COALESCE_LEASE_SECONDS,
+                 poll_seconds: float = COALESCE_POLL_SECONDS):
+        self.enabled = enabled
+        self.window_seconds = window_seconds
+        self.max_results = max_results
+        # Only a state other processes see adds anything to the runs and results kept here
+        self.state = state if state is not None and state.shared else None
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._flights = {}
+        self._recent = OrderedDict()  # key -> (expires at, result)
+
+    async def _recent_result(self, key: str):
+        if not self.enabled:
+            return None
+        if key in self._recent:
+            expires_at, result = self._recent[key]
+            if time.monotonic() < expires_at:
+                metrics.COALESCED.inc("recent")
+                return result
+            del self._recent[key]
+        if self.state is not None and self.window_seconds > 0 and key not in self._flights:
+            result = await asyncio.to_thread(self.state.get, RESULTS_NAMESPACE, key)
+            if result is not None:
+                metrics.COALESCED.inc("recent")
+                return result
+        return None
+
+    def _join(self, key: str, run) -> Flight:
+        """Returns the run in flight for the key, or starts 'run(publish)' as a new one."""
+        flight = self._flights.get(key) if self.enabled else None
+        if flight is not None:
+            metrics.COALESCED.inc("in_flight")
+            log.info(f"Request {key[:12]} attached to the run in flight")
+            return flight
+        flight = Flight()
+        if self.enabled:
+            self._flights[key] = flight
+        flight.task = asyncio.create_task(self._run(key, flight, run))
+        return flight
+
+    async def _run(self, key: str, flight: Flight, run):
+        try:
+            result = await (self._run_shared(key, flight, run) if self.state is not None and self.enabled
+                            else run(flight.publish))
+        except Exception as e:
+            flight.finish(error=e)
+        else:
+            flight.finish(result=result)
+            if self.enabled and self.window_seconds > 0:
+                self._recent[key] = (time.monotonic() + self.window_seconds, result)
+                self._recent.move_to_end(key)
+                while len(self._recent) > self.max_results:
+                    self._recent.popitem(last=False)
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    async def _run_shared(self, key: str, flight: Flight, run) -> dict:
+        """Runs the graph under a lease that tells the other workers, or waits for the worker holding it."""
+        while True:
+            if await asyncio.to_thread(self.state.add, FLIGHTS_NAMESPACE, key, self.owner, self.lease_seconds):
+                break
+            log.info(f"Request {key[:12]} waiting for the run on another worker")
+            result = await self._other_worker_result(key)
+            if result is not None:
+                metrics.COALESCED.inc("other_worker")
+                return result
+            # That run failed or its worker went away without a result; claim the run here
+
+        renewal = asyncio.create_task(self._renew_lease(key))
+        try:
+            result = await run(flight.publish)
+            # Kept at least a few polls long, so workers waiting on this run see it even with no window
+            await asyncio.to_thread(self.state.set, RESULTS_NAMESPACE, key, result,
+                                    max(self.window_seconds, 20 * self.poll_seconds))
+            return result
+        finally:
+            renewal.cancel()
+            await asyncio.to_thread(self.state.delete, FLIGHTS_NAMESPACE, key, self.owner)
+
+    async def _renew_lease(self, key: str):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(self.state.touch, FLIGHTS_NAMESPACE, key, self.owner, self.lease_seconds)
+            except Exception as e:
+                log.warning(f"Could not renew the lease of run {key[:12]}: {e}")
+
+    def _poll_other_worker(self, key: str) -> tuple:
+        # The result is published before the lease is dropped, so reading it first never misses it
+        result = self.state.get(RESULTS_NAMESPACE, key)
+        if result is not None:
+            return result, False
+        return None, self.state.get(FLIGHTS_NAMESPACE, key) is not None
+
+    async def _other_worker_result(self, key: str):
+        """Waits for the result of the run another worker holds; None if it ends without one."""
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            result, running = await asyncio.to_thread(self._poll_other_worker, key)
+            if result is not None or not running:
+                return result
+
+    async def result(self, key: str, run) -> dict:
+        """Returns the result of the run for the key, starting it if no identical request is in flight."""
+        recent = await self._recent_result(key)
+        if recent is not None:
+            return recent
+        # Shielded: a disconnecting request must not cancel a run other requests are waiting for
+        return await asyncio.shield(self._join(key, run).result)
+
+    async def events(self, key: str, run):
+        """
+        Yields the (event, data) pairs of the run for the key, starting it if no identical request
+        is in flight. Ends with ('done', result) or ('error', exception). A result from the window
+        is a single 'done' event.
+        """
+        recent = await self._recent_result(key)
+        if recent is not None:
+            yield "done", recent
+            return
+        async for item in self._join(key, run).subscribe():
+            yield item
+
+    def joinable(self, key: str) -> bool:
+        """
+        Whether a request for the key would attach to a run in flight or get a recent result in this
+        worker. Runs and results of other workers are not checked, to keep this off the disk.
+        """
+        if not self.enabled:
+            return False
+        recent = self._recent.get(key)
+        return key in self._flights or (recent is not None and time.monotonic() < recent[0])
+
+    def in_flight(self) -> int:
+        return len(self._flights)
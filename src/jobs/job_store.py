@@ -0,0 +1,138 @@
+# src/jobs/job_store.py
+# A durable, SQLite-backed queue of blog generation jobs, shared by every worker process that opens it.
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+from src.utils.logger import get_logger
+from src.utils.shared_state import connect_sqlite
+
+log = get_logger(__name__)
+
+# Job lifecycle: queued -> running -> succeeded | failed (running jobs whose worker stopped
+# renewing their lease, e.g. after a restart, go back to queued)
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+
+class JobStore:
+    """
+    Persists jobs in SQLite so they survive process restarts. Several worker processes may share
+    the file: claims are atomic, and a running job is held by its owner for as long as it renews
+    its lease. Methods are blocking; async callers should run them with asyncio.to_thread.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = connect_sqlite(db_path)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, usecase TEXT NOT NULL, payload TEXT NOT NULL, "
+                "result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+            # Added for shared queues; older files get the columns on first open
+            columns = {row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            if "heartbeat_at" not in columns:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+            # Earliest time a requeued job may be claimed again (NULL: right away)
+            if "available_at" not in columns:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN available_at REAL")
+            self._db.commit()
+
+    def enqueue(self, usecase: str, payload: dict) -> str:
+        """Adds a job to the queue and returns its id."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, usecase, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, usecase, json.dumps(payload), now, now),
+            )
+            self._db.commit()
+        return job_id
+
+    def claim_next(self, owner: str = "") -> Optional[dict]:
+        """
+        Atomically moves the oldest queued job that is due to running for 'owner' and returns it, or
+        None if none is due. A single statement, so two processes never claim the same job.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "UPDATE jobs SET status = ?, owner = ?, attempts = attempts + 1, updated_at = ?, heartbeat_at = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = ? AND COALESCE(available_at, 0) <= ? "
+                "ORDER BY created_at LIMIT 1) RETURNING id",
+                (RUNNING, owner, now, now, QUEUED, now),
+            ).fetchone()
+            self._db.commit()
+        return self.get(row["id"]) if row is not None else None
+
+    def renew(self, owner: str) -> int:
+        """Renews the lease of every job 'owner' is running; returns how many it holds."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = ?", (time.time(), owner, RUNNING)
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+    def complete(self, job_id: str, result: dict):
+        self._finish(job_id, SUCCEEDED, result=json.dumps(result, ensure_ascii=False))
+
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, FAILED, error=error)
+
+    def requeue(self, job_id: str, error: str, delay_seconds: float = 0):
+        """Puts a job back on the queue after a failed attempt, to be claimed again after 'delay_seconds'."""
+        self._finish(job_id, QUEUED, error=error, available_at=time.time() + delay_seconds)
+
+    def _finish(self, job_id: str, status: str, result: Optional[str] = None, error: Optional[str] = None,
+                available_at: Optional[float] = None):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, result = COALESCE(?, result), error = ?, owner = NULL, "
+                "available_at = ?, updated_at = ? WHERE id = ?",
+                (status, result, error, available_at, time.time(), job_id),
+            )
+            self._db.commit()
+
+    def recover_interrupted(self, lease_seconds: float = 0) -> int:
+        """
+        Requeues running jobs whose lease has not been renewed for 'lease_seconds', left behind by a
+        stopped process; they resume from their last checkpoint. Jobs of live workers keep renewing.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, updated_at = ? "
+                "WHERE status = ? AND COALESCE(heartbeat_at, updated_at) <= ?",
+                (QUEUED, now, RUNNING, now - lease_seconds),
+            )
+            self._db.commit()
+        if cursor.rowcount:
+            log.info(f"Requeued {cursor.rowcount} interrupted job(s).")
+        return cursor.rowcount
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,200 @@
+# src/jobs/job_worker.py
+# A pool of asyncio workers that drains the job queue through checkpointed graphs.
+
+import asyncio
+import os
+import random
+import socket
+import uuid
+from contextlib import nullcontext
+
+from src.graphs.admission import AdmissionController
+from src.graphs.graph_registry import GraphRegistry
+from src.jobs.job_store import JobStore, QUEUED, RUNNING
+from src.nodes.translation_progress import TranslationProgress
+from src.utils.blog_storage import get_blog_store
+from src.utils.logger import get_logger
+from src.utils.metrics import track_run
+
+log = get_logger(__name__)
+
+# Job mode settings
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "data/jobs.db")
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "data/checkpoints.db")
+DEFAULT_JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+DEFAULT_JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Seconds a running job stays with its worker without a lease renewal; then another worker resumes it
+DEFAULT_JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "30"))
+# Backoff before a failed attempt is retried: base * 2^(attempt - 1), with jitter, capped
+DEFAULT_JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+DEFAULT_JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "300"))
+
+
+class JobWorkerPool:
+    """
+    Runs queued jobs on graphs compiled with a persistent checkpointer.
+    Each job uses its id as the LangGraph thread id, so a job interrupted by a restart
+    resumes from its last completed node instead of starting over.
+    Pools in several processes may share one store: each renews the lease of the jobs it runs,
+    and requeues jobs whose lease has run out, such as those of a stopped or restarted process.
+    With admission control, each graph run holds a background slot of the API process it runs in.
+    """
+
+    def __init__(self, store: JobStore, graph_registry: GraphRegistry,
+                 workers: int = DEFAULT_JOB_WORKERS, max_attempts: int = DEFAULT_JOB_MAX_ATTEMPTS,
+                 poll_interval: float = 1.0, lease_seconds: float = DEFAULT_JOB_LEASE_SECONDS,
+                 retry_base_seconds: float = DEFAULT_JOB_RETRY_BASE_SECONDS,
+                 retry_max_seconds: float = DEFAULT_JOB_RETRY_MAX_SECONDS,
+                 admission: AdmissionController = None):
+        self.store = store
+        self.graph_registry = graph_registry
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.admission = admission
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._tasks = []
+        self._wakeup = None
+
+    @staticmethod
+    def _config(job_id: str, final_attempt: bool = False) -> dict:
+        # Earlier attempts fail on translation errors so the next attempt resumes them;
+        # the final attempt falls back to the original text instead of failing the job
+        return {"configurable": {"thread_id": job_id, "translation_fallback": final_attempt}}
+
+    async def start(self):
+        """Requeues jobs interrupted by a previous shutdown and starts the workers."""
+        self._wakeup = asyncio.Event()
+        await asyncio.to_thread(self.store.recover_interrupted, self.lease_seconds)
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._keep_leases()))
+        log.info(f"Started {self.workers} job worker(s) as {self.owner}.")
+
+    async def stop(self):
+        """
+        Stops the workers. Jobs still running stay 'running' and resume once their lease runs out,
+        on the next start or in another process.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wakes an idle worker after a job has been enqueued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def submit(self, usecase: str, graph_input: dict) -> str:
+        job_id = await asyncio.to_thread(self.store.enqueue, usecase, graph_input)
+        self.notify()
+        return job_id
+
+    async def _keep_leases(self):
+        """Renews the leases of this pool's jobs, and requeues jobs whose owner stopped renewing."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(self.store.renew, self.owner)
+                if await asyncio.to_thread(self.store.recover_interrupted, self.lease_seconds):
+                    self.notify()
+            except Exception as e:
+                log.warning(f"Could not renew job leases: {e}")
+
+    async def _worker(self, n: int):
+        while True:
+            try:
+                job = await asyncio.to_thread(self.store.claim_next, self.owner)
+                if job is None:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+                    continue
+                await self._run(job)
+            except Exception as e:
+                # E.g. the store locked by another process: keep the worker alive and try again
+                log.error(f"Job worker {n} failed: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _run(self, job: dict):
+        job_id = job["id"]
+        try:
+            graph = self.graph_registry.get(job["usecase"])
+            config = self._config(job_id, final_attempt=job["attempts"] >= self.max_attempts)
+            async with self.admission.run_slot(background=True) if self.admission else nullcontext():
+                with track_run(job["usecase"]) as run:
+                    snapshot = await graph.aget_state(config)
+                    if snapshot.values and not snapshot.next:
+                        log.info(f"Job {job_id} had already finished its graph run.")
+                        state = snapshot.values
+                    elif snapshot.values:
+                        log.info(f"Resuming job {job_id} at {list(snapshot.next)} (attempt {job['attempts']}).")
+                        state = await graph.ainvoke(None, config)
+                    else:
+                        log.info(f"Starting job {job_id} for topic: {job['payload'].get('topic')}")
+                        state = await graph.ainvoke(job["payload"], config)
+
+            paths = await get_blog_store().asave(state)
+            await asyncio.to_thread(self.store.complete, job_id,
+                                    {"data": state, "paths": paths, "timings": run.breakdown()})
+            if self.graph_registry.store is not None:
+                await TranslationProgress.apurge(self.graph_registry.store, job_id)
+            log.info(f"Job {job_id} succeeded.")
+        except asyncio.CancelledError:
+            # Shutting down: leave the job 'running' so it is recovered and resumed on restart
+            raise
+        except Exception as e:
+            if job["attempts"] >= self.max_attempts:
+                log.error(f"Job {job_id} failed after {job['attempts']} attempt(s): {e}", exc_info=True)
+                await self._record(self.store.fail, job_id, str(e))
+            else:
+                delay = self._retry_delay(job["attempts"])
+                log.warning(f"Job {job_id} attempt {job['attempts']} failed, retrying in {delay:.1f}s: {e}")
+                await self._record(self.store.requeue, job_id, str(e), delay)
+
+    async def _record(self, method, *args):
+        """
+        Records a failed job's outcome, retrying while the store is unavailable: the job must not stay
+        'running' under a lease this pool keeps renewing.
+        """
+        while True:
+            try:
+                return await asyncio.to_thread(method, *args)
+            except Exception as e:
+                log.warning(f"Could not record the outcome of job {args[0]}, retrying: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    def _retry_delay(self, attempts: int) -> float:
+        """
+        Exponential backoff with jitter (at least half the step, so retries never come back-to-back):
+        an outage or a burst of 429s would otherwise use up every attempt within seconds, ending in
+        the final attempt's fallback to untranslated paragraphs.
+        """
+        return random.uniform(0.5, 1.0) * min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (attempts - 1))
+
+    async def status(self, job_id: str):
+        """Returns the job record, with the checkpointed partial state while it is still in progress."""
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            return None
+        response = {
+            "job_id": job_id,
+            "status": job["status"],
+            "attempts": job["attempts"],
+            "error": job["error"],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+        }
+        if job["status"] == QUEUED and (job["available_at"] or 0) > job["updated_at"]:
+            response["retry_at"] = job["available_at"]
+        if job["status"] in (QUEUED, RUNNING):
+            snapshot = await self.graph_registry.get(job["usecase"]).aget_state(self._config(job_id))
+            response["partial"] = {"state": snapshot.values, "next": list(snapshot.next)}
+        else:
+            response["result"] = job["result"]
+        return response
@@ -0,0 +1,226 @@
+
+# src/llms/fakellm.py
+
+# import necessary libraries
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import typing
+from typing import Any, List, Optional
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import PrivateAttr
+
+from src.utils.token_counter import count_tokens
+
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+
+class FakeLLMError(RuntimeError):
+    """Raised by FakeChatModel for an injected failure."""
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    A stand-in chat model that sleeps for a sampled latency before answering.
+    Being a real BaseChatModel, it goes through the same callback, caching and streaming
+    machinery as ChatGroq (invoke, ainvoke, batch and with_structured_output) without any network calls.
+
+    Latency is 'latency' plus 'seconds_per_output_token' per generated token. With a
+    'latency_distribution' other than 'fixed', the base latency is sampled around 'latency'
+    with the given 'latency_spread' (half-width for uniform, standard deviation for normal,
+    sigma of the log for lognormal, where 'latency' is the median). A 'failure_rate' share of
+    calls raise FakeLLMError after their latency. Samples are seeded by 'seed', the prompt and
+    how often that prompt was sent, so runs are reproducible whatever order concurrent calls arrive in.
+
+    With 'follow_length', plain answers are as long as the prompt asks ('around N words', in paragraphs)
+    and outline requests ('exactly N sections') get N section lines, so long-post benchmarks see
+    realistic output sizes. Otherwise plain answers are 'response'.
+
+    With 'chatty_json', structured answers come in a ```json fence after a sentence of chatter, as some
+    models answer, and fail to parse with an OutputParserException carrying the raw answer, like
+    LangChain's JSON parsers.
+    """
+
+    latency: float = 0.05
+    seconds_per_output_token: float = 0.0
+    latency_distribution: str = "fixed"
+    latency_spread: float = 0.0
+    failure_rate: float = 0.0
+    seed: int = 0
+    response: str = "Fake LLM response."
+    model_name: str = "fake-chat"
+    follow_length: bool = False
+    chatty_json: bool = False
+
+    _calls: int = PrivateAttr(default=0)
+    _failures: int = PrivateAttr(default=0)
+    _input_tokens: int = PrivateAttr(default=0)
+    _output_tokens: int = PrivateAttr(default=0)
+    _prompt_counts: dict = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, latency: float = 0.05, response: str = "Fake LLM response.", **kwargs: Any):
+        super().__init__(latency=latency, response=response, **kwargs)
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_distribution must be one of {LATENCY_DISTRIBUTIONS}")
+
+    @property
+    def calls(self) -> int:
+        """Number of calls that actually reached the model (cache hits are not counted)."""
+        return self._calls
+
+    @property
+    def failures(self) -> int:
+        """Number of calls that raised an injected failure."""
+        return self._failures
+
+    @property
+    def input_tokens(self) -> int:
+        return self._input_tokens
+
+    @property
+    def output_tokens(self) -> int:
+        return self._output_tokens
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "response": self.response, "follow_length": self.follow_length,
+                "chatty_json": self.chatty_json}
+
+    def _count_call(self, input_tokens: int = 0, output_tokens: int = 0):
+        with self._lock:
+            self._calls += 1
+            self._input_tokens += input_tokens
+            self._output_tokens += output_tokens
+
+    def _content(self, messages: List[BaseMessage], structured_fields) -> str:
+        if not structured_fields:
+            return self._plain_content(messages)
+        # Structured calls answer with a JSON object holding every requested field.
+        # List fields get one entry per <p id="N"> block in the prompt, as used by chunked translation;
+        # string fields echo the '---' delimited paragraph when there is one, so output sizes stay realistic.
+        prompt = "\n".join(str(m.content) for m in messages)
+        blocks = re.findall(r'<p id="\d+">\n?(.*?)\n?</p>', prompt, re.DOTALL)
+        paragraph = re.search(r'---\n\s*(.*?)\n\s*---', prompt, re.DOTALL)
+        values = {}
+        for name, is_list in structured_fields:
+            if is_list:
+                values[name] = [f"[translated] {block}" for block in blocks]
+            elif paragraph:
+                values[name] = f"[translated] {paragraph.group(1)}"
+            else:
+                values[name] = f"[translated {name}]"
+        if self.chatty_json:
+            return f"Here is the translation:\n```json\n{json.dumps(values, indent=2)}\n```\nLet me know if {{anything}} is off."
+        return json.dumps(values)
+
+    def _plain_content(self, messages: List[BaseMessage]) -> str:
+        if not self.follow_length:
+            return self.response
+        prompt = "\n".join(str(m.content) for m in messages)
+        sections = re.search(r"exactly (\d+) sections", prompt)
+        if sections:
+            return "\n".join(f"## Section {i + 1} | Part {i + 1} of the topic" for i in range(int(sections.group(1))))
+        words = re.search(r"around (\d+) words", prompt)
+        if not words:
+            return self.response
+        filler = self.response.split() or ["word"]
+        text = [filler[i % len(filler)] for i in range(int(words.group(1)))]
+        # Paragraphs of about 80 words, as in a generated post
+        return "\n\n".join(" ".join(text[i:i + 80]) for i in range(0, len(text), 80))
+
+    def _result(self, messages: List[BaseMessage], structured_fields) -> ChatResult:
+        content = self._content(messages, structured_fields)
+        input_tokens = count_tokens("".join(str(m.content) for m in messages))
+        output_tokens = count_tokens(content)
+        self._count_call(input_tokens, output_tokens)
+        message = AIMessage(content=content, usage_metadata={
+            "input_tokens": input_tokens, "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _rng(self, messages: List[BaseMessage]) -> random.Random:
+        """Returns a generator seeded by the seed, the prompt and the number of times it has been sent."""
+        prompt_hash = hashlib.sha256("".join(str(m.content) for m in messages).encode("utf-8")).hexdigest()
+        with self._lock:
+            attempt = self._prompt_counts[prompt_hash] = self._prompt_counts.get(prompt_hash, 0) + 1
+        return random.Random(f"{self.seed}:{attempt}:{prompt_hash}")
+
+    def _base_latency(self, rng: random.Random) -> float:
+        if self.latency_distribution == "uniform":
+            return max(0.0, rng.uniform(self.latency - self.latency_spread, self.latency + self.latency_spread))
+        if self.latency_distribution == "normal":
+            return max(0.0, rng.gauss(self.latency, self.latency_spread))
+        if self.latency_distribution == "lognormal":
+            return self.latency * rng.lognormvariate(0.0, self.latency_spread)
+        return self.latency
+
+    def _plan(self, messages: List[BaseMessage], structured_fields):
+        """Returns the delay of a call and whether it fails."""
+        rng = self._rng(messages)
+        delay = self._base_latency(rng)
+        if self.seconds_per_output_token:
+            delay += self.seconds_per_output_token * count_tokens(self._content(messages, structured_fields))
+        return delay, rng.random() < self.failure_rate
+
+    def _fail(self):
+        with self._lock:
+            self._failures += 1
+        raise FakeLLMError("Injected fake LLM failure.")
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, structured_fields=None, **kwargs: Any) -> ChatResult:
+        delay, fails = self._plan(messages, structured_fields)
+        time.sleep(delay)
+        if fails:
+            self._fail()
+        return self._result(messages, structured_fields)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, structured_fields=None, **kwargs: Any) -> ChatResult:
+        delay, fails = self._plan(messages, structured_fields)
+        await asyncio.sleep(delay)
+        if fails:
+            self._fail()
+        return self._result(messages, structured_fields)
+
+    def with_structured_output(self, schema, **kwargs: Any):
+        """Binds the schema's field names to the call and parses the JSON answer into the schema."""
+        fields = [
+            (name, typing.get_origin(field.annotation) is list)
+            for name, field in schema.model_fields.items()
+        ]
+
+        def parse(message):
+            try:
+                return schema.model_validate_json(message.content)
+            except ValueError as e:
+                raise OutputParserException(f"Invalid JSON answer: {e}", llm_output=message.content) from e
+
+        return self.bind(structured_fields=fields) | RunnableLambda(parse)
+
+
+class FakeLLM:
+    """A wrapper mirroring GroqLLM so the fake model can be swapped in for benchmarks and local runs."""
+
+    def __init__(self, latency: float = 0.05, **kwargs: Any):
+        self.llm = FakeChatModel(latency=latency, **kwargs)
+
+    def get_llm(self):
+        """Public method to return the fake LLM instance."""
+        return self.llm
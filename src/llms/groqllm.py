@@ -1,10 +1,12 @@
 
 # import necessary libraries
-from langchain_groq import ChatGroq
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from src.utils.logger import log # Assuming 'log' is your configured logger
 from src.utils.exceptions import LLMConnectionError
+from src.llms.llm_cache import get_llm_cache
+from src.llms.rate_limiter import rate_limited_http_clients
 
 # Best practice to load environment variables once at the start
 load_dotenv()
@@ -34,9 +36,21 @@ class GroqLLM:
                 raise LLMConnectionError("GROQ_API_KEY is not set.")
             log.info("API key retrieved successfully.")
 
-            # 3. Initialize the LLM
+            # 3. Initialize the LLM (the SDK is imported here, so importing this module stays cheap)
+            from langchain_groq import ChatGroq
+
             log.info(f"Initializing ChatGroq model: {self.model_name}")
-            llm = ChatGroq(api_key=api_key, model=self.model_name)
+            # Responses go through the shared content-addressed cache, so every node benefits from it
+            # Rate limiting, retries and backoff live in the shared HTTP layer, so the SDK's own retries are off
+            http_client, http_async_client = rate_limited_http_clients("groq")
+            llm = ChatGroq(
+                api_key=api_key,
+                model=self.model_name,
+                cache=get_llm_cache(),
+                max_retries=0,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
             log.info("ChatGroq model initialized successfully.")
             return llm
 
@@ -50,6 +64,13 @@ class GroqLLM:
         """Public method to return the initialized LLM instance."""
         log.info("Returning the initialized LLM instance.")
         return self.llm
-        
-    
-    
\ No newline at end of file
+
+
+@lru_cache(maxsize=None)
+def get_shared_llm(model_name: str = "llama-3.1-8b-instant"):
+    """
+    Returns a process-wide LLM client for the given model.
+    The client is built once and reused, so its HTTP connection pool is shared across requests.
+    """
+    log.info(f"Creating shared LLM client for model: {model_name}")
+    return GroqLLM(model_name=model_name).get_llm()
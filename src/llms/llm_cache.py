@@ -0,0 +1,194 @@
+
+# src/llms/llm_cache.py
+# A content-addressed LLM response cache with an in-memory LRU tier and an optional SQLite tier.
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration
+
+from src.utils.logger import get_logger
+from src.utils.shared_state import SHARED_STATE_BACKEND, SHARED_STATE_DB_PATH, connect_sqlite
+
+log = get_logger(__name__)
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Caches chat model responses keyed by a hash of (model parameters, prompt).
+
+    LangChain builds the 'llm_string' from the model name and call parameters, and for
+    with_structured_output it also includes the bound tool schema, so the key covers
+    model name, prompt and structured-output schema.
+
+    Lookups check the in-memory LRU first, then the SQLite tier (if a db_path is given),
+    promoting disk hits into memory. Entries older than ttl_seconds are treated as misses.
+    Several worker processes may share one SQLite tier, each with its own memory tier.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        db_path: Optional[str] = None,
+        max_db_entries: int = 100_000,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.max_db_entries = max_db_entries
+
+        self._memory: "OrderedDict[str, tuple[float, RETURN_VAL_TYPE]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self._db = None
+        if db_path:
+            self._db = connect_sqlite(db_path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+            self._db.commit()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _serialize(generations: RETURN_VAL_TYPE) -> str:
+        # Plain JSON of the message dicts; avoids reviving arbitrary objects from disk
+        return json.dumps([
+            {"message": message_to_dict(g.message), "generation_info": g.generation_info}
+            for g in generations
+        ])
+
+    @staticmethod
+    def _deserialize(value: str) -> RETURN_VAL_TYPE:
+        entries = json.loads(value)
+        messages = messages_from_dict([entry["message"] for entry in entries])
+        return [
+            ChatGeneration(message=message, generation_info=entry["generation_info"])
+            for message, entry in zip(messages, entries)
+        ]
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Returns the cached generations for the prompt, or None on a miss."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if not self._expired(row[1], now):
+                        value = self._deserialize(row[0])
+                        self._db.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._store_in_memory(key, row[1], value)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Stores the generations for the prompt in every tier."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            self._store_in_memory(key, now, return_val)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, self._serialize(return_val), now, now),
+                )
+                # Size-based eviction: drop the least recently accessed rows beyond the limit
+                self._db.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_db_entries,),
+                )
+                self._db.commit()
+
+    def _store_in_memory(self, key: str, created_at: float, value: RETURN_VAL_TYPE):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Empties every tier and resets the counters."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+            self.hits = self.misses = self.disk_hits = 0
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_enabled": self._db is not None,
+            }
+
+
+@lru_cache(maxsize=None)
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Returns the process-wide response cache configured from the environment, or None when disabled.
+
+    LLM_CACHE_ENABLED      'false' disables caching (default 'true')
+    LLM_CACHE_MAX_ENTRIES  in-memory LRU size (default 1024)
+    LLM_CACHE_TTL_SECONDS  entry lifetime in seconds (default 86400, 0 for no expiry)
+    LLM_CACHE_DB_PATH      SQLite file for the on-disk tier (default: the shared state file with
+                           SHARED_STATE_BACKEND=sqlite, so workers share responses; else memory only)
+    LLM_CACHE_MAX_DB_ENTRIES  on-disk size limit (default 100000)
+    """
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() == "false":
+        log.info("LLM response cache is disabled.")
+        return None
+
+    ttl_seconds = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")) or None
+    cache = LLMResponseCache(
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+        ttl_seconds=ttl_seconds,
+        db_path=os.getenv("LLM_CACHE_DB_PATH") or (SHARED_STATE_DB_PATH if SHARED_STATE_BACKEND == "sqlite" else None),
+        max_db_entries=int(os.getenv("LLM_CACHE_MAX_DB_ENTRIES", "100000")),
+    )
+    log.info(f"LLM response cache enabled (disk tier: {cache.db_path or 'off'}).")
+    return cache
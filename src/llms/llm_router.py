@@ -0,0 +1,286 @@
+# src/llms/llm_router.py
+# Routes each LLM call to the healthy backend with the best recent p95 latency, and fails over
+# to the next backend when a call fails at the provider (transport, HTTP or timeout errors); an answer
+# that fails to parse is the caller's to handle and is not held against the provider. Nodes get a model
+# tier of their own, so short calls (titles, translations) can use a small fast model and content a larger one.
+
+import importlib
+import os
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+from langchain_core.runnables import Runnable
+
+from src.llms.providers import get_chat_model, provider_model
+from src.utils.logger import get_logger
+from src.utils.exceptions import LLMConnectionError
+from src.utils import metrics
+
+log = get_logger(__name__)
+
+MODEL_TIERS = ("fast", "large")
+# Model tier per graph node; nodes not listed use the fast tier
+DEFAULT_NODE_TIERS = "title_creation=fast,content_generation=large,translation=fast"
+
+
+@lru_cache(maxsize=None)
+def provider_errors() -> tuple:
+    """
+    Errors that mean the provider failed the call: transport, HTTP status and timeout errors, the SDKs'
+    API errors (when installed) and the fake model's injected failures. Anything else, such as an
+    OutputParserException or a pydantic ValidationError from a structured-output answer, is raised as is.
+    """
+    from src.llms.fakellm import FakeLLMError
+
+    errors = [httpx.HTTPError, TimeoutError, ConnectionError, FakeLLMError]
+    for sdk in ("groq", "openai"):
+        try:
+            errors.append(importlib.import_module(sdk).APIError)
+        except (ImportError, AttributeError):
+            pass
+    return tuple(errors)
+
+
+def _p95(values) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+class BackendStats:
+    """
+    Recent latencies and health of one backend (a provider serving one tier).
+    Latencies older than the window are dropped, so a backend that recovered is tried again.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self.samples = deque()  # (monotonic time, seconds)
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+
+    def _trim(self, now: float):
+        while self.samples and self.samples[0][0] < now - self.window_seconds:
+            self.samples.popleft()
+
+    def p95(self, now: float) -> Optional[float]:
+        """p95 latency over the window, or None without recent samples."""
+        self._trim(now)
+        return _p95([seconds for _, seconds in self.samples]) if self.samples else None
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def record_success(self, now: float, seconds: float):
+        self.calls += 1
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.samples.append((now, seconds))
+        self._trim(now)
+
+    def record_failure(self, now: float, failure_threshold: int, cooldown_seconds: float) -> bool:
+        """Counts a failed call; returns True when it takes the backend out of rotation."""
+        self.calls += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= failure_threshold and self.healthy(now):
+            self.unhealthy_until = now + cooldown_seconds
+            return True
+        return False
+
+
+class LLMRouter:
+    """
+    Holds one chat model per provider and tier, and picks a provider for every call:
+    healthy providers first, lowest recent p95 first (providers without recent calls are tried
+    first, so every backend gets measured), ties broken by the configured order. Every 'probe_every'-th
+    call goes to another healthy provider instead, so one slow spell does not sideline a provider for
+    the whole window. A provider that fails 'failure_threshold' calls in a row sits out 'cooldown_seconds'
+    unless nothing else is left.
+    """
+
+    def __init__(self, backends: dict, node_tiers: Optional[dict] = None, window_seconds: float = 300.0,
+                 failure_threshold: int = 3, cooldown_seconds: float = 30.0, probe_every: int = 20):
+        if not backends:
+            raise LLMConnectionError("The LLM router needs at least one backend.")
+        self.backends = backends  # provider -> {tier: chat model}, in order of preference
+        self.node_tiers = _parse_node_tiers(DEFAULT_NODE_TIERS) if node_tiers is None else node_tiers
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.probe_every = probe_every
+        self._routed = {}  # tier -> calls routed so far
+        self._stats = {(provider, tier): BackendStats(window_seconds) for provider, models in backends.items()
+                       for tier in models}
+        self._lock = threading.Lock()
+
+    @property
+    def providers(self) -> list:
+        return list(self.backends)
+
+    def chat_models(self) -> list:
+        """Every distinct chat model behind the router."""
+        models = []
+        for tiers in self.backends.values():
+            for model in tiers.values():
+                if all(model is not seen for seen in models):
+                    models.append(model)
+        return models
+
+    def for_node(self, node: str) -> "RoutedChatModel":
+        """Returns the routed model for a graph node's tier."""
+        return RoutedChatModel(self, self.node_tiers.get(node, "fast"))
+
+    def candidates(self, tier: str) -> list:
+        """Providers to try for a call, in order."""
+        now = time.monotonic()
+        with self._lock:
+            ranked = []
+            for preference, provider in enumerate(self.backends):
+                stats = self._stats[(provider, tier)]
+                p95 = stats.p95(now)
+                ranked.append((not stats.healthy(now), p95 if p95 is not None else 0.0, preference, provider))
+            ranked.sort()
+            routed = self._routed[tier] = self._routed.get(tier, 0) + 1
+        order = [provider for *_, provider in ranked]
+        healthy = sum(not unhealthy for unhealthy, *_ in ranked)
+        if self.probe_every and healthy > 1 and routed % self.probe_every == 0:
+            # Probe the runners-up in turn
+            order.insert(0, order.pop(1 + (routed // self.probe_every) % (healthy - 1)))
+        return order
+
+    def record_success(self, provider: str, tier: str, seconds: float):
+        with self._lock:
+            self._stats[(provider, tier)].record_success(time.monotonic(), seconds)
+
+    def record_failure(self, provider: str, tier: str, error: Exception):
+        with self._lock:
+            tripped = self._stats[(provider, tier)].record_failure(
+                time.monotonic(), self.failure_threshold, self.cooldown_seconds)
+        if tripped:
+            log.error(f"LLM provider {provider} ({tier}) failed {self.failure_threshold} calls in a row; "
+                      f"routing around it for {self.cooldown_seconds:g}s. Last error: {error}")
+
+    def stats(self) -> list:
+        now = time.monotonic()
+        entries = []
+        with self._lock:
+            for (provider, tier), stats in self._stats.items():
+                p95 = stats.p95(now)
+                entries.append({
+                    "provider": provider,
+                    "tier": tier,
+                    "model": getattr(self.backends[provider][tier], "model_name", None),
+                    "healthy": stats.healthy(now),
+                    "p95_seconds": None if p95 is None else round(p95, 4),
+                    "recent_calls": len(stats.samples),
+                    "calls": stats.calls,
+                    "failures": stats.failures,
+                })
+        return entries
+
+
+class RoutedChatModel(Runnable):
+    """
+    A model tier behind the router, used by the nodes like a chat model: invoke, ainvoke and
+    with_structured_output. Each call runs on the best provider and fails over to the next one on a
+    provider error; other errors, such as an unparsable structured answer, are raised right away.
+    The run config is passed through, so callbacks, metrics and streaming see the backend's own model run.
+    """
+
+    def __init__(self, router: LLMRouter, tier: str, wrap=None):
+        self.router = router
+        self.tier = tier
+        self.wrap = wrap  # builds the runnable to call from a backend chat model, e.g. a structured-output chain
+
+    def _runnable(self, provider: str):
+        model = self.router.backends[provider][self.tier]
+        return self.wrap(model) if self.wrap else model
+
+    def _failed(self, provider: str, error: Exception, remaining: int):
+        self.router.record_failure(provider, self.tier, error)
+        if remaining:
+            metrics.LLM_FAILOVERS.inc(provider)
+            log.warning(f"LLM call on {provider} ({self.tier}) failed, failing over. Error: {error}")
+
+    def invoke(self, input, config=None, **kwargs):
+        candidates = self.router.candidates(self.tier)
+        for n, provider in enumerate(candidates):
+            started = time.perf_counter()
+            try:
+                result = self._runnable(provider).invoke(input, config, **kwargs)
+            except provider_errors() as e:
+                self._failed(provider, e, len(candidates) - n - 1)
+                if n == len(candidates) - 1:
+                    raise
+                continue
+            self.router.record_success(provider, self.tier, time.perf_counter() - started)
+            return result
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        candidates = self.router.candidates(self.tier)
+        for n, provider in enumerate(candidates):
+            started = time.perf_counter()
+            try:
+                result = await self._runnable(provider).ainvoke(input, config, **kwargs)
+            except provider_errors() as e:
+                self._failed(provider, e, len(candidates) - n - 1)
+                if n == len(candidates) - 1:
+                    raise
+                continue
+            self.router.record_success(provider, self.tier, time.perf_counter() - started)
+            return result
+
+    def with_structured_output(self, schema, **kwargs):
+        return RoutedChatModel(self.router, self.tier, lambda model: model.with_structured_output(schema, **kwargs))
+
+
+def _parse_node_tiers(value: str) -> dict:
+    tiers = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        node, _, tier = entry.partition("=")
+        if tier.strip() not in MODEL_TIERS:
+            raise LLMConnectionError(f"Invalid LLM_NODE_TIERS entry '{entry}'; tiers are: {', '.join(MODEL_TIERS)}.")
+        tiers[node.strip()] = tier.strip()
+    return tiers
+
+
+@lru_cache(maxsize=None)
+def get_llm_router() -> LLMRouter:
+    """
+    Returns the process-wide router, configured from the environment:
+
+    LLM_PROVIDERS                  providers in order of preference (default 'groq'): groq, openai, fake
+    <PROVIDER>_MODEL_FAST/_LARGE   model per tier (see src/llms/providers.py for defaults)
+    LLM_NODE_TIERS                 tier per node (default: large for content_generation, fast otherwise)
+    LLM_ROUTER_WINDOW_SECONDS      window of the p95 latency (default 300)
+    LLM_ROUTER_FAILURE_THRESHOLD   consecutive failures before a provider sits out (default 3)
+    LLM_ROUTER_COOLDOWN_SECONDS    how long it sits out (default 30)
+    LLM_ROUTER_PROBE_EVERY         every n-th call probes another healthy provider (default 20, 0 to turn off)
+
+    A provider that cannot be set up (e.g. a missing API key) is left out while others remain.
+    """
+    providers = [p.strip().lower() for p in os.getenv("LLM_PROVIDERS", "groq").split(",") if p.strip()]
+    backends, errors = {}, []
+    for provider in providers:
+        try:
+            backends[provider] = {tier: get_chat_model(provider, provider_model(provider, tier)) for tier in MODEL_TIERS}
+        except Exception as e:
+            errors.append(e)
+            log.error(f"LLM provider {provider} is unavailable: {e}")
+    if not backends:
+        raise errors[0] if errors else LLMConnectionError("LLM_PROVIDERS is empty.")
+
+    log.info(f"LLM router providers: {list(backends)}")
+    return LLMRouter(
+        backends,
+        node_tiers=_parse_node_tiers(os.getenv("LLM_NODE_TIERS", DEFAULT_NODE_TIERS)),
+        window_seconds=float(os.getenv("LLM_ROUTER_WINDOW_SECONDS", "300")),
+        failure_threshold=int(os.getenv("LLM_ROUTER_FAILURE_THRESHOLD", "3")),
+        cooldown_seconds=float(os.getenv("LLM_ROUTER_COOLDOWN_SECONDS", "30")),
+        probe_every=int(os.getenv("LLM_ROUTER_PROBE_EVERY", "20")),
+    )
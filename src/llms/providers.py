@@ -0,0 +1,81 @@
+# src/llms/providers.py
+# Chat model backends the LLM router can send calls to. Each provider builds a client for a
+# model name; SDKs are imported on first use, so unused providers cost nothing at startup.
+
+import os
+from functools import lru_cache
+
+from src.utils.logger import get_logger
+from src.utils.exceptions import LLMConnectionError
+from src.llms.llm_cache import get_llm_cache
+from src.llms.rate_limiter import rate_limited_http_clients
+
+log = get_logger(__name__)
+
+# Default models per provider for the 'fast' tier (titles, translations) and the 'large' tier (content).
+# Override with <PROVIDER>_MODEL_FAST / <PROVIDER>_MODEL_LARGE.
+DEFAULT_MODELS = {
+    "groq": {"fast": "llama-3.1-8b-instant", "large": "llama-3.3-70b-versatile"},
+    "openai": {"fast": "llama3.1:8b", "large": "llama3.1:8b"},
+    "fake": {"fast": "fake-chat", "large": "fake-chat"},
+}
+
+
+def _groq(model_name: str):
+    from src.llms.groqllm import get_shared_llm
+
+    return get_shared_llm(model_name)
+
+
+def _openai_compatible(model_name: str):
+    """
+    Any server speaking the OpenAI chat completions API, e.g. a local Ollama, vLLM or llama.cpp server.
+    Configured with OPENAI_BASE_URL (default: Ollama on localhost) and OPENAI_API_KEY.
+    """
+    try:
+        from langchain_openai import ChatOpenAI
+    except ImportError as e:
+        raise LLMConnectionError("The 'openai' LLM provider needs the langchain-openai package "
+                                 "(pip install langchain-openai).") from e
+
+    class ToolCallingChatOpenAI(ChatOpenAI):
+        # The translation prompts ask for a tool call, as with Groq; json_schema mode is not supported everywhere
+        def with_structured_output(self, schema=None, *, method="function_calling", **kwargs):
+            return super().with_structured_output(schema, method=method, **kwargs)
+
+    base_url = os.getenv("OPENAI_BASE_URL", "http://localhost:11434/v1")
+    log.info(f"Initializing OpenAI-compatible model {model_name} at {base_url}")
+    http_client, http_async_client = rate_limited_http_clients("openai")
+    return ToolCallingChatOpenAI(
+        base_url=base_url,
+        api_key=os.getenv("OPENAI_API_KEY") or "not-needed",
+        model=model_name,
+        cache=get_llm_cache(),
+        max_retries=0,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+
+
+def _fake(model_name: str):
+    """The in-process fake model, for running the app offline. FAKE_LLM_LATENCY sets its seconds per call."""
+    from src.llms.fakellm import FakeChatModel
+
+    return FakeChatModel(latency=float(os.getenv("FAKE_LLM_LATENCY", "0.05")), model_name=model_name,
+                         cache=get_llm_cache())
+
+
+PROVIDERS = {"groq": _groq, "openai": _openai_compatible, "fake": _fake}
+
+
+def provider_model(provider: str, tier: str) -> str:
+    """Returns the model a provider serves for a tier ('fast' or 'large')."""
+    return os.getenv(f"{provider.upper()}_MODEL_{tier.upper()}") or DEFAULT_MODELS.get(provider, {}).get(tier, "")
+
+
+@lru_cache(maxsize=None)
+def get_chat_model(provider: str, model_name: str):
+    """Returns the process-wide chat model client for a provider and model."""
+    if provider not in PROVIDERS:
+        raise LLMConnectionError(f"Unknown LLM provider '{provider}'. Available: {', '.join(PROVIDERS)}.")
+    return PROVIDERS[provider](model_name)
@@ -0,0 +1,418 @@
+# src/llms/rate_limiter.py
+# Rate-limit-aware HTTP layer for LLM clients: token buckets, adaptive concurrency,
+# retries with exponential backoff and jitter, and queued-time vs LLM-time metrics.
+#
+# The layer plugs into the provider SDK as an httpx transport, so it sees every API call
+# (sync, async and streaming) without changing how the nodes use the LLM.
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+
+from src.utils.logger import get_logger
+from src.utils.metrics import record_retry
+
+log = get_logger(__name__)
+
+# HTTP statuses worth retrying: throttling and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket refilled continuously at 'rate_per_minute'.
+    reserve() books capacity immediately and returns how long the caller must wait,
+    which lets sync and async callers share one bucket.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Takes 'amount' from the bucket and returns the seconds to wait until it is covered."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+            self._updated_at = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            # The bucket is in debt; the caller waits until the refill covers it
+            return -self._tokens / self.rate_per_second
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits in-flight requests with an AIMD policy: the limit halves when the provider throttles
+    and grows back by roughly one slot per 'limit' successful calls. Works for threads and coroutines.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._waiters = deque()
+
+    def _has_slot(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def _wake_waiters(self):
+        # Called with the lock held: hand free slots to waiters in FIFO order
+        while self._waiters and self._has_slot():
+            waiter = self._waiters.popleft()
+            self.in_flight += 1
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+            else:
+                loop, future = waiter
+                loop.call_soon_threadsafe(lambda f=future: f.done() or f.set_result(None))
+
+    def acquire(self):
+        with self._lock:
+            if self._has_slot():
+                self.in_flight += 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def aacquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._has_slot():
+                self.in_flight += 1
+                return
+            future = loop.create_future()
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was handed over just before cancellation; give it back
+            self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._wake_waiters()
+
+    def on_success(self):
+        with self._lock:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._wake_waiters()
+
+    def on_throttle(self):
+        with self._lock:
+            self.limit = max(self.min_limit, self.limit / 2)
+
+
+class RateLimitController:
+    """
+    Shared policy for one provider: request and token buckets, adaptive concurrency,
+    the retry schedule and the metrics used to size workers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 8,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        default_completion_tokens: int = 1024,
+    ):
+        self.name = name
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrencyLimiter(max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.default_completion_tokens = default_completion_tokens
+
+        self._metrics_lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.failures = 0
+        self.queued_seconds = 0.0
+        self.llm_seconds = 0.0
+
+    def estimate_tokens(self, request: httpx.Request) -> float:
+        """Estimates the tokens a chat completion request will consume (about 4 characters per token)."""
+        try:
+            body = json.loads(request.content or b"{}")
+        except (ValueError, TypeError):
+            return float(self.default_completion_tokens)
+        prompt_tokens = len(json.dumps(body.get("messages", []))) / 4
+        completion_tokens = body.get("max_tokens") or body.get("max_completion_tokens") or self.default_completion_tokens
+        return prompt_tokens + completion_tokens
+
+    def bucket_wait(self, request: httpx.Request) -> float:
+        """Reserves request and token capacity and returns the seconds to wait for it."""
+        wait = 0.0
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket:
+            wait = max(wait, self.token_bucket.reserve(self.estimate_tokens(request)))
+        return wait
+
+    def retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Honors Retry-After when present, else exponential backoff with full jitter."""
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(self.max_delay, float(retry_after))
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def next_retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> Optional[float]:
+        """
+        Feeds an attempt's outcome into the concurrency limiter and metrics.
+        Returns the seconds to wait before retrying, or None when the outcome is final.
+        A None response means the request failed at the connection level.
+        """
+        if response is not None and response.status_code not in RETRYABLE_STATUS_CODES:
+            self.concurrency.on_success()
+            return None
+        if response is not None and response.status_code == 429:
+            self.concurrency.on_throttle()
+        if attempt >= self.max_retries:
+            self.record_failure()
+            return None
+
+        delay = self.retry_delay(attempt, response)
+        status = response.status_code if response is not None else "connection error"
+        log.warning(f"{self.name} call failed with {status}; retrying in {delay:.2f}s "
+                    f"(attempt {attempt + 1}/{self.max_retries})")
+        self.record(retried=True)
+        record_retry(self.name)
+        return delay
+
+    def record(self, queued: float = 0.0, llm: float = 0.0, status: Optional[int] = None, retried: bool = False):
+        with self._metrics_lock:
+            self.queued_seconds += queued
+            self.llm_seconds += llm
+            if status is not None:
+                self.requests += 1
+                if status == 429:
+                    self.throttled += 1
+                elif status >= 500:
+                    self.server_errors += 1
+            if retried:
+                self.retries += 1
+
+    def end_attempt(self, sent_at: float):
+        """Ends an attempt once its response body is done: records its LLM time and frees its slot."""
+        self.record(llm=time.perf_counter() - sent_at)
+        self.concurrency.release()
+
+    def record_failure(self):
+        with self._metrics_lock:
+            self.failures += 1
+
+    def stats(self) -> dict:
+        with self._metrics_lock:
+            return {
+                "provider": self.name,
+                "requests": self.requests,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "server_errors": self.server_errors,
+                "failures": self.failures,
+                "queued_seconds": round(self.queued_seconds, 3),
+                "llm_seconds": round(self.llm_seconds, 3),
+                "concurrency_limit": int(self.concurrency.limit),
+                "in_flight": self.concurrency.in_flight,
+            }
+
+
+class _SlotByteStream(httpx.SyncByteStream):
+    """A response body that holds its request's concurrency slot until it has been read and closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, controller: RateLimitController, sent_at: float):
+        self._stream = stream
+        self._controller = controller
+        self._sent_at = sent_at
+        self._done = False
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            if not self._done:
+                self._done = True
+                self._controller.end_attempt(self._sent_at)
+
+
+class _AsyncSlotByteStream(httpx.AsyncByteStream):
+    """Async counterpart of _SlotByteStream."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, controller: RateLimitController, sent_at: float):
+        self._stream = stream
+        self._controller = controller
+        self._sent_at = sent_at
+        self._done = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._done:
+                self._done = True
+                self._controller.end_attempt(self._sent_at)
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """
+    Sync httpx transport that applies a RateLimitController to every request. The token buckets are
+    waited on before taking a concurrency slot, and the slot is held until the response body is
+    closed, so streamed completions count against the limit for as long as they stream.
+    """
+
+    def __init__(self, controller: RateLimitController, transport: Optional[httpx.BaseTransport] = None):
+        self.controller = controller
+        self.transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        controller = self.controller
+        attempt = 0
+        while True:
+            queued_at = time.perf_counter()
+            wait = controller.bucket_wait(request)
+            if wait:
+                time.sleep(wait)
+            controller.concurrency.acquire()
+            sent_at = time.perf_counter()
+            response, error = None, None
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError as e:
+                error = e
+            except BaseException:
+                controller.end_attempt(sent_at)
+                raise
+            controller.record(queued=sent_at - queued_at,
+                              status=response.status_code if response is not None else None)
+
+            delay = controller.next_retry_delay(attempt, response)
+            if delay is None and response is not None:
+                response.stream = _SlotByteStream(response.stream, controller, sent_at)
+                return response
+            if response is not None:
+                response.close()
+            controller.end_attempt(sent_at)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """Async httpx transport that applies a RateLimitController to every request, like RateLimitedTransport."""
+
+    def __init__(self, controller: RateLimitController, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.controller = controller
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        controller = self.controller
+        attempt = 0
+        while True:
+            queued_at = time.perf_counter()
+            wait = controller.bucket_wait(request)
+            if wait:
+                await asyncio.sleep(wait)
+            await controller.concurrency.aacquire()
+            sent_at = time.perf_counter()
+            response, error = None, None
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                error = e
+            except BaseException:
+                controller.end_attempt(sent_at)
+                raise
+            controller.record(queued=sent_at - queued_at,
+                              status=response.status_code if response is not None else None)
+
+            delay = controller.next_retry_delay(attempt, response)
+            if delay is None and response is not None:
+                response.stream = _AsyncSlotByteStream(response.stream, controller, sent_at)
+                return response
+            if response is not None:
+                await response.aclose()
+            controller.end_attempt(sent_at)
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+@lru_cache(maxsize=None)
+def get_rate_controller(provider: str) -> RateLimitController:
+    """
+    Returns the controller shared by every client of a provider, configured from the environment:
+
+    <PROVIDER>_REQUESTS_PER_MINUTE  request budget (default: unlimited)
+    <PROVIDER>_TOKENS_PER_MINUTE    estimated token budget (default: unlimited)
+    <PROVIDER>_MAX_CONCURRENCY      starting and maximum in-flight requests (default 8)
+    <PROVIDER>_MAX_RETRIES          retries on 429/5xx and connection errors (default 5)
+    """
+    prefix = provider.upper()
+    controller = RateLimitController(
+        name=provider,
+        requests_per_minute=float(os.getenv(f"{prefix}_REQUESTS_PER_MINUTE", "0")) or None,
+        tokens_per_minute=float(os.getenv(f"{prefix}_TOKENS_PER_MINUTE", "0")) or None,
+        max_concurrency=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", "8")),
+        max_retries=int(os.getenv(f"{prefix}_MAX_RETRIES", "5")),
+    )
+    log.info(f"Rate limit controller for {provider}: {controller.stats()}")
+    return controller
+
+
+def rate_limited_http_clients(provider: str):
+    """Returns sync and async httpx clients that route every call through the provider's controller."""
+    controller = get_rate_controller(provider)
+    return (
+        httpx.Client(transport=RateLimitedTransport(controller), timeout=httpx.Timeout(60.0, connect=10.0)),
+        httpx.AsyncClient(transport=AsyncRateLimitedTransport(controller), timeout=httpx.Timeout(60.0, connect=10.0)),
+    )
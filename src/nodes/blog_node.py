@@ -1,19 +1,70 @@
 # src/nodes/blog_node.py
 
 # Import the robust LLM output parser utility
-from src.utils.llm_output_parser import extract_content_from_llm_output
+from src.utils.llm_output_parser import extract_content_from_llm_output, recover_field_from_error
 
 from src.states.blogstate import BlogState
 from src.utils.logger import get_logger
 from pydantic import BaseModel, Field
+from langgraph.config import get_stream_writer
+from langgraph.graph import END
+from langgraph.types import Send
+from src.nodes.language_registry import language_display_name, resolve_target_languages
+from src.nodes.translation_progress import TranslationProgress, TranslationIncompleteError
+from src.nodes.translation_memory import TranslationMemory
+from src.nodes.markdown_segmenter import segment_markdown
+from src.nodes.content_outline import (DEFAULT_SECTION_TOKEN_BUDGET, DEFAULT_TARGET_WORDS, parse_outline,
+                                       section_count, section_max_tokens, section_words, strip_repeated_heading)
+from src.llms.llm_router import LLMRouter
+from src.utils.token_counter import count_tokens
+from src.utils.metrics import record_fallback
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import os
 
 log = get_logger(__name__)
 
+# Maximum number of translation calls in flight at once for a single blog
+DEFAULT_TRANSLATION_CONCURRENCY = int(os.getenv("TRANSLATION_MAX_CONCURRENCY", "5"))
+# Token budget for the source paragraphs packed into one call in 'chunked' translation mode
+DEFAULT_CHUNK_TOKEN_BUDGET = int(os.getenv("TRANSLATION_CHUNK_TOKENS", "800"))
+
+
+# --- Structured output models for translation ---
+class ParagraphTranslation(BaseModel):
+    """A model to hold translated paragraph content."""
+    content: str = Field(description="The translated paragraph text.")
+
+class TitleTranslation(BaseModel):
+    """A model to hold the translated title."""
+    title: str = Field(description="The translated blog title.")
+
+class ChunkTranslation(BaseModel):
+    """A model to hold the translated paragraphs of a chunk, in order."""
+    paragraphs: list[str] = Field(description="The translated paragraphs, one entry per input paragraph, in order.")
+# ------------------------------------------------
+
+
 class BlogNode:
-    """A class to represent the blog generation and translation nodes."""
+    """
+    A class to represent the blog generation and translation nodes.
+    Every node has a sync variant for graph.invoke and an async variant (prefixed with 'a') for graph.ainvoke.
+    """
 
-    def __init__(self, llm):
+    def __init__(self, llm, max_concurrency: int = DEFAULT_TRANSLATION_CONCURRENCY,
+                 chunk_token_budget: int = DEFAULT_CHUNK_TOKEN_BUDGET,
+                 section_token_budget: int = DEFAULT_SECTION_TOKEN_BUDGET):
         self.llm = llm
+        # A router hands each node the model tier configured for it, e.g. a small model for titles
+        # and translations and a larger one for content; a plain chat model serves every node
+        self.title_llm, self.content_llm, self.translation_llm = (
+            llm.for_node(node) if isinstance(llm, LLMRouter) else llm
+            for node in ("title_creation", "content_generation", "translation")
+        )
+        self.max_concurrency = max(1, max_concurrency)
+        self.chunk_token_budget = max(1, chunk_token_budget)
+        self.section_token_budget = max(1, section_token_budget)
 
     def title_creation(self, state: BlogState):
         """Creates the title for the blog."""
@@ -21,17 +72,19 @@ class BlogNode:
             log.warning("No topic found in state for title creation.")
             return {}
 
-        prompt = f"""
-        You are an expert blog title writer.
-        Generate a single, creative, and SEO-friendly blog title for the topic: '{state["topic"]}'.
-        Return only the title text, with no extra formatting or quotation marks.
-        """
         log.info(f"Generating title for topic: {state['topic']}")
-        response = self.llm.invoke(prompt)
-        # Clean up the response to remove potential extra quotes
-        cleaned_title = response.content.strip().replace('"', '')
-        log.info(f"Generated title: {cleaned_title}")
-        return {"blog": {"title": cleaned_title}}
+        response = self.title_llm.invoke(self._title_prompt(state["topic"]))
+        return self._title_result(response)
+
+    async def atitle_creation(self, state: BlogState):
+        """Async variant of title_creation."""
+        if "topic" not in state or not state["topic"]:
+            log.warning("No topic found in state for title creation.")
+            return {}
+
+        log.info(f"Generating title for topic: {state['topic']}")
+        response = await self.title_llm.ainvoke(self._title_prompt(state["topic"]))
+        return self._title_result(response)
 
     def content_generation(self, state: BlogState):
         """Generates the main content for the blog."""
@@ -39,75 +92,402 @@ class BlogNode:
             log.warning("No topic found in state for content generation.")
             return {}
 
-        system_prompt = f"""
-        You are an expert blog writer. Use Markdown formatting.
-        Generate a detailed blog post of around 500 words with a clear breakdown for the topic: '{state["topic"]}'.
-        """
         log.info(f"Generating content for topic: {state['topic']}")
-        response = self.llm.invoke(system_prompt)
+        response = self.content_llm.invoke(self._content_prompt(state["topic"], self._target_words(state)))
+        log.info("Successfully generated blog content.")
+        # Runs in parallel with title_creation; the blog reducer merges the two
+        return {"blog": {"content": response.content}}
+
+    async def acontent_generation(self, state: BlogState):
+        """Async variant of content_generation."""
+        if "topic" not in state or not state["topic"]:
+            log.warning("No topic found in state for content generation.")
+            return {}
+
+        log.info(f"Generating content for topic: {state['topic']}")
+        response = await self.content_llm.ainvoke(self._content_prompt(state["topic"], self._target_words(state)))
         log.info("Successfully generated blog content.")
-        return {"blog": {"title": state['blog']['title'], "content": response.content}}
+        # Runs in parallel with title_creation; the blog reducer merges the two
+        return {"blog": {"content": response.content}}
+
+    def content_route(self, state: BlogState):
+        """Picks the content strategy: one call ('single', the default) or an outline written section by section."""
+        return "outline" if state.get("content_mode") == "sectioned" else "content_generation"
+
+    def outline(self, state: BlogState):
+        """
+        Plans a long post as sections, enough of them that each fits the per-call token budget,
+        so the sections can be written concurrently. Runs in parallel with title_creation, so it
+        only uses the topic.
+        """
+        prompt, sections = self._outline_request(state)
+        response = self.content_llm.invoke(prompt)
+        return self._outline_result(response, sections)
+
+    async def aoutline(self, state: BlogState):
+        """Async variant of outline."""
+        prompt, sections = self._outline_request(state)
+        response = await self.content_llm.ainvoke(prompt)
+        return self._outline_result(response, sections)
+
+    def section_fanout(self, state: BlogState):
+        """Fans out one section_writing branch per outline section."""
+        outline = state["outline"]
+        words = section_words(self._target_words(state), len(outline))
+        return [
+            Send("section_writing", {
+                "topic": state.get("topic", ""),
+                "outline": outline,
+                "section_index": i,
+                "section_words": words,
+            })
+            for i in range(len(outline))
+        ]
+
+    def section_writing(self, state: dict):
+        """Writes one section of the outline, within the per-call token budget."""
+        prompt, max_tokens = self._section_request(state)
+        response = self.content_llm.invoke(prompt, max_tokens=max_tokens)
+        return self._section_result(state, response)
+
+    async def asection_writing(self, state: dict):
+        """Async variant of section_writing."""
+        prompt, max_tokens = self._section_request(state)
+        response = await self.content_llm.ainvoke(prompt, max_tokens=max_tokens)
+        return self._section_result(state, response)
+
+    def assemble_sections(self, state: BlogState):
+        """Joins the written sections in outline order into the blog content."""
+        sections = state.get("sections") or {}
+        content = "\n\n".join(sections[i] for i in range(len(state["outline"])))
+        log.info(f"Assembled {len(sections)} sections into the blog content.")
+        # The sections are in the content now; clear them so they are not returned twice
+        return {"blog": {"content": content}, "sections": None}
 
     def route(self, state: BlogState):
         """A passthrough node to log the routing request before decision."""
-        log.info(f"Routing request for language: {state['current_language']}")
+        log.info(f"Routing request for languages: {resolve_target_languages(state)}")
         # This node simply passes the state along. The decision is next.
         return {}
 
     def route_decision(self, state: BlogState):
-        """Decides the route based on the current language."""
-        language = state.get('current_language', 'english').lower()
-        log.info(f"Routing decision for language: {language}")
-        if language in ['hindi', 'french']:
-            return language
-        return 'end'  # End the process if no translation is needed
+        """
+        Fans out one translation branch per requested language, all from the same generated blog.
+        Languages come from the language registry, so no per-language nodes are needed.
+        """
+        languages = resolve_target_languages(state)
+        log.info(f"Routing decision for languages: {languages}")
+        if not languages:
+            return END  # End the process if no translation is needed
+        return [Send("translation", self._branch_input(state, language)) for language in languages]
+
+    @staticmethod
+    def _branch_input(state: BlogState, language: str) -> dict:
+        """The input of one translation branch, with the previous version's translation when re-translating an edit."""
+        branch = {
+            "topic": state.get("topic", ""),
+            "blog": state["blog"],
+            "current_language": language,
+            "translation_mode": state.get("translation_mode", "paragraph"),
+        }
+        previous_translation = (state.get("previous_translations") or {}).get(language)
+        if state.get("previous_blog") and previous_translation:
+            branch["previous_blog"] = state["previous_blog"]
+            branch["previous_translation"] = previous_translation
+        return branch
+
+    def collect_translations(self, state: BlogState):
+        """
+        Joins the translation branches. When a single current_language was requested,
+        its translation also becomes the returned blog, as before the fan-out existed.
+        """
+        translations = state.get("translations") or {}
+        log.info(f"Collected translations for: {list(translations)}")
+        current_language = state.get("current_language", "")
+        if current_language in translations:
+            return {"blog": translations[current_language]}
+        return {}
 
     def translation(self, state: BlogState):
-        """Translates the content to the specified language, paragraph by paragraph."""
+        """
+        Translates the title and the content to the specified language concurrently.
+        The content is split into Markdown blocks (paragraphs, headings, whole lists and tables);
+        code, horizontal rules and link-only blocks are kept as they are without an LLM call.
+        In 'paragraph' mode every block is its own call; in 'chunked' mode consecutive
+        paragraphs are packed into chunks up to a token budget, one structured call per chunk.
+        In a checkpointed run every finished call is recorded, and a retry only translates what is missing.
+        When re-translating an edited blog, paragraphs unchanged since the previous version reuse its translation.
+        """
+        if not state.get('blog') or not state['blog'].get('content'):
+            log.warning("No blog content available for translation.")
+            return {}
+
+        current_language = state['current_language']
+        title_prompt, document = self._translation_inputs(state)
+        paragraphs = document.texts
+        title_key, keys = self._progress_keys(state, paragraphs)
+        progress = TranslationProgress.from_context(current_language)
+        done = {**self._untranslatable_blocks(document, keys),
+                **self._reused_translations(state, title_key, keys, paragraphs),
+                **(progress.load(limit=len(keys) + 1) if progress else {})}
+        pending = [(i, para) for i, para in enumerate(paragraphs) if keys[i] not in done]
+        chunks = self._pack_chunks(pending, state.get('translation_mode'), self.chunk_token_budget)
+        self._log_translation_start(current_language, document, pending, chunks)
+
+        llm_with_title_parser = self.translation_llm.with_structured_output(TitleTranslation)
+        emit_paragraph = self._paragraph_emitter(current_language)
+        paragraph_results = self._resumed_results(keys, done, emit_paragraph, paragraphs)
+
+        def translate_title():
+            try:
+                result = llm_with_title_parser.invoke(title_prompt)
+            except Exception as e:
+                # An answer with chatter or a code fence around its JSON still holds the title
+                title = recover_field_from_error(e, "title")
+                if title is None:
+                    raise
+                result = TitleTranslation(title=title)
+            if progress:
+                progress.save(title_key, result.title)
+            return result
+
+        def translate_chunk(chunk):
+            results = self._translate_chunk([para for _, para in chunk], current_language)
+            for (i, para), result in zip(chunk, results):
+                emit_paragraph(i, para, result)
+                if progress and not isinstance(result, Exception):
+                    progress.save(keys[i], result)
+            return results
 
-        # --- Define Pydantic models INSIDE the function scope for reliability ---
-        class ParagraphTranslation(BaseModel):
-            """A model to hold translated paragraph content."""
-            content: str = Field(description="The translated paragraph text.")
+        # --- Translate title and chunks concurrently, bounded by max_concurrency ---
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            # Each call runs in a copy of this context, so callbacks and run metrics follow it into the pool
+            def submit(fn, *args):
+                return executor.submit(contextvars.copy_context().run, fn, *args)
 
-        class TitleTranslation(BaseModel):
-            """A model to hold the translated title."""
-            title: str = Field(description="The translated blog title.")
-        # ---------------------------------------------------------------------
+            title_future = None if title_key in done else submit(translate_title)
+            chunk_futures = [submit(translate_chunk, chunk) for chunk in chunks]
+            title_result = self._future_result(title_future) if title_future else TitleTranslation(title=done[title_key])
+            for chunk, future in zip(chunks, chunk_futures):
+                results = self._future_result(future)
+                # A chunk only raises if something outside the LLM calls failed; fall back for all of it
+                for offset, (i, _) in enumerate(chunk):
+                    paragraph_results[i] = results if isinstance(results, Exception) else results[offset]
 
+        self._check_complete(progress, current_language, title_result, paragraph_results)
+        return self._translation_result(state, document, title_result, paragraph_results)
+
+    async def atranslation(self, state: BlogState):
+        """Async variant of translation, bounded by a semaphore instead of a thread pool."""
         if not state.get('blog') or not state['blog'].get('content'):
             log.warning("No blog content available for translation.")
             return {}
 
-        blog_content = state['blog']['content']
         current_language = state['current_language']
-        log.info(f"Starting translation to {current_language}.")
+        title_prompt, document = self._translation_inputs(state)
+        paragraphs = document.texts
+        title_key, keys = self._progress_keys(state, paragraphs)
+        progress = TranslationProgress.from_context(current_language)
+        done = {**self._untranslatable_blocks(document, keys),
+                **self._reused_translations(state, title_key, keys, paragraphs),
+                **(await progress.aload(limit=len(keys) + 1) if progress else {})}
+        pending = [(i, para) for i, para in enumerate(paragraphs) if keys[i] not in done]
+        chunks = self._pack_chunks(pending, state.get('translation_mode'), self.chunk_token_budget)
+        self._log_translation_start(current_language, document, pending, chunks)
+
+        llm_with_title_parser = self.translation_llm.with_structured_output(TitleTranslation)
+        emit_paragraph = self._paragraph_emitter(current_language)
+        paragraph_results = self._resumed_results(keys, done, emit_paragraph, paragraphs)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(runnable, prompt):
+            async with semaphore:
+                return await runnable.ainvoke(prompt)
+
+        async def translate_title():
+            if title_key in done:
+                return TitleTranslation(title=done[title_key])
+            try:
+                result = await bounded(llm_with_title_parser, title_prompt)
+            except Exception as e:
+                # An answer with chatter or a code fence around its JSON still holds the title
+                title = recover_field_from_error(e, "title")
+                if title is None:
+                    raise
+                result = TitleTranslation(title=title)
+            if progress:
+                await progress.asave(title_key, result.title)
+            return result
+
+        async def translate_chunk(chunk):
+            results = await self._atranslate_chunk([para for _, para in chunk], current_language, bounded)
+            for (i, para), result in zip(chunk, results):
+                emit_paragraph(i, para, result)
+                if progress and not isinstance(result, Exception):
+                    await progress.asave(keys[i], result)
+            return results
+
+        # Exceptions are returned in place for the fallback
+        title_result, *chunk_results = await asyncio.gather(
+            translate_title(),
+            *(translate_chunk(chunk) for chunk in chunks),
+            return_exceptions=True,
+        )
+        for chunk, results in zip(chunks, chunk_results):
+            # A chunk only raises if something outside the LLM calls failed; fall back for all of it
+            for offset, (i, _) in enumerate(chunk):
+                paragraph_results[i] = results if isinstance(results, Exception) else results[offset]
+
+        self._check_complete(progress, current_language, title_result, paragraph_results)
+        return self._translation_result(state, document, title_result, paragraph_results)
+
+    def _translate_chunk(self, chunk, current_language):
+        """
+        Translates a chunk of paragraphs and returns one translated string (or exception) per paragraph.
+        Single paragraphs use the per-paragraph call. A chunk whose answer does not line up with
+        its input is split in half and each half retried, down to single paragraphs.
+        """
+        if len(chunk) == 1:
+            try:
+                result = self.translation_llm.with_structured_output(ParagraphTranslation).invoke(
+                    self._paragraph_prompt(chunk[0], current_language))
+                return [result.content]
+            except Exception as e:
+                content = recover_field_from_error(e, "content")
+                return [e if content is None else content]
 
-        # --- Translate Title ---
         try:
-            title_prompt = f"""
-            Translate the following blog title to {current_language}.
-            You MUST use the 'TitleTranslation' tool to format your response.
-            Title: {state['blog']['title']}
-            """
-            llm_with_title_parser = self.llm.with_structured_output(TitleTranslation)
-            title_result = llm_with_title_parser.invoke(title_prompt)
-            translated_title = title_result.title
-            log.info(f"Successfully translated title: {translated_title}")
+            result = self.translation_llm.with_structured_output(ChunkTranslation).invoke(
+                self._chunk_prompt(chunk, current_language))
+            if len(result.paragraphs) == len(chunk):
+                return list(result.paragraphs)
+            log.warning(f"Chunk translation returned {len(result.paragraphs)} paragraphs for {len(chunk)}; splitting.")
         except Exception as e:
-            log.error(f"Title translation failed, using original. Error: {e}")
-            translated_title = state['blog']['title'] # Fallback to original title
+            log.warning(f"Chunk translation of {len(chunk)} paragraphs failed, splitting. Error: {e}")
 
-        # --- Translate Content ---
-        paragraphs = [p.strip() for p in blog_content.split('\n\n') if p.strip()]
-        translated_paragraphs = []
-        
-        llm_with_paragraph_parser = self.llm.with_structured_output(ParagraphTranslation)
+        mid = len(chunk) // 2
+        return self._translate_chunk(chunk[:mid], current_language) + self._translate_chunk(chunk[mid:], current_language)
 
-        for i, para in enumerate(paragraphs):
+    async def _atranslate_chunk(self, chunk, current_language, bounded):
+        """Async variant of _translate_chunk; 'bounded' runs a single LLM call under the concurrency limit."""
+        if len(chunk) == 1:
             try:
-                paragraph_prompt = f"""
-                Translate the following paragraph to {current_language}.
+                result = await bounded(self.translation_llm.with_structured_output(ParagraphTranslation),
+                                       self._paragraph_prompt(chunk[0], current_language))
+                return [result.content]
+            except Exception as e:
+                content = recover_field_from_error(e, "content")
+                return [e if content is None else content]
+
+        try:
+            result = await bounded(self.translation_llm.with_structured_output(ChunkTranslation),
+                                   self._chunk_prompt(chunk, current_language))
+            if len(result.paragraphs) == len(chunk):
+                return list(result.paragraphs)
+            log.warning(f"Chunk translation returned {len(result.paragraphs)} paragraphs for {len(chunk)}; splitting.")
+        except Exception as e:
+            log.warning(f"Chunk translation of {len(chunk)} paragraphs failed, splitting. Error: {e}")
+
+        mid = len(chunk) // 2
+        first, second = await asyncio.gather(
+            self._atranslate_chunk(chunk[:mid], current_language, bounded),
+            self._atranslate_chunk(chunk[mid:], current_language, bounded),
+        )
+        return first + second
+
+    # --- Helpers shared by the sync and async variants ---
+
+    @staticmethod
+    def _title_prompt(topic: str) -> str:
+        """Builds the prompt for title creation."""
+        return f"""
+        You are an expert blog title writer.
+        Generate a single, creative, and SEO-friendly blog title for the topic: '{topic}'.
+        Return only the title text, with no extra formatting or quotation marks.
+        """
+
+    @staticmethod
+    def _title_result(response):
+        """Cleans the title response into a state update."""
+        # Clean up the response to remove potential extra quotes
+        cleaned_title = response.content.strip().replace('"', '')
+        log.info(f"Generated title: {cleaned_title}")
+        return {"blog": {"title": cleaned_title}}
+
+    @staticmethod
+    def _target_words(state: BlogState) -> int:
+        """The requested length of the post, or the default of its content mode."""
+        return state.get("target_words") or DEFAULT_TARGET_WORDS.get(state.get("content_mode") or "single", 500)
+
+    @staticmethod
+    def _content_prompt(topic: str, target_words: int = 500) -> str:
+        """Builds the prompt for content generation."""
+        return f"""
+        You are an expert blog writer. Use Markdown formatting.
+        Generate a detailed blog post of around {target_words} words with a clear breakdown for the topic: '{topic}'.
+        """
+
+    def _outline_request(self, state: BlogState):
+        """Returns the outline prompt and the number of sections it asks for."""
+        target_words = self._target_words(state)
+        sections = section_count(target_words, self.section_token_budget)
+        log.info(f"Planning {sections} sections of about {section_words(target_words, sections)} words "
+                 f"for topic: {state['topic']}")
+        prompt = f"""
+        You are an expert blog writer planning a long blog post on the topic: '{state['topic']}'.
+        Plan exactly {sections} sections of about {section_words(target_words, sections)} words each, in reading order,
+        from an introduction to a conclusion.
+        Return one line per section in the form: ## Section heading | what the section covers
+        Return only the {sections} lines, with no other text.
+        """
+        return prompt, sections
+
+    @staticmethod
+    def _outline_result(response, sections: int):
+        outline = parse_outline(response.content, sections)
+        log.info(f"Outline: {[section['heading'] for section in outline]}")
+        return {"outline": outline}
+
+    def _section_request(self, state: dict):
+        """Returns the prompt of one section and its output token limit."""
+        outline, index, words = state["outline"], state["section_index"], state["section_words"]
+        section = outline[index]
+        headings = "\n".join(f"{i + 1}. {entry['heading']}{' (this section)' if i == index else ''}"
+                             for i, entry in enumerate(outline))
+        prompt = f"""
+        You are an expert blog writer. Use Markdown formatting.
+        You are writing one section of a blog post on the topic: '{state['topic']}'.
+        The post has these sections, in order:
+        {headings}
+        Write section {index + 1}, '{section['heading']}', of around {words} words. It covers: {section['summary'] or section['heading']}
+        Do not repeat the section heading and do not write the other sections. Use ### for any subheadings.
+        """
+        max_tokens = section_max_tokens(words, self.section_token_budget)
+        log.info(f"Writing section {index + 1}/{len(outline)} '{section['heading']}': "
+                 f"{count_tokens(prompt)} prompt tokens, up to {max_tokens} output tokens.")
+        return prompt, max_tokens
+
+    @staticmethod
+    def _section_result(state: dict, response):
+        heading = state["outline"][state["section_index"]]["heading"]
+        body = strip_repeated_heading(response.content, heading)
+        return {"sections": {state["section_index"]: f"## {heading}\n\n{body}"}}
+
+    @staticmethod
+    def _translation_inputs(state: BlogState):
+        """Returns the title prompt and the content split into Markdown blocks."""
+        title_prompt = f"""
+            Translate the following blog title to {language_display_name(state['current_language'])}.
+            You MUST use the 'TitleTranslation' tool to format your response.
+            Title: {state['blog']['title']}
+            """
+        return title_prompt, segment_markdown(state['blog']['content'])
+
+    @staticmethod
+    def _paragraph_prompt(para: str, current_language: str) -> str:
+        """Builds the translation prompt for a single paragraph."""
+        return f"""
+                Translate the following paragraph to {language_display_name(current_language)}.
                 Maintain the original tone and Markdown formatting.
                 You MUST use the 'ParagraphTranslation' tool to format your response.
                 Paragraph:
@@ -115,13 +495,151 @@ class BlogNode:
                 {para}
                 ---
                 """
-                result = llm_with_paragraph_parser.invoke(paragraph_prompt)
-                translated_paragraphs.append(result.content)
-            except Exception as e:
-                log.error(f"Translation failed at paragraph {i}, using original. Error: {e}")
+
+    @staticmethod
+    def _pack_chunks(entries, translation_mode, token_budget):
+        """
+        Groups (index, paragraph) entries into chunks, keeping their order.
+        'paragraph' mode (the default) gives one chunk per paragraph; 'chunked' mode packs
+        paragraphs until the next one would exceed the token budget.
+        """
+        if translation_mode != "chunked":
+            return [[entry] for entry in entries]
+
+        chunks, current, current_tokens = [], [], 0
+        for entry in entries:
+            tokens = count_tokens(entry[1])
+            if current and current_tokens + tokens > token_budget:
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(entry)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def _chunk_prompt(chunk, current_language: str) -> str:
+        """Builds the translation prompt for a chunk of paragraphs."""
+        numbered = "\n".join(f'<p id="{i + 1}">\n{para}\n</p>' for i, para in enumerate(chunk))
+        return f"""
+                Translate each of the following {len(chunk)} paragraphs to {language_display_name(current_language)}.
+                Maintain the original tone and Markdown formatting.
+                Return exactly {len(chunk)} translated paragraphs, in the same order, one per <p> element,
+                without the <p> tags.
+                You MUST use the 'ChunkTranslation' tool to format your response.
+                {numbered}
+                """
+
+    @staticmethod
+    def _paragraph_emitter(current_language: str):
+        """
+        Returns a callback that publishes each translated paragraph as a custom stream event
+        as soon as it lands. Outside a graph run (no stream writer) the callback does nothing.
+        """
+        try:
+            writer = get_stream_writer()
+        except RuntimeError:
+            return lambda i, para, result: None
+
+        def emit(i, para, result):
+            content = para if isinstance(result, Exception) else result
+            writer({"event": "paragraph", "language": current_language, "index": i, "content": content})
+
+        return emit
+
+    @staticmethod
+    def _progress_keys(state: BlogState, paragraphs):
+        """Returns the progress keys of the title and of each paragraph."""
+        return (TranslationProgress.title_key(state['blog']['title']),
+                [TranslationProgress.paragraph_key(i, para) for i, para in enumerate(paragraphs)])
+
+    @staticmethod
+    def _untranslatable_blocks(document, keys) -> dict:
+        """Returns the code, rule and link blocks, by progress key; they are kept as they are."""
+        return {key: segment.text for key, segment in zip(keys, document.segments) if not segment.translatable}
+
+    @staticmethod
+    def _reused_translations(state: BlogState, title_key: str, keys, paragraphs) -> dict:
+        """Returns the previous version's translations of the unchanged title and paragraphs, by progress key."""
+        memory = TranslationMemory.from_previous(state.get("previous_blog"), state.get("previous_translation"))
+        if memory is None:
+            return {}
+        reused = {}
+        title = memory.title_for(state['blog']['title'])
+        if title is not None:
+            reused[title_key] = title
+        for key, para in zip(keys, paragraphs):
+            text = memory.paragraph_for(para)
+            if text is not None:
+                reused[key] = text
+        return reused
+
+    @staticmethod
+    def _log_translation_start(current_language: str, document, pending, chunks):
+        kept = sum(not segment.translatable for segment in document.segments)
+        if kept:
+            log.info(f"Translation to {current_language}: keeping {kept} code, rule and link blocks as they are.")
+        blocks = len(document.segments) - kept
+        if len(pending) < blocks:
+            log.info(f"Translation to {current_language}: {blocks - len(pending)} of {blocks} "
+                     f"paragraphs already translated (unchanged since the previous version or resumed).")
+        log.info(f"Starting translation to {current_language}: {len(pending)} paragraphs in {len(chunks)} calls.")
+
+    @staticmethod
+    def _resumed_results(keys, done, emit_paragraph, paragraphs):
+        """Returns per-paragraph results pre-filled from recorded progress (None where still pending)."""
+        results = [done.get(key) for key in keys]
+        for i, result in enumerate(results):
+            if result is not None:
+                emit_paragraph(i, paragraphs[i], result)
+        return results
+
+    @staticmethod
+    def _check_complete(progress, current_language: str, title_result, paragraph_results):
+        """In a strict checkpointed run, fails the node instead of falling back, so a retry can resume it."""
+        if not progress or not progress.strict:
+            return
+        failed = sum(isinstance(result, Exception) for result in [title_result, *paragraph_results])
+        if failed:
+            raise TranslationIncompleteError(
+                f"{failed} of {len(paragraph_results) + 1} translation calls to {current_language} failed; "
+                f"completed calls are recorded and will be skipped on retry."
+            )
+
+    @staticmethod
+    def _future_result(future):
+        """Returns the future's result, or the exception it raised."""
+        try:
+            return future.result()
+        except Exception as e:
+            return e
+
+    @staticmethod
+    def _translation_result(state: BlogState, document, title_result, paragraph_results):
+        """
+        Assembles the translated blog, falling back to the original text for any failed call.
+        Blocks are put back with the original whitespace between them.
+        """
+        paragraphs = document.texts
+        if isinstance(title_result, Exception):
+            log.error(f"Title translation failed, using original. Error: {title_result}")
+            record_fallback("title")
+            translated_title = state['blog']['title'] # Fallback to original title
+        else:
+            translated_title = title_result.title
+            log.info(f"Successfully translated title: {translated_title}")
+
+        translated_paragraphs = []
+        for i, (para, result) in enumerate(zip(paragraphs, paragraph_results)):
+            if isinstance(result, Exception):
+                log.error(f"Translation failed at paragraph {i}, using original. Error: {result}")
+                record_fallback("paragraph")
                 translated_paragraphs.append(para) # Fallback to original paragraph
+            else:
+                translated_paragraphs.append(result)
 
-        translated_content = "\n\n".join(translated_paragraphs)
-        log.info(f"Finished translation to {current_language}.")
+        translated_content = document.join(translated_paragraphs)
+        log.info(f"Finished translation to {state['current_language']}.")
 
         return {"blog": {"title": translated_title, "content": translated_content}}
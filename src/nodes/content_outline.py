@@ -0,0 +1,91 @@
+# src/nodes/content_outline.py
+# Plans long posts as sections: how many sections a post needs so each one fits the per-call
+# output token budget, and parsing the outline the LLM returns into (heading, summary) entries.
+
+import math
+import os
+import re
+
+from src.utils.exceptions import InvalidRequestError
+from src.utils.logger import get_logger
+from src.utils.token_counter import WORDS_PER_TOKEN, words_for_tokens
+
+log = get_logger(__name__)
+
+# Content generation strategies accepted per request (see BlogNode.content_generation and BlogNode.outline)
+CONTENT_MODES = ("single", "sectioned")
+
+# Default length of a post in words, per content mode
+DEFAULT_TARGET_WORDS = {"single": 500, "sectioned": 3000}
+MIN_TARGET_WORDS = 100
+MAX_TARGET_WORDS = 8000
+MAX_SECTIONS = 16
+
+# Output tokens a single section call may use; longer posts get more sections instead of longer calls
+DEFAULT_SECTION_TOKEN_BUDGET = int(os.getenv("CONTENT_SECTION_TOKENS", "900"))
+# Share of the budget a section is asked to fill; the rest is headroom, as models overshoot word counts
+SECTION_BUDGET_SHARE = 0.8
+
+# Outline lines look like '## Heading | summary', possibly numbered or bulleted instead
+_LINE_PREFIX = re.compile(r"^\s*(?:#+|[-*•]|\d+[.)])\s*")
+
+
+def validate_target_words(value) -> int:
+    """Validates the 'target_words' of a request."""
+    if isinstance(value, bool) or not isinstance(value, int) or not MIN_TARGET_WORDS <= value <= MAX_TARGET_WORDS:
+        raise InvalidRequestError(f"'target_words' must be an integer between {MIN_TARGET_WORDS} and {MAX_TARGET_WORDS}.")
+    return value
+
+
+def _max_section_words(token_budget: int) -> int:
+    return max(1, int(words_for_tokens(token_budget) * SECTION_BUDGET_SHARE))
+
+
+def section_count(target_words: int, token_budget: int = DEFAULT_SECTION_TOKEN_BUDGET) -> int:
+    """Number of sections needed so no section has to exceed the token budget (at least 2)."""
+    sections = math.ceil(target_words / _max_section_words(token_budget))
+    if sections > MAX_SECTIONS:
+        log.warning(f"{target_words} words need {sections} sections of {token_budget} tokens; "
+                    f"writing {MAX_SECTIONS} longer sections instead.")
+    return min(MAX_SECTIONS, max(2, sections))
+
+
+def section_words(target_words: int, sections: int) -> int:
+    """Words to ask of each section: an even share of the post."""
+    return math.ceil(target_words / max(1, sections))
+
+
+def section_max_tokens(words: int, token_budget: int = DEFAULT_SECTION_TOKEN_BUDGET) -> int:
+    """
+    Output token limit of a section call: the budget, or more for a section the post's
+    length forced beyond it (more than MAX_SECTIONS sections' worth of budget).
+    """
+    return max(token_budget, math.ceil(words / (WORDS_PER_TOKEN * SECTION_BUDGET_SHARE)))
+
+
+def parse_outline(text: str, expected: int) -> list:
+    """
+    Parses an outline answer into [{"heading", "summary"}], one entry per non-empty line, keeping at
+    most 'expected' sections. Falls back to numbered parts if the answer has no usable lines.
+    """
+    sections = []
+    for line in (text or "").splitlines():
+        line = _LINE_PREFIX.sub("", line).replace("**", "").strip()
+        if not line:
+            continue
+        heading, _, summary = line.partition("|")
+        sections.append({"heading": heading.strip(), "summary": summary.strip()})
+    if not sections:
+        log.warning("The outline answer had no sections; using numbered parts.")
+        sections = [{"heading": f"Part {i + 1}", "summary": ""} for i in range(expected)]
+    elif len(sections) != expected:
+        log.warning(f"The outline has {len(sections)} sections instead of {expected}.")
+    return sections[:expected]
+
+
+def strip_repeated_heading(text: str, heading: str) -> str:
+    """Drops a leading Markdown heading from a section answer; the assembled post adds its own."""
+    first, _, rest = text.strip().partition("\n")
+    if first.lstrip().startswith("#") or first.strip().strip("*").strip() == heading:
+        return rest.strip()
+    return text.strip()
@@ -0,0 +1,41 @@
+# src/nodes/language_registry.py
+# The languages blogs can be translated into. Adding a language only needs a new entry here.
+
+from src.utils.exceptions import InvalidRequestError
+
+# Maps the language key used in requests and folder names to the name used in prompts
+SUPPORTED_LANGUAGES = {
+    "hindi": "Hindi",
+    "french": "French",
+    "spanish": "Spanish",
+    "german": "German",
+}
+
+
+def language_display_name(language: str) -> str:
+    """Returns the prompt-friendly name of a language key."""
+    return SUPPORTED_LANGUAGES.get(language.lower(), language)
+
+
+def resolve_target_languages(state) -> list:
+    """
+    Returns the supported languages to translate into, in request order and without duplicates.
+    'target_languages' takes precedence; otherwise 'current_language' is used on its own.
+    """
+    languages = state.get("target_languages") or [state.get("current_language", "")]
+    resolved = []
+    for language in languages:
+        language = (language or "").lower()
+        if language in SUPPORTED_LANGUAGES and language not in resolved:
+            resolved.append(language)
+    return resolved
+
+
+def validate_languages(languages: list):
+    """Raises InvalidRequestError if any language is not in the registry."""
+    unsupported = [language for language in languages if language.lower() not in SUPPORTED_LANGUAGES]
+    if unsupported:
+        raise InvalidRequestError(
+            f"Unsupported language(s): {', '.join(unsupported)}. "
+            f"Supported languages: {', '.join(SUPPORTED_LANGUAGES)}."
+        )
@@ -0,0 +1,158 @@
+# src/nodes/markdown_segmenter.py
+# Splits blog content into the Markdown blocks translated one by one, in a single pass over its lines.
+# Fenced and indented code, tables and lists stay whole; code, horizontal rules and lines holding only
+# URLs, images or link definitions are marked untranslatable. The whitespace between blocks is kept,
+# so joining the blocks back gives the original text exactly.
+
+import re
+from typing import NamedTuple, Optional
+
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_RULE = re.compile(r"^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+_HEADING = re.compile(r"^ {0,3}#{1,6}(?:[ \t]|$)")
+_LIST_ITEM = re.compile(r"^ {0,3}(?:[-*+]|\d{1,9}[.)])(?:[ \t]|$)")
+_INDENTED = re.compile(r"^(?: {4}|\t)")
+_CONTINUATION = re.compile(r"^(?: {2,}|\t)")
+_TABLE_DELIMITER = re.compile(r"^ {0,3}\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$")
+# A line that is only a URL, an image, a link definition or an HTML comment
+_LINK_ONLY = re.compile(
+    r"^[ \t]*(?:<?https?://\S+?>?|!\[[^\]]*\]\([^)]*\)|\[[^\]]+\]:[ \t]*\S+(?:[ \t]+.*)?|<!--.*?-->)[ \t]*$"
+)
+
+# Block kinds that are never sent for translation
+UNTRANSLATABLE = ("code", "rule", "link")
+
+
+class Segment(NamedTuple):
+    """A block of the document, and the whitespace that follows it up to the next block."""
+    text: str
+    kind: str  # paragraph, heading, list, table, code, rule or link
+    separator: str
+
+    @property
+    def translatable(self) -> bool:
+        return self.kind not in UNTRANSLATABLE
+
+
+class MarkdownDocument:
+    """Blog content as a sequence of blocks; join() puts (translated) block texts back in place."""
+
+    def __init__(self, leading: str, segments: list):
+        self.leading = leading  # Blank lines before the first block
+        self.segments = segments
+
+    @property
+    def texts(self) -> list:
+        return [segment.text for segment in self.segments]
+
+    def join(self, texts: Optional[list] = None) -> str:
+        """Reassembles the document, with 'texts' in place of the block texts if given."""
+        texts = self.texts if texts is None else texts
+        return self.leading + "".join(text + segment.separator for text, segment in zip(texts, self.segments))
+
+
+def _line_body(line: str) -> str:
+    return line.rstrip("\r\n")
+
+
+def _is_blank(line: str) -> bool:
+    return not line.strip()
+
+
+def _block_end(lines: list, start: int):
+    """Returns (end, kind) of the block starting at lines[start]; lines[start:end] belong to it."""
+    first = _line_body(lines[start])
+    n = len(lines)
+
+    fence = _FENCE.match(first)
+    if fence:
+        marker = fence.group(1)
+        closing = re.compile(rf"^ {{0,3}}{re.escape(marker[0])}{{{len(marker)},}}[ \t]*$")
+        end = start + 1
+        while end < n and not closing.match(_line_body(lines[end])):
+            end += 1
+        # An unclosed fence runs to the end of the document
+        return min(end + 1, n), "code"
+
+    if _RULE.match(first):
+        return start + 1, "rule"
+    if _HEADING.match(first):
+        return start + 1, "heading"
+
+    if "|" in first and start + 1 < n and _TABLE_DELIMITER.match(_line_body(lines[start + 1])) \
+            and "|" in lines[start + 1]:
+        end = start + 2
+        while end < n and not _is_blank(lines[end]) and "|" in lines[end]:
+            end += 1
+        return end, "table"
+
+    if _LIST_ITEM.match(first):
+        end = start + 1
+        while end < n:
+            if not _is_blank(lines[end]):
+                body = _line_body(lines[end])
+                # Items, indented continuations and lazy continuation lines belong to the list
+                if _LIST_ITEM.match(body) or _CONTINUATION.match(body) or not (
+                        _FENCE.match(body) or _HEADING.match(body) or _RULE.match(body)):
+                    end += 1
+                    continue
+                break
+            # A blank line continues the list only if another item or an indented line follows
+            following = end
+            while following < n and _is_blank(lines[following]):
+                following += 1
+            if following < n and (_LIST_ITEM.match(lines[following]) or _CONTINUATION.match(lines[following])):
+                end = following
+                continue
+            break
+        return end, "list"
+
+    if _INDENTED.match(first):
+        end = start + 1
+        while end < n:
+            if _INDENTED.match(lines[end]):
+                end += 1
+                continue
+            following = end
+            while following < n and _is_blank(lines[following]):
+                following += 1
+            if following < n and following > end and _INDENTED.match(lines[following]):
+                end = following
+                continue
+            break
+        return end, "code"
+
+    # A paragraph runs to the next blank line, or to a fence or heading that interrupts it
+    end = start + 1
+    while end < n and not _is_blank(lines[end]):
+        body = _line_body(lines[end])
+        if _FENCE.match(body) or _HEADING.match(body):
+            break
+        end += 1
+    if all(_LINK_ONLY.match(_line_body(line)) for line in lines[start:end]):
+        return end, "link"
+    return end, "paragraph"
+
+
+def segment_markdown(content: str) -> MarkdownDocument:
+    """Splits content into blocks in one pass over its lines; see the module comment for the rules."""
+    lines = (content or "").splitlines(keepends=True)
+    n = len(lines)
+    i = 0
+    while i < n and _is_blank(lines[i]):
+        i += 1
+    leading = "".join(lines[:i])
+
+    segments = []
+    while i < n:
+        end, kind = _block_end(lines, i)
+        text = "".join(lines[i:end])
+        body = text.rstrip("\r\n")
+        # The separator is the block's own final line ending plus the blank lines after it
+        following = end
+        while following < n and _is_blank(lines[following]):
+            following += 1
+        separator = text[len(body):] + "".join(lines[end:following])
+        segments.append(Segment(body, kind, separator))
+        i = following
+    return MarkdownDocument(leading, segments)
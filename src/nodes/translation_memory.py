@@ -0,0 +1,55 @@
+# src/nodes/translation_memory.py
+# Translations of a previous version of a blog, looked up by the hash of each source paragraph,
+# so re-translating an edited blog only sends new or changed paragraphs to the LLM.
+
+from typing import Optional
+
+from src.nodes.markdown_segmenter import segment_markdown
+from src.nodes.translation_progress import content_digest
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def split_paragraphs(content: str) -> list:
+    """Splits blog content into the Markdown blocks translated one by one (see markdown_segmenter)."""
+    return segment_markdown(content).texts
+
+
+class TranslationMemory:
+    """
+    Maps source paragraphs of a previous version to their translations. Paragraphs are matched
+    by content hash, not position, so unchanged paragraphs are reused even when others were
+    inserted, removed or reordered around them.
+    """
+
+    def __init__(self, source_title: str, translated_title: str, paragraphs: dict):
+        self.source_title = source_title
+        self.translated_title = translated_title
+        self.paragraphs = paragraphs  # source paragraph hash -> translated paragraph
+
+    @classmethod
+    def from_previous(cls, previous_blog, previous_translation) -> Optional["TranslationMemory"]:
+        """
+        Pairs the previous source blog with its previous translation, paragraph by paragraph.
+        Returns None when there is nothing to reuse. If the paragraph counts differ the pairing
+        is ambiguous, so only the title is reused.
+        """
+        if not previous_blog or not previous_translation:
+            return None
+        sources = split_paragraphs(previous_blog.get("content", ""))
+        translated = split_paragraphs(previous_translation.get("content", ""))
+        paragraphs = {}
+        if len(sources) == len(translated):
+            paragraphs = {content_digest(source): text for source, text in zip(sources, translated)}
+        else:
+            log.warning(f"Previous translation has {len(translated)} paragraphs for {len(sources)} source paragraphs; "
+                        f"re-translating all paragraphs.")
+        return cls(previous_blog.get("title", ""), previous_translation.get("title", ""), paragraphs)
+
+    def title_for(self, title: str) -> Optional[str]:
+        """Returns the previous translated title if the source title did not change."""
+        return self.translated_title if title == self.source_title and self.translated_title else None
+
+    def paragraph_for(self, para: str) -> Optional[str]:
+        return self.paragraphs.get(content_digest(para))
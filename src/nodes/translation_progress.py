@@ -0,0 +1,89 @@
+# src/nodes/translation_progress.py
+# Per-paragraph progress for the translation node, kept in the graph's store under the run's thread id.
+
+import hashlib
+from typing import Optional
+
+from langgraph.config import get_config, get_store
+from langgraph.store.base import PutOp
+
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+class TranslationIncompleteError(RuntimeError):
+    """Raised by a checkpointed translation run that has failed calls, so a retry can resume it."""
+
+
+def content_digest(text: str) -> str:
+    """Short, stable hash of a source text, used to key translations."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class TranslationProgress:
+    """
+    Records each translated paragraph (and the title) as soon as it lands, so a retried run
+    with the same thread id only translates what is still missing.
+
+    Progress is only kept for graphs compiled with a store and run with a thread_id. Keys include
+    a hash of the source text, so a paragraph that changed between attempts is translated again.
+    """
+
+    NAMESPACE = "translation_progress"
+
+    def __init__(self, store, thread_id: str, language: str, strict: bool = True):
+        self.store = store
+        self.namespace = (self.NAMESPACE, str(thread_id), language)
+        # In strict mode failed calls raise instead of falling back to the original text,
+        # leaving the node to be retried from its checkpoint
+        self.strict = strict
+
+    @classmethod
+    def from_context(cls, language: str) -> Optional["TranslationProgress"]:
+        """
+        Returns the progress tracker for the current graph run, or None outside a checkpointed run.
+        Setting 'translation_fallback' in the run's configurable turns strict mode off (e.g. on a final attempt).
+        """
+        try:
+            store = get_store()
+            configurable = get_config().get("configurable", {})
+        except RuntimeError:
+            return None
+        thread_id = configurable.get("thread_id")
+        if store is None or thread_id is None:
+            return None
+        return cls(store, thread_id, language, strict=not configurable.get("translation_fallback", False))
+
+    @staticmethod
+    def title_key(title: str) -> str:
+        return f"title:{content_digest(title)}"
+
+    @staticmethod
+    def paragraph_key(index: int, para: str) -> str:
+        return f"paragraph:{index}:{content_digest(para)}"
+
+    def load(self, limit: int) -> dict:
+        """Returns the texts already translated by earlier attempts, by key."""
+        return {item.key: item.value["text"] for item in self.store.search(self.namespace, limit=limit)}
+
+    async def aload(self, limit: int) -> dict:
+        return {item.key: item.value["text"] for item in await self.store.asearch(self.namespace, limit=limit)}
+
+    def save(self, key: str, text: str):
+        self.store.put(self.namespace, key, {"text": text})
+
+    async def asave(self, key: str, text: str):
+        await self.store.aput(self.namespace, key, {"text": text})
+
+    @classmethod
+    async def apurge(cls, store, thread_id: str):
+        """
+        Drops all progress recorded for a thread, once its run has finished.
+        This is not done inside the node: a parallel branch can still be cancelled
+        after the node returns, and its progress must survive until the run completes.
+        """
+        namespaces = await store.alist_namespaces(prefix=(cls.NAMESPACE, str(thread_id)))
+        for namespace in namespaces:
+            items = await store.asearch(namespace, limit=10_000)
+            await store.abatch([PutOp(namespace, item.key, None) for item in items])
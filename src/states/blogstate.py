@@ -1,11 +1,44 @@
-from typing import TypedDict
+from typing import Annotated, TypedDict
 from pydantic import BaseModel,Field
 
 class Blog(BaseModel):
     title:str=Field(description="the title of the blog post")
     content:str=Field(description="The main content of the blog post")
 
+def merge_blog(existing, new) -> dict:
+    """
+    Reducer that merges partial blog updates, so the title and content nodes can run as parallel
+    branches and each write only its own field. A full {title, content} update replaces both.
+    """
+    def as_dict(blog):
+        return blog.model_dump() if isinstance(blog, BaseModel) else dict(blog or {})
+    return {**as_dict(existing), **as_dict(new)}
+
+def merge_translations(existing: dict, new: dict) -> dict:
+    """Reducer that merges per-language translations written by parallel branches."""
+    return {**(existing or {}), **(new or {})}
+
+def merge_sections(existing: dict, new: dict) -> dict:
+    """
+    Reducer that merges sections written by parallel branches, keyed by their position in the outline.
+    An update of None clears them once they are assembled into the blog.
+    """
+    if new is None:
+        return {}
+    return {**(existing or {}), **new}
+
 class BlogState(TypedDict):
     topic:str
-    blog:Blog
+    blog:Annotated[Blog, merge_blog]
     current_language:str
+    target_languages:list[str]
+    translation_mode:str
+    # 'single' (one content call) or 'sectioned' (outline, then sections written concurrently)
+    content_mode:str
+    target_words:int
+    outline:list[dict]
+    sections:Annotated[dict[int, str], merge_sections]
+    translations:Annotated[dict[str, Blog], merge_translations]
+    # Set when re-translating an edited blog: the previous source and its translations, by language
+    previous_blog:Blog
+    previous_translations:dict[str, Blog]
@@ -0,0 +1,292 @@
+# src/utils/blog_storage.py
+# Persists generated blogs as Markdown files under blogs/<language>/ and indexes them in SQLite
+# (topic, language, title, slug, path, hash, created_at), so listing and duplicate lookups
+# are index queries instead of directory walks. Writes happen on a background thread in batches.
+
+import asyncio
+import atexit
+import hashlib
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+from .logger import get_logger
+
+log = get_logger(__name__)
+
+BLOGS_DIR = "blogs"
+BLOG_INDEX_DB_PATH = os.getenv("BLOG_INDEX_DB_PATH", "data/blog_index.db")
+# Most save requests written (and committed to the index in one transaction) per batch
+BLOG_WRITE_BATCH_SIZE = int(os.getenv("BLOG_WRITE_BATCH_SIZE", "64"))
+
+
+def slugify(title: str) -> str:
+    """Creates a clean, URL-friendly slug from a title."""
+    safe_title = title.lower().strip()
+    safe_title = re.sub(r'\s+', '-', safe_title)
+    safe_title = re.sub(r'[^a-z0-9-]', '', safe_title)
+    safe_title = re.sub(r'-+', '-', safe_title)
+    return safe_title[:60].strip('-')
+
+
+def content_hash(title: str, content: str) -> str:
+    return hashlib.sha256(f"{title}\n\n{content}".encode("utf-8")).hexdigest()
+
+
+def save_blog_to_file(title: str, content: str, current_language: str) -> str:
+    """
+    Saves a blog as Markdown under blogs/<language>/ and returns the file path.
+    This does blocking disk I/O, so async callers should go through BlogStore instead.
+    """
+    # 1. Create a clean, URL-friendly "slug" from the title
+    safe_title = slugify(title)
+
+    # 2. Define the directory path including the language
+    language_folder = os.path.join(BLOGS_DIR, current_language)
+
+    # 3. Create the language-specific directory if it doesn't exist
+    os.makedirs(language_folder, exist_ok=True)
+
+    # 4. Construct the final filename
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = os.path.join(language_folder, f"{safe_title}_{timestamp}.md")
+
+    # 5. Never overwrite a blog saved in the same second (e.g. during batch runs)
+    suffix = 1
+    while True:
+        try:
+            with open(filename, "x", encoding="utf-8") as f:
+                f.write(f"# {title}\n\n{content}")
+            break
+        except FileExistsError:
+            filename = os.path.join(language_folder, f"{safe_title}_{timestamp}_{suffix}.md")
+            suffix += 1
+    log.info(f"Blog saved to {filename}")
+    return filename
+
+
+def generated_blogs(state: dict) -> list:
+    """
+    Returns the (language, blog) pairs produced by a graph run. The main blog belongs to its
+    current_language; each additional translation to its own language.
+    """
+    current_language = state.get("current_language", "")
+    blogs = [(current_language, state.get("blog") or {})]
+    for language, translated in (state.get("translations") or {}).items():
+        if language != current_language:  # Already saved as the main blog
+            blogs.append((language, translated))
+    return blogs
+
+
+class BlogIndex:
+    """
+    SQLite index of the saved blogs. Methods are blocking; the BlogStore writer thread
+    does the writes, and async callers should run reads with asyncio.to_thread.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS blogs ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT COLLATE NOCASE, language TEXT NOT NULL, "
+                "title TEXT NOT NULL, slug TEXT NOT NULL, path TEXT NOT NULL UNIQUE, hash TEXT NOT NULL, "
+                "created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_blogs_topic ON blogs (topic, language, created_at)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_blogs_language ON blogs (language, created_at)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_blogs_hash ON blogs (hash, language)")
+            self._db.commit()
+
+    def add_many(self, entries: list):
+        """Indexes saved blogs in a single transaction."""
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO blogs (topic, language, title, slug, path, hash, created_at) "
+                "VALUES (:topic, :language, :title, :slug, :path, :hash, :created_at)",
+                entries,
+            )
+            self._db.commit()
+
+    def find_duplicate(self, language: str, blog_hash: str) -> Optional[dict]:
+        """Returns the most recent indexed blog with the same language and content, if any."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM blogs WHERE hash = ? AND language = ? ORDER BY created_at DESC LIMIT 1",
+                (blog_hash, language),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def find(self, topic: Optional[str] = None, language: Optional[str] = None,
+             limit: int = 50, offset: int = 0) -> list:
+        """Lists indexed blogs, newest first, optionally filtered by topic (case-insensitive) and language."""
+        clauses, params = [], []
+        if topic:
+            clauses.append("topic = ?")
+            params.append(topic)
+        if language:
+            clauses.append("language = ?")
+            params.append(language)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT topic, language, title, slug, path, hash, created_at FROM blogs {where}"
+                f"ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM blogs LIMIT 1").fetchone() is None
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class BlogStore:
+    """
+    Saves the blogs of finished graph runs off the request path. save() queues the run and
+    returns a future; a single writer thread drains the queue in batches, writes the Markdown
+    files and indexes the whole batch in one SQLite transaction. A blog identical to one already
+    saved in the same language (same title and content) is not written again; its existing path is returned.
+    """
+
+    def __init__(self, index: BlogIndex, batch_size: int = BLOG_WRITE_BATCH_SIZE):
+        self.index = index
+        self.batch_size = max(1, batch_size)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._registered_atexit = False
+
+    def save(self, state: dict) -> Future:
+        """Queues the blogs of a graph run for saving; the future resolves to their file paths."""
+        future = Future()
+        with self._start_lock:
+            self._start_writer()
+            self._queue.put((state, future))
+        return future
+
+    def start(self):
+        """Starts the writer thread, which first indexes blogs saved before the index existed."""
+        with self._start_lock:
+            self._start_writer()
+
+    def _start_writer(self):
+        # Called with the start lock held. The writer starts on first use, so importing and
+        # constructing the store stays cheap
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="blog-writer", daemon=True)
+            self._thread.start()
+            if not self._registered_atexit:
+                atexit.register(self.flush)
+                self._registered_atexit = True
+
+    def _run(self):
+        try:
+            if self.index.is_empty():
+                self._backfill()
+        except Exception as e:
+            log.error(f"Indexing existing blogs failed: {e}", exc_info=True)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is None for item in batch)
+            self._write_batch([item for item in batch if item is not None])
+            if stop:
+                return
+
+    def _write_batch(self, batch: list):
+        entries, results, seen = [], [], {}
+        for state, future in batch:
+            try:
+                paths = []
+                for language, blog in generated_blogs(state):
+                    title, content = blog.get("title") or "untitled-blog", blog.get("content", "")
+                    blog_hash = content_hash(title, content)
+                    path = seen.get((language, blog_hash)) or self._existing_path(language, blog_hash)
+                    if path is None:
+                        path = save_blog_to_file(title, content, language)
+                        seen[(language, blog_hash)] = path
+                        entries.append({"topic": state.get("topic"), "language": language, "title": title,
+                                        "slug": slugify(title), "path": path, "hash": blog_hash,
+                                        "created_at": time.time()})
+                    paths.append(path)
+                results.append((future, paths, None))
+            except Exception as e:
+                log.error(f"Saving blog for topic '{state.get('topic')}' failed: {e}", exc_info=True)
+                results.append((future, None, e))
+
+        try:
+            if entries:
+                self.index.add_many(entries)
+        except Exception as e:
+            log.error(f"Indexing {len(entries)} saved blog(s) failed: {e}", exc_info=True)
+        for future, paths, error in results:
+            if error is None:
+                future.set_result(paths)
+            else:
+                future.set_exception(error)
+
+    def _existing_path(self, language: str, blog_hash: str) -> Optional[str]:
+        duplicate = self.index.find_duplicate(language, blog_hash)
+        if duplicate and os.path.exists(duplicate["path"]):
+            log.info(f"Blog already saved as {duplicate['path']}; not writing a duplicate.")
+            return duplicate["path"]
+        return None
+
+    def _backfill(self):
+        """Indexes blogs saved before the index existed; their topic is unknown."""
+        entries = []
+        for language in sorted(os.listdir(BLOGS_DIR)) if os.path.isdir(BLOGS_DIR) else []:
+            folder = os.path.join(BLOGS_DIR, language)
+            for name in sorted(os.listdir(folder)) if os.path.isdir(folder) else []:
+                path = os.path.join(folder, name)
+                if not name.endswith(".md"):
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    text = f.read()
+                heading, _, content = text.partition("\n\n")
+                title = heading.removeprefix("# ").strip()
+                entries.append({"topic": None, "language": language, "title": title, "slug": slugify(title),
+                                "path": path, "hash": content_hash(title, content),
+                                "created_at": os.path.getmtime(path)})
+        if entries:
+            self.index.add_many(entries)
+            log.info(f"Indexed {len(entries)} blog(s) saved before the index existed.")
+
+    async def asave(self, state: dict) -> list:
+        """Saves the blogs of a graph run and returns their paths once written and indexed."""
+        return await asyncio.wrap_future(self.save(state))
+
+    def flush(self):
+        """Writes everything queued so far and stops the writer thread; the next save starts it again."""
+        with self._start_lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+
+
+@lru_cache(maxsize=None)
+def get_blog_store() -> BlogStore:
+    """Returns the process-wide blog store, indexed in BLOG_INDEX_DB_PATH."""
+    return BlogStore(BlogIndex(BLOG_INDEX_DB_PATH))
@@ -3,7 +3,7 @@
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
-from .exceptions import APIException
+from .exceptions import APIException, ServiceUnavailableError, TooManyRequestsError
 from .logger import get_logger
 
 log = get_logger(__name__)
@@ -12,6 +12,10 @@ async def api_exception_handler(request: Request, exc: APIException):
     """
     Handles custom APIExceptions and returns a standardized JSON response.
     """
+    if isinstance(exc, (TooManyRequestsError, ServiceUnavailableError)):
+        # Shedding load is expected under overload; a traceback per request would only add to it
+        log.warning(f"API Error: {exc.detail} (Status Code: {exc.status_code})")
+        return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
     log.error(
         f"API Error: {exc.detail} (Status Code: {exc.status_code})", 
         exc_info=exc
@@ -19,6 +23,7 @@ async def api_exception_handler(request: Request, exc: APIException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
+        headers=exc.headers,
     )
 # handle any unexpected exceptions
 async def generic_exception_handler(request: Request, exc: Exception):
@@ -4,9 +4,10 @@
 
 class APIException(Exception):
     """Base class for API exceptions."""
-    def __init__(self, status_code: int, detail: str):
+    def __init__(self, status_code: int, detail: str, headers: dict = None):
         self.status_code = status_code
         self.detail = detail
+        self.headers = headers  # Extra response headers, e.g. Retry-After
         super().__init__(detail)
 
 class LLMConnectionError(APIException):
@@ -17,4 +18,21 @@ class LLMConnectionError(APIException):
 class InvalidRequestError(APIException):
     """Raised for invalid client requests."""
     def __init__(self, detail: str = "Invalid request payload."):
-        super().__init__(status_code=400, detail=detail) # 400 Bad Request
\ No newline at end of file
+        super().__init__(status_code=400, detail=detail) # 400 Bad Request
+
+class NotFoundError(APIException):
+    """Raised when a requested resource does not exist."""
+    def __init__(self, detail: str = "Resource not found."):
+        super().__init__(status_code=404, detail=detail) # 404 Not Found
+
+class TooManyRequestsError(APIException):
+    """Raised when a client has more requests in flight than its quota allows."""
+    def __init__(self, detail: str = "Too many requests.", retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(status_code=429, detail=detail, headers={"Retry-After": str(retry_after)}) # 429 Too Many Requests
+
+class ServiceUnavailableError(APIException):
+    """Raised when the server is overloaded and cannot take the request now."""
+    def __init__(self, detail: str = "The server is overloaded.", retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(status_code=503, detail=detail, headers={"Retry-After": str(retry_after)}) # 503 Service Unavailable
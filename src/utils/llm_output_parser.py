@@ -1,13 +1,309 @@
-
 # src/utils/llm_output_parser.py
+# Extraction of fields from structured LLM output. Raw text answers are read with JsonFieldExtractor,
+# an incremental parser that takes the output chunk by chunk as it streams in and yields the text of
+# the requested top-level string fields as it arrives, skipping code fences and chatter around the JSON.
 
-import json
 import re
-from typing import Any, Optional
+from json.decoder import scanstring
+from typing import Any, Iterable, Iterator, Optional
 from .logger import get_logger
 
 log = get_logger(__name__)
 
+# Characters of raw output quoted in log messages
+LOG_PREVIEW_CHARS = 200
+
+_STRING_SPECIAL = re.compile(r'["\\]')
+# The body of a string up to its closing quote (or up to the end of the text)
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_HIGH_SURROGATE_PREFIXES = ("d8", "d9", "da", "db")
+_SKIP_SPECIAL = re.compile(r'["{}\[\],]')
+_NOT_WHITESPACE = re.compile(r'\S')
+_SIMPLE_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+# Parser states
+_OUTSIDE, _KEY_OR_END, _KEY, _COLON, _VALUE, _STRING_VALUE, _SKIP_VALUE, _COMMA_OR_END, _DONE = range(9)
+
+
+def _preview(output: str) -> str:
+    return output if len(output) <= LOG_PREVIEW_CHARS else f"{output[:LOG_PREVIEW_CHARS]}... ({len(output)} chars)"
+
+
+class JsonFieldExtractor:
+    """
+    Incrementally extracts top-level string fields of a JSON object from text fed in chunks.
+    feed() returns the newly decoded text of each requested field, so a streamed 'content' can be
+    passed on as it arrives. Each character is read once: text before the object (chatter, a
+    ```json fence) is skipped, a '{' that does not start an object is given up on at the first
+    character that does not fit, and everything after the object is ignored.
+    """
+
+    def __init__(self, fields: Iterable[str] = ("content",)):
+        self.fields = tuple(fields)
+        self.values = {}  # field -> text decoded so far
+        self.complete = set()  # fields whose string has been read to its closing quote
+        self._state = _OUTSIDE
+        self._pending = ""  # unread tail: an escape sequence split across chunks
+        self._key = []
+        self._field = None  # requested field whose value is being read
+        self._depth = 0  # nesting inside a skipped value
+        self._in_string = False  # inside a string of a skipped value
+
+    @property
+    def done(self) -> bool:
+        """True once the object has been read to its end."""
+        return self._state == _DONE
+
+    def value(self, field: str = "content") -> Optional[str]:
+        """The field's value if its string was read completely, else None."""
+        return self.values[field] if field in self.complete else None
+
+    def feed(self, chunk: str) -> list:
+        """Reads the next chunk of output; returns [(field, text)] for the text decoded from it."""
+        if self._state == _DONE or not chunk:
+            return []
+        text, self._pending = self._pending + chunk, ""
+        deltas = []
+        i, n = 0, len(text)
+        while i < n and self._state != _DONE:
+            state = self._state
+            if state == _OUTSIDE:
+                start = text.find("{", i)
+                if start < 0:
+                    break
+                self._state, i = _KEY_OR_END, start + 1
+            elif state == _STRING_VALUE or state == _KEY:
+                i = self._read_string(text, i, deltas)
+            elif state == _SKIP_VALUE:
+                i = self._skip_value(text, i)
+            else:
+                match = _NOT_WHITESPACE.search(text, i)
+                if not match:
+                    break
+                i = self._structural(match.group(), match.start())
+        return deltas
+
+    def _structural(self, char: str, i: int) -> int:
+        """Handles a non-whitespace character between the tokens of the object; returns the next position."""
+        state = self._state
+        if state == _KEY_OR_END and char == '"':
+            self._state, self._key = _KEY, []
+        elif state in (_KEY_OR_END, _COMMA_OR_END) and char == "}":
+            self._end_object()
+        elif state == _COLON and char == ":":
+            self._state = _VALUE
+        elif state == _VALUE:
+            key = "".join(self._key)
+            if char == '"' and key in self.fields and key not in self.values:
+                self._state, self._field = _STRING_VALUE, key
+                self.values[key] = ""
+            else:
+                # A value not asked for (or not a string): skip it, nested structures included
+                self._state, self._depth, self._in_string = _SKIP_VALUE, 0, False
+                return i
+        elif state == _COMMA_OR_END and char == ",":
+            self._state = _KEY_OR_END
+        else:
+            # Not an object after all (e.g. a brace in the chatter): look for the next '{' from here
+            self._state = _OUTSIDE
+            return i if char == "{" else i + 1
+        return i + 1
+
+    def _read_string(self, text: str, i: int, deltas: list) -> int:
+        """Reads string characters up to the closing quote (or the end of the text); returns the next position."""
+        end = _STRING_BODY.match(text, i).end()
+        closed = end < len(text) and text[end] == '"'
+        raw = text[i:end] if closed else text[i:]
+        if not closed:
+            # Keep an escape sequence the next chunk completes (a lone '\\', '\\u12', a high surrogate)
+            cut = self._escape_cut(raw)
+            self._pending, raw = raw[cut:], raw[:cut]
+        if raw:
+            decoded = self._decode(raw)
+            if self._state == _KEY:
+                self._key.append(decoded)
+            elif decoded:
+                self.values[self._field] += decoded
+                deltas.append((self._field, decoded))
+        if not closed:
+            return len(text)
+        self._close_string()
+        return end + 1
+
+    def _close_string(self):
+        if self._state == _KEY:
+            self._state = _COLON
+        else:
+            self.complete.add(self._field)
+            self._state = _COMMA_OR_END
+
+    @staticmethod
+    def _escape_cut(raw: str) -> int:
+        """Where an escape sequence cut off by the end of the chunk starts in raw (len(raw) if there is none)."""
+        backslash = raw.rfind("\\", max(0, len(raw) - 12))
+        if backslash < 0:
+            return len(raw)
+        run_start = backslash
+        while run_start and raw[run_start - 1] == "\\":
+            run_start -= 1
+        if (backslash - run_start) % 2:
+            return len(raw)  # An escaped backslash
+        code = raw[backslash + 2:backslash + 6]
+        if backslash < len(raw) - 1 and (raw[backslash + 1] != "u" or len(code) == 4):
+            # A complete escape; only a high surrogate at the very end waits for its low surrogate
+            if raw[backslash + 1] == "u" and code[:2].lower() in _HIGH_SURROGATE_PREFIXES and backslash + 6 == len(raw):
+                return backslash
+            return len(raw)
+        # A cut off escape, possibly the low surrogate of the high surrogate before it
+        previous = backslash - 6
+        if previous >= 0 and raw[previous:previous + 2] == "\\u" and raw[previous + 2:previous + 4].lower() in _HIGH_SURROGATE_PREFIXES:
+            return previous
+        return backslash
+
+    def _decode(self, raw: str) -> str:
+        """Decodes the escapes in a piece of string; invalid ones are read leniently."""
+        if "\\" not in raw:
+            return raw
+        try:
+            return scanstring(raw + '"', 0, False)[0]
+        except ValueError:
+            parts, i = [], 0
+            while i < len(raw):
+                backslash = raw.find("\\", i)
+                if backslash < 0:
+                    parts.append(raw[i:])
+                    break
+                parts.append(raw[i:backslash])
+                decoded, length = self._escape(raw, backslash)
+                parts.append(decoded)
+                i = backslash + length
+            return "".join(parts)
+
+    @staticmethod
+    def _escape(text: str, i: int):
+        """Decodes the escape sequence at text[i] leniently; returns (text, length)."""
+        char = text[i + 1:i + 2]
+        if char != "u":
+            return _SIMPLE_ESCAPES.get(char, char), 2
+        try:
+            code = int(text[i + 2:i + 6], 16)
+        except ValueError:
+            return text[i + 2:i + 6], 6
+        if 0xD800 <= code < 0xDC00 and text[i + 6:i + 8] == "\\u":
+            # A high surrogate pairs with the low surrogate escape that follows it
+            try:
+                low = int(text[i + 8:i + 12], 16)
+            except ValueError:
+                low = 0
+            if 0xDC00 <= low < 0xE000:
+                return chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)), 12
+        return chr(code), 6
+
+    def _skip_value(self, text: str, i: int) -> int:
+        """Skips a value that is not extracted, up to the ',' or '}' that ends it."""
+        n = len(text)
+        while i < n:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(text, i)
+                if not match:
+                    return n
+                if match.group() == "\\":
+                    if match.start() + 1 >= n:
+                        self._pending = "\\"
+                        return n
+                    i = match.start() + 2
+                    continue
+                self._in_string = False
+                i = match.start() + 1
+                continue
+            match = _SKIP_SPECIAL.search(text, i)
+            if not match:
+                return n
+            char, i = match.group(), match.start() + 1
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif self._depth:
+                if char in "}]":
+                    self._depth -= 1
+            elif char == ",":
+                self._state = _KEY_OR_END
+                return i
+            elif char == "}":
+                self._end_object()
+                return i
+        return n
+
+    def _end_object(self):
+        # An object holding none of the fields (e.g. '{}' in the chatter) is not the answer; keep looking
+        self._state = _DONE if self.values else _OUTSIDE
+
+
+class StructuredMessageStream:
+    """
+    Turns the streamed messages of structured LLM calls into the decoded text of their fields.
+    A message's JSON arrives as its content or as tool call argument chunks, depending on how
+    the model is bound to the schema; chunks of the same message share its id.
+    """
+
+    def __init__(self, fields: Iterable[str] = ("content", "title")):
+        self.fields = tuple(fields)
+        self._extractors = {}  # message id -> JsonFieldExtractor
+
+    def feed(self, message) -> list:
+        """Reads a message (chunk); returns [(field, text)] for the field text it adds."""
+        tool_calls = getattr(message, "tool_calls", None) or []
+        if not getattr(message, "tool_call_chunks", None) and any(isinstance(c.get("args"), dict) for c in tool_calls):
+            # A complete message whose arguments are already parsed
+            return [(field, call["args"][field]) for call in tool_calls for field in self.fields
+                    if isinstance(call["args"].get(field), str)]
+        text = message.content if isinstance(message.content, str) else ""
+        text += "".join(chunk.get("args") or "" for chunk in getattr(message, "tool_call_chunks", None) or [])
+        if not text:
+            return []
+        key = getattr(message, "id", None)
+        extractor = self._extractors.get(key) or JsonFieldExtractor(self.fields)
+        deltas = extractor.feed(text)
+        if key is None or extractor.done:
+            self._extractors.pop(key, None)
+        else:
+            self._extractors[key] = extractor
+        return deltas
+
+
+def stream_json_field(chunks: Iterable[str], field: str = "content") -> Iterator[str]:
+    """Yields the text of a top-level JSON string field as the chunks holding it arrive."""
+    extractor = JsonFieldExtractor((field,))
+    for chunk in chunks:
+        for _, text in extractor.feed(chunk):
+            yield text
+        if extractor.done:
+            return
+
+
+def extract_json_field(output: str, field: str = "content") -> Optional[str]:
+    """Returns a top-level string field of the JSON object in a raw text answer, or None."""
+    extractor = JsonFieldExtractor((field,))
+    extractor.feed(output)
+    return extractor.value(field)
+
+
+def recover_field_from_error(error: Exception, field: str) -> Optional[str]:
+    """
+    Recovers a field from the raw answer attached to a failed structured output parse
+    (LangChain's OutputParserException keeps it as 'llm_output'), e.g. JSON wrapped in a
+    code fence or followed by an explanation. Returns None if there is nothing to recover.
+    """
+    raw = getattr(error, "llm_output", None)
+    if not isinstance(raw, str) or not raw:
+        return None
+    value = extract_json_field(raw, field)
+    if value is not None:
+        log.warning(f"Recovered '{field}' from an answer that failed structured parsing: {_preview(raw)!r}")
+    return value
+
+
 def extract_content_from_llm_output(output: Any) -> Optional[str]:
     """
     Robustly extracts the 'content' field from various LLM output formats.
@@ -15,7 +311,7 @@ def extract_content_from_llm_output(output: Any) -> Optional[str]:
     This function can handle:
     1. A Pydantic model object with a 'content' attribute.
     2. A dictionary with a 'content' key.
-    3. A raw JSON string that needs to be cleaned and parsed.
+    3. A raw JSON string, possibly in a code fence or surrounded by other text.
 
     Args:
         output: The raw output from the LLM.
@@ -31,21 +327,12 @@ def extract_content_from_llm_output(output: Any) -> Optional[str]:
     if isinstance(output, dict):
         return output.get("content")
 
-    # Case 3: Raw string (potentially messy JSON)
+    # Case 3: Raw string (potentially messy JSON), read in one pass
     if isinstance(output, str):
-        try:
-            # Clean the string: find the first '{' and the last '}'
-            match = re.search(r'\{.*\}', output, re.DOTALL)
-            if match:
-                clean_json_str = match.group(0)
-                data = json.loads(clean_json_str)
-                return data.get("content")
-            else:
-                log.warning(f"Could not find a JSON object in the LLM string output: {output}")
-                return None
-        except (json.JSONDecodeError, TypeError) as e:
-            log.error(f"Failed to parse LLM string output as JSON: {e}. Output: '{output}'")
-            return None
-            
+        content = extract_json_field(output, "content")
+        if content is None:
+            log.warning(f"Could not find a JSON 'content' string in the LLM string output: {_preview(output)!r}")
+        return content
+
     log.warning(f"Unsupported output type for content extraction: {type(output)}")
-    return None
\ No newline at end of file
+    return None
@@ -1,12 +1,20 @@
 # src/utils/logger.py
 
 
+import atexit
+import copy
 import logging
 import sys
 import json
 import os
-from pathlib import Path
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+# Log directory and mode; LOG_ASYNC=false writes from the calling thread as before
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() != "false"
 
 # Define a custom JSON formatter
 class JsonFormatter(logging.Formatter):
@@ -19,49 +27,158 @@ class JsonFormatter(logging.Formatter):
         }
         if record.exc_info:
             log_record['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_record['exc_info'] = record.exc_text
         return json.dumps(log_record)
 
+
+class DailyFileHandler(logging.FileHandler):
+    """
+    Writes to <directory>/<prefix>_<YYYY-MM-DD>.log and switches to a new file
+    when the date changes, so long-running processes rotate daily.
+    """
+
+    def __init__(self, directory: str, prefix: str, encoding: str = "utf-8"):
+        self.directory = directory
+        self.prefix = prefix
+        self.current_date = datetime.now().strftime('%Y-%m-%d')
+        super().__init__(self._path(self.current_date), encoding=encoding, delay=True)
+
+    def _path(self, date_str: str) -> str:
+        return os.path.join(self.directory, f"{self.prefix}_{date_str}.log")
+
+    def _open(self):
+        # The directory and file are only created when the first record is written
+        os.makedirs(self.directory, exist_ok=True)
+        return super()._open()
+
+    def emit(self, record):
+        date_str = datetime.fromtimestamp(record.created).strftime('%Y-%m-%d')
+        if date_str != self.current_date:
+            self.acquire()
+            try:
+                # Only the stream is closed: close() would also unregister the handler, and
+                # logging.shutdown() would then no longer flush and close it at exit
+                if self.stream:
+                    self.stream.close()
+                    self.stream = None
+                self.current_date = date_str
+                self.baseFilename = os.path.abspath(self._path(date_str))
+            finally:
+                self.release()
+        super().emit(record)
+
+
+class PreparedQueueHandler(QueueHandler):
+    """
+    Queue handler that only resolves the message and exception text on the calling thread
+    (tracebacks cannot cross threads safely). JSON formatting and I/O happen on the listener thread.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def __init__(self, queue, listener: QueueListener = None):
+        super().__init__(queue)
+        self.listener = listener
+        self._started = listener is None
+        self._start_lock = threading.Lock()
+
+    def enqueue(self, record):
+        # A listener owned by this handler is started by the first record, not when loggers are created at import
+        global _listener_started
+        if not self._started:
+            with self._start_lock:
+                if not self._started:
+                    self.listener.start()
+                    _listener_started = True
+                    atexit.register(shutdown_logging)
+                    self._started = True
+        super().enqueue(record)
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def build_handlers(log_dir: str = LOG_DIR):
+    """
+    Builds the console, app (INFO and above) and error (ERROR only) handlers.
+    These are shared by every logger instead of being duplicated per logger.
+    """
+    formatter = JsonFormatter()
+
+    # Console handler
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    # File handler for all logs (INFO and above), one file per day
+    file_handler = DailyFileHandler(os.path.join(log_dir, "app"), "app")
+    file_handler.setFormatter(formatter)
+    file_handler.setLevel(logging.INFO)
+
+    # File handler for errors only, one file per day
+    error_file_handler = DailyFileHandler(os.path.join(log_dir, "error"), "error")
+    error_file_handler.setFormatter(formatter)
+    error_file_handler.setLevel(logging.ERROR)
+
+    return [stream_handler, file_handler, error_file_handler]
+
+
+_handlers = None
+_listener = None
+_listener_started = False
+_handlers_lock = threading.Lock()
+
+
+def _logger_handlers():
+    """
+    Returns the handlers to attach to each logger, creating them on first use.
+    In async mode this is a single queue handler; a background listener thread, started
+    with the first record, formats records and does the console and file I/O.
+    No directories, files or threads are created until something is logged.
+    """
+    global _handlers, _listener
+    with _handlers_lock:
+        if _handlers is None:
+            handlers = build_handlers()
+            if LOG_ASYNC:
+                log_queue = queue.SimpleQueue()
+                _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+                _handlers = [PreparedQueueHandler(log_queue, _listener)]
+            else:
+                _handlers = handlers
+        return _handlers
+
+
+def shutdown_logging():
+    """Flushes queued records and stops the background listener."""
+    global _listener, _listener_started
+    if _listener is not None and _listener_started:
+        _listener.stop()
+        _listener = None
+        _listener_started = False
+
+
 # Configure the logger
 
 def get_logger(name: str) -> logging.Logger:
     """
     Configures and returns a logger with a specified name.
-    Adds both console and file handlers (info and error logs), rotating daily.
+    Logs go to the console and to daily app and error files, through shared handlers.
     """
     logger = logging.getLogger(name)
 
     if not logger.handlers:
         logger.setLevel(logging.INFO)
-        formatter = JsonFormatter()
-
-        # Ensure logs/app and logs/error directories exist
-        os.makedirs("logs/app", exist_ok=True)
-        os.makedirs("logs/error", exist_ok=True)
-
-        # Console handler
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
-
-        # Use date-based log file naming for daily log separation
-        from datetime import datetime
-        today_str = datetime.now().strftime('%Y-%m-%d')
-        app_log_path = f"logs/app/app_{today_str}.log"
-        error_log_path = f"logs/error/error_{today_str}.log"
-
-        # File handler for all logs (INFO and above)
-        file_handler = logging.FileHandler(app_log_path, encoding="utf-8")
-        file_handler.setFormatter(formatter)
-        file_handler.setLevel(logging.INFO)
-        logger.addHandler(file_handler)
-
-        # File handler for errors only
-        error_file_handler = logging.FileHandler(error_log_path, encoding="utf-8")
-        error_file_handler.setFormatter(formatter)
-        error_file_handler.setLevel(logging.ERROR)
-        logger.addHandler(error_file_handler)
+        for handler in _logger_handlers():
+            logger.addHandler(handler)
 
     return logger
 
 # Example of a generic logger instance you can import elsewhere
-log = get_logger(__name__)
\ No newline at end of file
+log = get_logger(__name__)
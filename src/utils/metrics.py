@@ -0,0 +1,238 @@
+# src/utils/metrics.py
+# In-process metrics: Prometheus-format histograms and counters for the whole process,
+# plus a per-run collector that becomes the timing breakdown attached to API responses.
+
+import bisect
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+# Instrumentation switch; METRICS_ENABLED=false leaves nodes and LLM clients unwrapped
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() != "false"
+# Prices used for the cost estimate, in USD per million tokens (defaults: Groq llama-3.1-8b-instant)
+LLM_COST_PER_1M_INPUT_TOKENS = float(os.getenv("LLM_COST_PER_1M_INPUT_TOKENS", "0.05"))
+LLM_COST_PER_1M_OUTPUT_TOKENS = float(os.getenv("LLM_COST_PER_1M_OUTPUT_TOKENS", "0.08"))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _label_text(label_names, label_values, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """A monotonically increasing value per label set."""
+
+    def __init__(self, name: str, help_text: str, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.label_names, label_values)} {value:g}")
+        return lines
+
+
+class Gauge:
+    """A value that goes up and down, per label set."""
+
+    def __init__(self, name: str, help_text: str, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, *label_values):
+        with self._lock:
+            self._values[label_values] = value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.label_names, label_values)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                    cumulative += bucket_count
+                    le = bound if bound == "+Inf" else f"{bound:g}"
+                    labels = _label_text(self.label_names, label_values, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _label_text(self.label_names, label_values)
+                lines.append(f"{self.name}_sum{labels} {total:g}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+# --- Process-wide metrics, exposed on /metrics ---
+RUN_SECONDS = Histogram("blog_run_duration_seconds", "Wall time of a whole graph run.", ["usecase"])
+NODE_SECONDS = Histogram("blog_node_duration_seconds", "Wall time of a graph node.", ["node"])
+LLM_SECONDS = Histogram("blog_llm_request_duration_seconds", "Latency of a single LLM call.", ["node", "model"])
+LLM_TOKENS = Counter("blog_llm_tokens_total", "Prompt and completion tokens used by LLM calls.", ["node", "type"])
+LLM_COST = Counter("blog_llm_cost_usd_total", "Estimated LLM cost in USD.", ["model"])
+LLM_CACHE_HITS = Counter("blog_llm_cache_hits_total", "LLM calls answered from the response cache.", ["node"])
+LLM_ERRORS = Counter("blog_llm_errors_total", "LLM calls that raised.", ["node"])
+LLM_FAILOVERS = Counter("blog_llm_failovers_total", "LLM calls that failed on a provider and moved to the next one.", ["provider"])
+LLM_RETRIES = Counter("blog_llm_retries_total", "HTTP retries of LLM calls after 429/5xx or connection errors.", ["provider"])
+FALLBACKS = Counter("blog_translation_fallbacks_total", "Translation calls that fell back to the original text.", ["kind"])
+COALESCED = Counter("blog_coalesced_requests_total",
+                    "Blog requests served by another request's graph run instead of a new one.", ["source"])
+ADMISSION_QUEUE_DEPTH = Gauge("blog_admission_queue_depth", "Graph runs waiting for a slot.", ["kind"])
+ADMISSION_RUNNING = Gauge("blog_admission_running_runs", "Graph runs holding a slot.", ["kind"])
+ADMISSION_WAIT_SECONDS = Histogram("blog_admission_queue_wait_seconds",
+                                   "Time a graph run waited in the admission queue before it started.")
+ADMISSION_REJECTED = Counter("blog_admission_rejected_total",
+                             "Requests turned away by admission control.", ["reason"])
+
+ALL_METRICS = [RUN_SECONDS, NODE_SECONDS, LLM_SECONDS, LLM_TOKENS, LLM_COST, LLM_CACHE_HITS, LLM_ERRORS,
+               LLM_FAILOVERS, LLM_RETRIES, FALLBACKS, COALESCED, ADMISSION_QUEUE_DEPTH, ADMISSION_RUNNING,
+               ADMISSION_WAIT_SECONDS, ADMISSION_REJECTED]
+
+
+def render_prometheus() -> str:
+    """Returns every process-wide metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in ALL_METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def llm_cost(input_tokens: int, output_tokens: int) -> float:
+    return (input_tokens * LLM_COST_PER_1M_INPUT_TOKENS + output_tokens * LLM_COST_PER_1M_OUTPUT_TOKENS) / 1_000_000
+
+
+class RunMetrics:
+    """
+    Collects the timing breakdown of one graph run. Nodes and LLM calls report into the
+    run bound to the current context, so concurrent requests never mix their numbers.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.nodes = {}
+        self.llm = {"calls": 0, "cache_hits": 0, "errors": 0, "seconds": 0.0,
+                    "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+        self.retries = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def add_node(self, node: str, seconds: float):
+        with self._lock:
+            entry = self.nodes.setdefault(node, {"calls": 0, "seconds": 0.0, "llm_calls": 0, "llm_seconds": 0.0})
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+
+    def add_llm_call(self, node: Optional[str], seconds: float, input_tokens: int = 0, output_tokens: int = 0,
+                     cost: float = 0.0, cached: bool = False, error: bool = False):
+        with self._lock:
+            self.llm["calls"] += 1
+            self.llm["cache_hits"] += cached
+            self.llm["errors"] += error
+            self.llm["seconds"] += seconds
+            self.llm["input_tokens"] += input_tokens
+            self.llm["output_tokens"] += output_tokens
+            self.llm["cost_usd"] += cost
+            if node:
+                entry = self.nodes.setdefault(node, {"calls": 0, "seconds": 0.0, "llm_calls": 0, "llm_seconds": 0.0})
+                entry["llm_calls"] += 1
+                entry["llm_seconds"] += seconds
+
+    def add_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def add_fallback(self):
+        with self._lock:
+            self.fallbacks += 1
+
+    def breakdown(self) -> dict:
+        """Returns the per-request timing breakdown, rounded for the API response."""
+        with self._lock:
+            return {
+                "total_seconds": round(time.perf_counter() - self.started_at, 4),
+                "nodes": {node: {key: round(value, 4) if isinstance(value, float) else value
+                                 for key, value in entry.items()} for node, entry in self.nodes.items()},
+                "llm": {**self.llm, "seconds": round(self.llm["seconds"], 4), "cost_usd": round(self.llm["cost_usd"], 8)},
+                "retries": self.retries,
+                "fallbacks": self.fallbacks,
+            }
+
+
+_current_run: contextvars.ContextVar[Optional[RunMetrics]] = contextvars.ContextVar("current_run", default=None)
+
+
+def current_run() -> Optional[RunMetrics]:
+    """Returns the run bound to the current context, if any."""
+    return _current_run.get()
+
+
+@contextmanager
+def track_run(usecase: str):
+    """
+    Binds a fresh RunMetrics to the current context for the duration of a graph run
+    and records the run's wall time. Tasks started inside the block inherit the binding.
+    """
+    run = RunMetrics()
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        RUN_SECONDS.observe(time.perf_counter() - run.started_at, usecase)
+
+
+def record_retry(provider: str):
+    LLM_RETRIES.inc(provider)
+    run = _current_run.get()
+    if run is not None:
+        run.add_retry()
+
+
+def record_fallback(kind: str):
+    FALLBACKS.inc(kind)
+    run = _current_run.get()
+    if run is not None:
+        run.add_fallback()
@@ -0,0 +1,199 @@
+# src/utils/shared_state.py
+# State shared by the API workers: short-lived keys with an expiry, in namespaces, used to coalesce
+# identical requests across workers. The 'memory' backend keeps them in the process (one worker);
+# the 'sqlite' backend keeps them in a SQLite file, so every worker process on the host sees them.
+# The same file also holds the on-disk LLM response cache tier unless LLM_CACHE_DB_PATH says otherwise.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Optional
+
+from .logger import get_logger
+
+log = get_logger(__name__)
+
+SHARED_STATE_BACKENDS = ("memory", "sqlite")
+SHARED_STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "memory").lower()
+SHARED_STATE_DB_PATH = os.getenv("SHARED_STATE_DB_PATH", "data/shared_state.db")
+# Seconds a write waits for another process holding the SQLite write lock
+SQLITE_BUSY_TIMEOUT_SECONDS = float(os.getenv("SQLITE_BUSY_TIMEOUT_SECONDS", "10"))
+
+
+def connect_sqlite(db_path: str) -> sqlite3.Connection:
+    """
+    Opens a SQLite file that several processes read and write: write-ahead logging, so readers
+    never wait for a writer, and a busy timeout, so writers queue for the lock instead of failing.
+    """
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    db = sqlite3.connect(db_path, timeout=SQLITE_BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    return db
+
+
+class MemorySharedState:
+    """Keys in a dict of this process. Methods never block, but other workers do not see them."""
+
+    shared = False
+
+    def __init__(self):
+        self._entries = {}  # (namespace, key) -> (expires at or None, value)
+        self._lock = threading.Lock()
+
+    def _live(self, namespace: str, key: str, now: float):
+        entry = self._entries.get((namespace, key))
+        if entry is not None and entry[0] is not None and entry[0] <= now:
+            del self._entries[(namespace, key)]
+            return None
+        return entry
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._live(namespace, key, time.time())
+        return entry[1] if entry else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        with self._lock:
+            self._entries[(namespace, key)] = (time.time() + ttl_seconds if ttl_seconds else None, value)
+
+    def add(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """Sets the key only if it is missing or expired; returns whether it was set."""
+        now = time.time()
+        with self._lock:
+            if self._live(namespace, key, now) is not None:
+                return False
+            self._entries[(namespace, key)] = (now + ttl_seconds if ttl_seconds else None, value)
+            return True
+
+    def touch(self, namespace: str, key: str, value: Any, ttl_seconds: float) -> bool:
+        """Extends the expiry of a key still holding 'value'; returns whether it did."""
+        now = time.time()
+        with self._lock:
+            entry = self._live(namespace, key, now)
+            if entry is None or entry[1] != value:
+                return False
+            self._entries[(namespace, key)] = (now + ttl_seconds, value)
+            return True
+
+    def delete(self, namespace: str, key: str, value: Any = None):
+        """Removes the key; with 'value', only while it still holds that value."""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is not None and (value is None or entry[1] == value):
+                del self._entries[(namespace, key)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"backend": "memory", "shared": self.shared, "entries": len(self._entries)}
+
+    def close(self):
+        pass
+
+
+class SqliteSharedState:
+    """
+    Keys in a SQLite file, visible to every process that opens it. Values are stored as JSON.
+    Methods are blocking; async callers should run them with asyncio.to_thread.
+    """
+
+    shared = True
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = connect_sqlite(db_path)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS shared_state ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_shared_state_expires ON shared_state (expires_at)")
+            self._db.commit()
+
+    @staticmethod
+    def _expires_at(ttl_seconds: Optional[float]) -> Optional[float]:
+        return time.time() + ttl_seconds if ttl_seconds else None
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM shared_state WHERE namespace = ? AND key = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)", (namespace, key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO shared_state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False), self._expires_at(ttl_seconds)),
+            )
+            # Expired keys are dropped as new ones are written, so the table stays small
+            self._db.execute("DELETE FROM shared_state WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+
+    def add(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """Sets the key only if it is missing or expired; returns whether it was set. Atomic across processes."""
+        with self._lock:
+            # One statement, so no other process can write the key between the check and the write
+            cursor = self._db.execute(
+                "INSERT INTO shared_state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                "WHERE shared_state.expires_at IS NOT NULL AND shared_state.expires_at <= ?",
+                (namespace, key, json.dumps(value, ensure_ascii=False), self._expires_at(ttl_seconds), time.time()),
+            )
+            self._db.commit()
+        return cursor.rowcount > 0
+
+    def touch(self, namespace: str, key: str, value: Any, ttl_seconds: float) -> bool:
+        """Extends the expiry of a key still holding 'value'; returns whether it did."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE shared_state SET expires_at = ? WHERE namespace = ? AND key = ? AND value = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (self._expires_at(ttl_seconds), namespace, key, json.dumps(value, ensure_ascii=False), time.time()),
+            )
+            self._db.commit()
+        return cursor.rowcount > 0
+
+    def delete(self, namespace: str, key: str, value: Any = None):
+        """Removes the key; with 'value', only while it still holds that value."""
+        with self._lock:
+            if value is None:
+                self._db.execute("DELETE FROM shared_state WHERE namespace = ? AND key = ?", (namespace, key))
+            else:
+                self._db.execute("DELETE FROM shared_state WHERE namespace = ? AND key = ? AND value = ?",
+                                 (namespace, key, json.dumps(value, ensure_ascii=False)))
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute(
+                "SELECT COUNT(*) FROM shared_state WHERE expires_at IS NULL OR expires_at > ?", (time.time(),)
+            ).fetchone()[0]
+        return {"backend": "sqlite", "shared": self.shared, "db_path": self.db_path, "entries": entries}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+@lru_cache(maxsize=None)
+def get_shared_state():
+    """
+    Returns the process-wide shared state configured from the environment:
+
+    SHARED_STATE_BACKEND   'memory' (default; one worker) or 'sqlite' (every worker process on the host)
+    SHARED_STATE_DB_PATH   SQLite file of the 'sqlite' backend (default data/shared_state.db)
+    """
+    if SHARED_STATE_BACKEND not in SHARED_STATE_BACKENDS:
+        raise ValueError(f"Unknown SHARED_STATE_BACKEND '{SHARED_STATE_BACKEND}'. "
+                         f"Available: {', '.join(SHARED_STATE_BACKENDS)}.")
+    if SHARED_STATE_BACKEND == "sqlite":
+        log.info(f"Shared state in {SHARED_STATE_DB_PATH}; workers share coalesced runs and the LLM cache.")
+        return SqliteSharedState(SHARED_STATE_DB_PATH)
+    return MemorySharedState()
@@ -0,0 +1,44 @@
+# src/utils/token_counter.py
+# Token counts used for prompt budgets and rate limiting. By default a character-based estimate;
+# with TOKENIZER set to a tiktoken encoding (e.g. 'cl100k_base') texts are counted by the tokenizer.
+
+import os
+from functools import lru_cache
+
+from .logger import get_logger
+
+log = get_logger(__name__)
+
+# Llama-family tokenizers average roughly four characters of English text per token
+CHARS_PER_TOKEN = 4
+# ...and roughly three words per four tokens
+WORDS_PER_TOKEN = 0.75
+
+TOKENIZER = os.getenv("TOKENIZER", "")
+
+
+@lru_cache(maxsize=None)
+def _encoding(name: str):
+    """Loads a tiktoken encoding once; None (and the estimate) if tiktoken or the encoding is unavailable."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        log.warning(f"Tokenizer '{name}' is unavailable, estimating token counts instead. Error: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Counts the tokens in a piece of text, with the configured tokenizer or the estimate."""
+    if not text:
+        return 0
+    encoding = _encoding(TOKENIZER) if TOKENIZER else None
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def words_for_tokens(tokens: int) -> int:
+    """Estimates how many words fit in a number of tokens."""
+    return int(tokens * WORDS_PER_TOKEN)
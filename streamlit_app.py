@@ -2,18 +2,19 @@ import streamlit as st
 import requests
 import json
 from src.utils.logger import get_logger
+from src.nodes.language_registry import SUPPORTED_LANGUAGES
 
 # --- Setup ---
 log = get_logger(__name__)
 st.set_page_config(page_title="Blog Generator", layout="centered")
 st.title("AI Blog Generator ✨")
-st.markdown("Generate creative, SEO-friendly blogs and translate them into Hindi or French!")
+st.markdown(f"Generate creative, SEO-friendly blogs and translate them into {', '.join(SUPPORTED_LANGUAGES.values())}!")
 
 # --- User Input Form ---
 with st.form("blog_form"):
     topic = st.text_input("Enter your blog topic:", placeholder="e.g., The Future of Renewable Energy")
     # Allow the user to select no language
-    language_options = ["", "hindi", "french"]
+    language_options = [""] + list(SUPPORTED_LANGUAGES)
     language = st.selectbox(
         "Select language (optional):", 
         language_options, 
@@ -21,70 +22,117 @@ with st.form("blog_form"):
     )
     submitted = st.form_submit_button("Generate Blog")
 
+# --- SSE Helpers ---
+def iter_sse_events(response):
+    """Parses a Server-Sent Events response into (event, data) pairs."""
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+
 # --- Backend Logic ---
 if submitted:
     if not topic:
         st.warning("Please enter a blog topic to generate.")
     else:
         log.info(f"Form submitted with topic: '{topic}' and language: '{language}'")
-        
-        # Determine the display language for the spinner
+
+        # Determine the display language for the status message
         display_language = f' in {language.capitalize()}' if language else ''
-        
-        with st.spinner(f"Generating a blog about '{topic}'{display_language}... This may take a moment."):
-            try:
-                # Prepare the payload for the backend
-                payload = {"topic": topic}
-                if language:
-                    payload["current_language"] = language
-                
-                # API Call with a generous timeout for the LLM
-                response = requests.post(
-                    "http://localhost:8000/blogs",
-                    json=payload,
-                    timeout=180  # Increased timeout to 3 minutes
-                )
+
+        st.subheader("📝 Generated Blog")
+        status = st.status(f"Generating a blog about '{topic}'{display_language}...", expanded=False)
+        title_placeholder = st.empty()
+        content_placeholder = st.empty()
+
+        try:
+            # Prepare the payload for the backend
+            payload = {"topic": topic}
+            if language:
+                payload["current_language"] = language
+
+            # Streaming API call: the timeout applies between events, not to the whole generation
+            with requests.post(
+                "http://localhost:8000/blogs/stream",
+                json=payload,
+                stream=True,
+                timeout=180,
+            ) as response:
                 response.raise_for_status()
 
-                # --- Robust JSON Parsing ---
-                response_json = response.json()
-                log.info(f"Received JSON response from backend: {response_json}")
-
-                # Safely navigate the JSON structure
-                data = response_json.get("data", {})
-                blog_data = data.get("blog", {})
-                
-                if not blog_data:
-                    st.error("The backend returned a response, but it did not contain the expected blog data.")
-                    log.error(f"Missing 'blog' key in response data: {data}")
-                else:
-                    title = blog_data.get("title", "No title generated.")
-                    content = blog_data.get("content", "No content generated.")
-
-                    st.subheader("📝 Generated Blog")
-                    st.write(f"**Title:** {title}")
-                    st.write(f"**Content:**")
-                    st.markdown(content)
-
-            except requests.exceptions.HTTPError as e:
-                error_detail = "An unknown HTTP error occurred."
-                try:
-                    error_detail = e.response.json().get("detail", e.response.text)
-                except json.JSONDecodeError:
-                    error_detail = e.response.text
-                st.error(f"Error from server: {error_detail}")
-                log.error(f"HTTPError: {e.response.status_code} - {error_detail}")
-
-            except requests.exceptions.ConnectionError:
-                st.error("Could not connect to the backend server. Please ensure it is running.")
-                log.error("ConnectionError while trying to reach the backend.")
-                
-            except requests.exceptions.Timeout:
-                st.error("The request timed out. The server might be busy or the topic is complex. Please try again.")
-                log.error("Request to backend timed out.")
-
-            except Exception as e:
-                st.error(f"An unexpected error occurred: {e}")
-                log.error(f"An unexpected error in Streamlit app: {e}", exc_info=True)
+                content_tokens = []
+                translated_paragraphs = {}
+                blog_data = {}
+
+                for event, data in iter_sse_events(response):
+                    if event == "token" and data.get("node") == "content_generation":
+                        content_tokens.append(data.get("content", ""))
+                        content_placeholder.markdown("".join(content_tokens))
+
+                    elif event == "paragraph" and data.get("language") == language:
+                        # Translated paragraphs may arrive out of order; render them by index
+                        translated_paragraphs[data["index"]] = data["content"]
+                        content_placeholder.markdown(
+                            "\n\n".join(translated_paragraphs[i] for i in sorted(translated_paragraphs))
+                        )
+
+                    elif event == "node":
+                        update = data.get("update") or {}
+                        blog_update = update.get("blog") or {}
+                        if blog_update.get("title"):
+                            title_placeholder.write(f"**Title:** {blog_update['title']}")
+                        if blog_update.get("content"):
+                            content_placeholder.markdown(blog_update["content"])
+                        status.update(label=f"Finished step: {data.get('node')}")
+
+                    elif event == "done":
+                        log.info(f"Received final state from backend: {data}")
+                        blog_data = data.get("data", {}).get("blog", {})
+
+                    elif event == "error":
+                        raise RuntimeError(data.get("detail", "Generation failed."))
+
+            if not blog_data:
+                status.update(label="Generation incomplete", state="error")
+                st.error("The backend finished streaming, but it did not return the expected blog data.")
+                log.error("Missing 'blog' data in the streamed response.")
+            else:
+                title_placeholder.write(f"**Title:** {blog_data.get('title', 'No title generated.')}")
+                content_placeholder.markdown(blog_data.get("content", "No content generated."))
+                status.update(label="Blog generated", state="complete")
+
+        except requests.exceptions.HTTPError as e:
+            status.update(label="Generation failed", state="error")
+            error_detail = "An unknown HTTP error occurred."
+            try:
+                error_detail = e.response.json().get("detail", e.response.text)
+            except json.JSONDecodeError:
+                error_detail = e.response.text
+            st.error(f"Error from server: {error_detail}")
+            log.error(f"HTTPError: {e.response.status_code} - {error_detail}")
+
+        except requests.exceptions.ConnectionError:
+            status.update(label="Generation failed", state="error")
+            st.error("Could not connect to the backend server. Please ensure it is running.")
+            log.error("ConnectionError while trying to reach the backend.")
+
+        except requests.exceptions.Timeout:
+            status.update(label="Generation failed", state="error")
+            st.error("The request timed out. The server might be busy or the topic is complex. Please try again.")
+            log.error("Request to backend timed out.")
+
+        except Exception as e:
+            status.update(label="Generation failed", state="error")
+            st.error(f"An unexpected error occurred: {e}")
+            log.error(f"An unexpected error in Streamlit app: {e}", exc_info=True)
 else:
     st.info("Enter a topic and click 'Generate Blog' to get started.")